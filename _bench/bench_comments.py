@@ -0,0 +1,78 @@
+# coding: utf-8
+
+"""
+adding an end-of-line comment to every key of a large round-trip loaded
+mapping, one yaml_add_eol_comment() call per key (in map order and in
+reverse order) and with one yaml_add_eol_comments() call, also for only
+every fifth key
+
+run with: python _bench/bench_comments.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from ruamel.yaml import YAML
+
+if False:  # MYPY
+    from typing import Any, List  # NOQA
+
+
+def mapping_input(count=2000):
+    # type: (int) -> str
+    return u''.join(u'key{0}: value{0}\n'.format(i) for i in range(count))
+
+
+def main():
+    # type: () -> None
+    yaml = YAML(pure=True)
+    text = mapping_input()
+    comments = {key: 'checked ' + key for key in yaml.load(text)}
+    sparse = {key: comments[key] for idx, key in enumerate(yaml.load(text)) if idx % 5 == 0}
+    loaded = []  # type: List[Any]
+
+    def load():
+        # type: () -> None
+        loaded[:] = [yaml.load(text)]
+
+    def in_order():
+        # type: () -> None
+        data = loaded[0]
+        for key in data:
+            data.yaml_add_eol_comment(comments[key], key)
+
+    def reversed_order():
+        # type: () -> None
+        data = loaded[0]
+        for key in reversed(list(data)):
+            data.yaml_add_eol_comment(comments[key], key)
+
+    def bulk():
+        # type: () -> None
+        loaded[0].yaml_add_eol_comments(comments)
+
+    def sparse_in_order():
+        # type: () -> None
+        data = loaded[0]
+        for key in data:
+            if key in sparse:
+                data.yaml_add_eol_comment(sparse[key], key)
+
+    def sparse_bulk():
+        # type: () -> None
+        loaded[0].yaml_add_eol_comments(sparse)
+
+    for name, func in [
+        ('one call per key', in_order),
+        ('one call per key, reversed', reversed_order),
+        ('yaml_add_eol_comments', bulk),
+        ('every fifth key', sparse_in_order),
+        ('every fifth key, bulk', sparse_bulk),
+    ]:
+        res = min(timeit.repeat(func, setup=load, number=1, repeat=3))
+        print('{:28s} {:10.2f} ms'.format(name, res * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# coding: utf-8
+
+"""
+composing (events to nodes) and serializing (nodes to events, anchoring
+included) of a broad document with many small mappings and of deeply nested
+flow sequences and mappings, with the pure Python Loader/Dumper. Nesting
+beyond the recursion limit is reported as such
+
+run with: python _bench/bench_compose.py
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+import ruamel.yaml
+
+if False:  # MYPY
+    from typing import Any, List  # NOQA
+
+
+def broad_input(count=2000):
+    # type: (int) -> str
+    return u''.join(
+        u'- name: item{0}\n  value: {0}\n  tags: [a, b]\n'.format(i) for i in range(count)
+    )
+
+
+def deep_sequence_input(depth):
+    # type: (int) -> str
+    # one bracket per line: on one line the scanner keeps a possible simple key
+    # per open bracket (up to 1024 characters back)
+    return u'[\n' * depth + u']\n' * depth
+
+
+def deep_mapping_input(depth):
+    # type: (int) -> str
+    return u'{a:\n' * depth + u'1' + u'}\n' * depth
+
+
+def main():
+    # type: () -> None
+    cases = [('broad', broad_input())]
+    for depth in (300, 10000):
+        cases.append(('sequences, depth {}'.format(depth), deep_sequence_input(depth)))
+        cases.append(('mappings, depth {}'.format(depth), deep_mapping_input(depth)))
+    print('recursion limit', sys.getrecursionlimit())
+    for name, text in cases:
+        nodes = []  # type: List[Any]
+
+        def compose():
+            # type: () -> None
+            nodes[:] = [ruamel.yaml.compose(text)]
+
+        def serialize():
+            # type: () -> None
+            ruamel.yaml.serialize(nodes[0])
+
+        for stage, func in [('compose', compose), ('serialize', serialize)]:
+            try:
+                res = min(timeit.repeat(func, number=1, repeat=3))
+            except RuntimeError:  # RecursionError
+                print('{:25s} {:10s} recursion limit exceeded'.format(name, stage))
+                break
+            print('{:25s} {:10s} {:10.2f} ms'.format(name, stage, res * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# coding: utf-8
+
+"""
+constructing Python data from the nodes of documents without aliases, for
+YAML(typ='safe') and YAML(typ='unsafe'), with construct_alias_free() (the
+default) and with the generator based construction it replaces
+(constructor.alias_free_construct = False). The nodes are composed once
+
+run with: python _bench/bench_construct.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from ruamel.yaml import YAML
+
+if False:  # MYPY
+    from typing import Any  # NOQA
+
+
+def records_input(count=5000):
+    # type: (int) -> str
+    return u''.join(
+        u'- id: {0}\n  name: item{0}\n  price: {0}.5\n  tags: [a, b, c]\n'
+        u'  dims: {{w: 1, h: 2}}\n'.format(i)
+        for i in range(count)
+    )
+
+
+def deep_input(depth=10000):
+    # type: (int) -> str
+    return u'[\n' * depth + u']\n' * depth
+
+
+def main():
+    # type: () -> None
+    for typ in ['safe', 'unsafe']:
+        for name, text in [('records', records_input()), ('depth 10000', deep_input())]:
+            yaml = YAML(typ=typ, pure=True)
+            constructor, parser = yaml.get_constructor_parser(text)
+            node = yaml.composer.get_single_node()
+            for engine, alias_free in [('alias free', True), ('generators', False)]:
+                constructor.alias_free_construct = alias_free
+                try:
+                    res = min(
+                        timeit.repeat(
+                            lambda: constructor.construct_document(node), number=1, repeat=5
+                        )
+                    )
+                except RuntimeError:  # RecursionError
+                    msg = 'recursion limit exceeded'
+                    print('{:8s} {:12s} {:11s} {}'.format(typ, name, engine, msg))
+                    continue
+                print('{:8s} {:12s} {:11s} {:10.2f} ms'.format(typ, name, engine, res * 1000))
+            parser.dispose()
+
+
+if __name__ == '__main__':
+    main()
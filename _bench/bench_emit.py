@@ -0,0 +1,79 @@
+# coding: utf-8
+
+"""
+dumping a document with many small mappings and sequences to a StringIO, to
+a BytesIO with an encoding, and to files opened in text and binary mode. The
+emitter collects the text written and passes it on in chunks
+(Emitter.output_chunk_size characters), instead of writing (and encoding)
+every indicator, indent and scalar separately
+
+run with: python _bench/bench_emit.py
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import tempfile
+import timeit
+
+from ruamel.yaml import YAML
+from ruamel.yaml.compat import StringIO, BytesIO
+
+if False:  # MYPY
+    from typing import Any  # NOQA
+
+
+def make_data(count=2000):
+    # type: (int) -> Any
+    return [
+        {'name': 'item{}'.format(i), 'value': i, 'tags': ['a', 'b'], 'sub': {'x': 1.5}}
+        for i in range(count)
+    ]
+
+
+def main():
+    # type: () -> None
+    data = make_data()
+    fd, path = tempfile.mkstemp(suffix='.yaml')
+    os.close(fd)
+
+    def dump(encoding, stream):
+        # type: (Any, Any) -> None
+        yaml = YAML(typ='safe', pure=True)
+        yaml.encoding = encoding
+        yaml.dump(data, stream)
+
+    def to_text_file():
+        # type: () -> None
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            dump(None, fp)
+
+    def to_binary_file():
+        # type: () -> None
+        with io.open(path, 'wb') as fp:
+            dump('utf-8', fp)
+
+    def to_unbuffered_file():
+        # type: () -> None
+        # every write is a system call, as with a socket
+        with io.open(path, 'wb', buffering=0) as fp:
+            dump('utf-8', fp)
+
+    try:
+        for name, func in [
+            ('StringIO', lambda: dump(None, StringIO())),
+            ('BytesIO, utf-8', lambda: dump('utf-8', BytesIO())),
+            ('BytesIO, utf-16-le', lambda: dump('utf-16-le', BytesIO())),
+            ('text file', to_text_file),
+            ('binary file, utf-8', to_binary_file),
+            ('unbuffered file', to_unbuffered_file),
+        ]:
+            res = min(timeit.repeat(func, number=1, repeat=5))
+            print('{:20s} {:10.2f} ms'.format(name, res * 1000))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
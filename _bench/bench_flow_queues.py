@@ -0,0 +1,68 @@
+# coding: utf-8
+
+"""
+benchmark for the token and event queues on flow heavy input: long single
+line flow sequences and mappings are possible simple keys, so all of their
+tokens are queued before the first one is taken from the queue. Also runs
+the round-trip scanner on input with long comment runs and dumps flow style
+data (queueing events in the emitter).
+
+run with: python _bench/bench_flow_queues.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+import ruamel.yaml
+from ruamel.yaml import YAML
+from ruamel.yaml.compat import StringIO
+from ruamel.yaml.loader import SafeLoader, RoundTripLoader
+
+if False:  # MYPY
+    from typing import Any  # NOQA
+
+
+def flow_input(lines=200):
+    # type: (int) -> str
+    seq = u'[' + u','.join([u'a'] * 500) + u']'
+    mapping = u'{' + u','.join(u'k{}: v'.format(i) for i in range(120)) + u'}'
+    return u''.join(u'- {}\n- {}\n'.format(seq, mapping) for _ in range(lines // 2))
+
+
+def comment_input(lines=2000):
+    # type: (int) -> str
+    line = u'k{}: v   # comment\n# {}\n# {}\n'
+    return u''.join(line.format(i, u'x' * 20, u'y' * 20) for i in range(lines))
+
+
+def scan(loader, text):
+    # type: (Any, str) -> None
+    for _ in ruamel.yaml.scan(text, Loader=loader):
+        pass
+
+
+def dump(data):
+    # type: (Any) -> None
+    yaml = YAML(typ='safe', pure=True)
+    yaml.default_flow_style = True
+    yaml.dump(data, StringIO())
+
+
+def main():
+    # type: () -> None
+    flow = flow_input()
+    comments = comment_input()
+    data = YAML(typ='safe', pure=True).load(flow)
+    for name, func in [
+        ('scan flow (safe)', lambda: scan(SafeLoader, flow)),
+        ('scan flow (rt)', lambda: scan(RoundTripLoader, flow)),
+        ('scan comments (rt)', lambda: scan(RoundTripLoader, comments)),
+        ('dump flow', lambda: dump(data)),
+    ]:
+        res = min(timeit.repeat(func, number=1, repeat=5))
+        print('{:20s} {:10.1f} ms'.format(name, res * 1000))
+
+
+if __name__ == '__main__':
+    main()
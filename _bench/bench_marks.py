@@ -0,0 +1,76 @@
+# coding: utf-8
+
+"""
+time to load a document from a string, and the memory still in use after the
+load once the input string is gone, with the default StringMarks (which all
+reference the input) and with yaml.compact_marks = True. Followed by the time
+of a safe load with and without (yaml.marks = False) marks
+
+run with: python _bench/bench_marks.py
+"""
+
+from __future__ import print_function
+
+import gc
+import timeit
+import tracemalloc
+
+from ruamel.yaml import YAML
+
+if False:  # MYPY
+    from typing import Any, Tuple  # NOQA
+
+
+def make_input(count=5000):
+    # type: (int) -> str
+    return u''.join(
+        u'- name: item{0}  # comment {0}\n  value: {0}\n  tags: [a, b]\n'.format(i)
+        for i in range(count)
+    )
+
+
+def make_yaml(compact):
+    # type: (bool) -> Any
+    yaml = YAML(pure=True)
+    yaml.compact_marks = compact
+    return yaml
+
+
+def retained(count, compact):
+    # type: (int, bool) -> Tuple[Any, int]
+    yaml = make_yaml(compact)
+    gc.collect()
+    tracemalloc.start()
+    text = make_input(count)
+    data = yaml.load(text)
+    del text, yaml
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def main():
+    # type: () -> None
+    count = 5000
+    text = make_input(count)
+    print('input {:.1f} Mb'.format(len(text) / 1024.0 / 1024.0))
+    for name, compact in [('default', False), ('compact', True)]:
+        yaml = make_yaml(compact)
+        res = min(timeit.repeat(lambda: yaml.load(text), number=1, repeat=5))
+        data, size = retained(count, compact)
+        print(
+            '{:10s} load {:8.2f} ms  retained {:6.1f} Mb'.format(
+                name, res * 1000, size / 1024.0 / 1024.0
+            )
+        )
+        del data
+    for name, marks in [('safe', True), ('safe, no marks', False)]:
+        yaml = YAML(typ='safe', pure=True)
+        yaml.marks = marks
+        res = min(timeit.repeat(lambda: yaml.load(text), number=1, repeat=5))
+        print('{:15s} load {:8.2f} ms'.format(name, res * 1000))
+
+
+if __name__ == '__main__':
+    main()
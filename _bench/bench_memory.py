@@ -0,0 +1,63 @@
+# coding: utf-8
+
+"""
+memory used by round-trip loaded documents with many small mappings and
+sequences, as traced by tracemalloc after the load. Compares the default
+with yaml.packed = True (which shares the Format attachment of the
+collections of a document, and keeps the line/col of their entries in one
+LineColTable per document)
+
+run with: python _bench/bench_memory.py
+"""
+
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from ruamel.yaml import YAML
+
+if False:  # MYPY
+    from typing import Any, Tuple  # NOQA
+
+
+def small_collections(count=20000):
+    # type: (int) -> str
+    return u''.join(
+        u'- name: item{0}\n  value: {0}\n  tags: [a, b]\n  sub:\n    x: 1\n'.format(i)
+        for i in range(count)
+    )
+
+
+def loaded_size(text, packed):
+    # type: (str, bool) -> Tuple[Any, int]
+    yaml = YAML(pure=True)
+    if packed:
+        yaml.packed = True
+    gc.collect()
+    tracemalloc.start()
+    data = yaml.load(text)
+    del yaml
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def main():
+    # type: () -> None
+    count = 20000
+    text = small_collections(count)
+    collections = count * 3 + 1  # item mapping, tags and sub per item, the root sequence
+    for name, packed in [('default', False), ('packed', True)]:
+        data, size = loaded_size(text, packed)
+        print(
+            '{:10s} {:8.1f} Mb {:8.0f} bytes per collection'.format(
+                name, size / 1024.0 / 1024.0, size / float(collections)
+            )
+        )
+        del data
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# coding: utf-8
+
+"""
+lookups in and updates of round-trip loaded mappings with merge keys: a
+mapping merging many anchored mappings (<<: [*m0, *m1, ...]) and a deep
+chain of mappings each merging the previous one
+
+run with: python _bench/bench_merge.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from ruamel.yaml import YAML
+
+if False:  # MYPY
+    from typing import Any  # NOQA
+
+
+def wide_input(count=200):
+    # type: (int) -> str
+    res = [u'bases:']
+    for i in range(count):
+        res.append(u'- &m{0} {{k{0}a: 1, k{0}b: 2, shared: {0}}}'.format(i))
+    res.append(u'merged:')
+    res.append(u'  <<: [{}]'.format(u', '.join(u'*m{}'.format(i) for i in range(count))))
+    res.append(u'  own: 1')
+    return u'\n'.join(res) + u'\n'
+
+
+def chain_input(depth=200):
+    # type: (int) -> str
+    res = [u'l0: &l0 {k0: 0}']
+    for i in range(1, depth):
+        res.append(u'l{0}: &l{0}\n  <<: *l{1}\n  k{0}: {0}'.format(i, i - 1))
+    return u'\n'.join(res) + u'\n'
+
+
+def main():
+    # type: () -> None
+    yaml = YAML(pure=True)
+    wide = yaml.load(wide_input())
+    merged = wide['merged']
+    base = wide['bases'][-1]
+    chain = yaml.load(chain_input())
+    last = chain['l199']
+
+    def missing():
+        # type: () -> None
+        for i in range(1000):
+            merged.get(i)
+
+    def present():
+        # type: () -> None
+        for i in range(200):
+            merged['k{}a'.format(i)]
+
+    def update_base():
+        # type: () -> None
+        for i in range(100):
+            base['shared'] = i
+            base['k199a'] = i
+
+    def chain_missing():
+        # type: () -> None
+        for i in range(1000):
+            last.get(i)
+
+    for name, func in [
+        ('wide, missing keys', missing),
+        ('wide, merged keys', present),
+        ('wide, update merged map', update_base),
+        ('chain, missing keys', chain_missing),
+        ('load wide', lambda: yaml.load(wide_input())),
+        ('load chain', lambda: yaml.load(chain_input())),
+    ]:
+        res = min(timeit.repeat(func, number=1, repeat=5))
+        print('{:25s} {:10.2f} ms'.format(name, res * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# coding: utf-8
+
+"""
+micro benchmark for Reader.forward(): advancing over spans character by
+character versus computing the line/column deltas for the span in one go
+
+run with: python _bench/bench_reader_forward.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from ruamel.yaml.reader import Reader
+
+
+def advance(text, span, bulk_length):
+    # type: (str, int, int) -> None
+    reader = Reader(text)
+    reader.forward_bulk_length = bulk_length
+    forward = reader.forward
+    for _ in range(len(text) // span - 1):
+        forward(span)
+
+
+def main():
+    # type: () -> None
+    text = (u'x' * 79 + u'\n') * 2000
+    print('{:>6s} {:>10s} {:>10s} {:>8s}'.format('span', 'loop [ms]', 'bulk [ms]', 'speedup'))
+    for span in (2, 4, 8, 16, 32, 64, 128):
+        res = []
+        for bulk_length in (len(text), 1):
+            res.append(
+                min(
+                    timeit.repeat(
+                        lambda: advance(text, span, bulk_length), number=1, repeat=5
+                    )
+                )
+            )
+        print(
+            '{:6d} {:10.2f} {:10.2f} {:8.1f}'.format(
+                span, res[0] * 1000, res[1] * 1000, res[0] / res[1]
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
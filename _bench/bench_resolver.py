@@ -0,0 +1,59 @@
+# coding: utf-8
+
+"""
+per scalar cost of implicit tag resolution: the regexps for the first
+character tried one after another, merged into a single regexp, a hit in the
+resolver cache, and the full resolve() call
+
+run with: python _bench/bench_resolver.py
+"""
+
+from __future__ import print_function
+
+import timeit
+
+from ruamel.yaml import YAML
+from ruamel.yaml.nodes import ScalarNode
+from ruamel.yaml.resolver import CompiledResolvers
+
+scalars = [
+    u'true', u'null', u'~', u'0', u'42', u'-17', u'3.14', u'1e10', u'0x1F', u'2019-08-18',
+    u'2019-08-18 12:00:00', u'some string', u'123abc', u'.inf', u'<<', u'nonsense',
+]
+
+
+def main():
+    # type: () -> None
+    number = 20000
+    for version in [(1, 2), (1, 1)]:
+        yaml = YAML(typ='safe', pure=True)
+        yaml.version = version
+        yaml.load(u'a')  # resolve() gets the version from the (loaded) scanner
+        resolver = yaml.resolver
+        print('YAML {}.{}  [us per scalar]'.format(*version))
+        print(
+            '{:>22s} {:>10s} {:>10s} {:>10s} {:>10s}'.format(
+                'scalar', 'in order', 'merged', 'cached', 'resolve'
+            )
+        )
+        combined = CompiledResolvers(resolver.versioned_resolver)
+        sequential = CompiledResolvers(resolver.versioned_resolver, combine=False)
+        cached = CompiledResolvers(resolver.versioned_resolver, cache_size=len(scalars))
+        for value in scalars:
+            res = []
+            for func in (
+                sequential.resolve,
+                combined.resolve,
+                cached.resolve,
+                lambda v: resolver.resolve(ScalarNode, v, (True, False)),
+            ):
+                res.append(
+                    min(timeit.repeat(lambda: func(value), number=number, repeat=5))
+                    / number
+                    * 1e6
+                )
+            print('{:>22s} {:10.3f} {:10.3f} {:10.3f} {:10.3f}'.format(repr(value), *res))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+# coding: utf-8
+
+"""
+benchmark suite for the stages of loading and dumping, for the types 'base',
+'safe', 'unsafe' and 'rt' with the pure Python and (if installed) the C based
+Loader/Dumper classes, over a corpus of generated inputs
+
+Loading is measured up to and including each stage: reading (pure only, the
+C parser reads by itself), scanning (tokens), parsing (events), composing
+(nodes) and constructing (data). Dumping starts from the events (emitter),
+the nodes (serializer, emitter) or the data (representer, serializer,
+emitter). The time of a stage by itself is the difference with the previous
+measurement in its chain. Each time is the minimum of --repeat runs, with
+the garbage collector disabled (timeit), the median is recorded as well.
+Combinations that are not supported (e.g. dumping data with the BaseDumper,
+which has no representers for dict and list) are left out.
+
+run with: python _bench/suite.py [--json results.json] [--compare old.json]
+
+use --type, --backend, --input and --stage (all repeatable) to select, and
+--scale to change the size of the inputs
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import ruamel.yaml
+from ruamel.yaml.reader import Reader
+
+if False:  # MYPY
+    from typing import Any, Dict, List, Optional, Tuple  # NOQA
+
+try:
+    from ruamel.yaml.cyaml import CBaseLoader, CSafeLoader, CLoader
+    from ruamel.yaml.cyaml import CBaseDumper, CSafeDumper, CDumper
+except ImportError:  # C extension not installed
+    CBaseLoader = None
+
+types = ['base', 'safe', 'unsafe', 'rt']
+backends = ['pure', 'c']
+load_stages = ['reader', 'scanner', 'parser', 'composer', 'constructor']
+dump_stages = ['emitter', 'serializer', 'representer']
+
+
+def loader_dumper(typ, backend):
+    # type: (str, str) -> Optional[Tuple[Any, Any]]
+    """Loader and Dumper class for typ, None if not available"""
+    if backend == 'pure':
+        return {
+            'base': (ruamel.yaml.BaseLoader, ruamel.yaml.BaseDumper),
+            'safe': (ruamel.yaml.SafeLoader, ruamel.yaml.SafeDumper),
+            'unsafe': (ruamel.yaml.Loader, ruamel.yaml.Dumper),
+            'rt': (ruamel.yaml.RoundTripLoader, ruamel.yaml.RoundTripDumper),
+        }[typ]
+    if CBaseLoader is None or typ == 'rt':
+        return None
+    return {
+        'base': (CBaseLoader, CBaseDumper),
+        'safe': (CSafeLoader, CSafeDumper),
+        'unsafe': (CLoader, CDumper),
+    }[typ]
+
+
+# the corpus, every generator returns a text of roughly 20-40Kb for scale 1
+
+
+def deep_input(scale=1):
+    # type: (int) -> str
+    """block mappings and sequences, and flow sequences, nested 100 deep"""
+    res = []
+    for i in range(3 * scale):
+        res.append(u'nested{}:'.format(i))
+        for depth in range(1, 100):
+            res.append(u'  ' * depth + u'k{}:'.format(depth))
+        res.append(u'  ' * 100 + u'- leaf')
+        # one bracket per line, see _bench/bench_compose.py
+        res.append(u'flow{}:'.format(i))
+        res.extend([u'  ['] * 100 + [u'  x'] + [u'  ]'] * 100)
+    return u'\n'.join(res) + u'\n'
+
+
+def wide_input(scale=1):
+    # type: (int) -> str
+    """one mapping with many keys, and scalars of all the implicit types"""
+    values = [u'{}', u'{}.5', u'true', u'null', u'text {}', u'0x{:x}', u'2019-08-{:02d}']
+    return u''.join(
+        u'key{}: {}\n'.format(i, values[i % len(values)].format(i % 28 + 1))
+        for i in range(2000 * scale)
+    )
+
+
+def long_scalars_input(scale=1):
+    # type: (int) -> str
+    """long plain, double quoted and literal block scalars"""
+    words = u' '.join(u'word{}'.format(i) for i in range(400))
+    res = []
+    for i in range(4 * scale):
+        res.append(u'plain{}: {}'.format(i, words))
+        res.append(u'quoted{}: "{}\\t\\u00e9"'.format(i, words))
+        res.append(u'literal{}: |'.format(i))
+        res.extend(u'  line {} of the literal block scalar'.format(j) for j in range(50))
+    return u'\n'.join(res) + u'\n'
+
+
+def comments_input(scale=1):
+    # type: (int) -> str
+    """eol comments and full line comments, in nested mappings and sequences"""
+    res = [u'# header comment', u'']
+    for i in range(200 * scale):
+        res.append(u'# comment before item {}'.format(i))
+        res.append(u'item{}:  # eol comment on the key'.format(i))
+        res.append(u'  value: {}   # eol comment on the value'.format(i))
+        res.append(u'  list:')
+        res.append(u'  - a  # first')
+        res.append(u'  # between')
+        res.append(u'  - b')
+    return u'\n'.join(res) + u'\n'
+
+
+def anchors_input(scale=1):
+    # type: (int) -> str
+    """anchored mappings, aliases to them and merge keys"""
+    res = [u'bases:']
+    count = 100 * scale
+    for i in range(count):
+        res.append(u'- &b{0} {{name: base{0}, value: {0}}}'.format(i))
+    res.append(u'derived:')
+    for i in range(count):
+        res.append(u'- <<: *b{}'.format(i))
+        res.append(u'  extra: {}'.format(i))
+        res.append(u'  ref: *b{}'.format((i * 7) % count))
+        res.append(u'- <<: [*b{}, *b{}]'.format(i, (i + 1) % count))
+    return u'\n'.join(res) + u'\n'
+
+
+def multi_document_input(scale=1):
+    # type: (int) -> str
+    """many small documents"""
+    document = u'---\nid: {0}\nname: document {0}\ntags: [x, y]\nsub:\n  a: 1\n  b: [1, 2]\n'
+    return u''.join(document.format(i) for i in range(300 * scale))
+
+
+corpus = [
+    ('deep', deep_input),
+    ('wide', wide_input),
+    ('long_scalars', long_scalars_input),
+    ('comments', comments_input),
+    ('anchors', anchors_input),
+    ('multi_document', multi_document_input),
+]
+
+
+def read(stream):
+    # type: (bytes) -> None
+    reader = Reader(stream)
+    length = len(reader.buffer) - 1
+    for _ in range(length // 64):
+        reader.forward(64)
+    reader.forward(length % 64)
+
+
+def stage_functions(stream, Loader, Dumper, backend):
+    # type: (bytes, Any, Any, str) -> List[Tuple[str, Any]]
+    """(stage, function) in the order of their chains"""
+    events = list(ruamel.yaml.parse(stream, Loader))
+    nodes = list(ruamel.yaml.compose_all(stream, Loader))
+    data = list(ruamel.yaml.load_all(stream, Loader))
+    res = []  # type: List[Tuple[str, Any]]
+    if backend == 'pure':
+        res.append(('reader', lambda: read(stream)))
+    res.extend(
+        [
+            ('scanner', lambda: list(ruamel.yaml.scan(stream, Loader))),
+            ('parser', lambda: list(ruamel.yaml.parse(stream, Loader))),
+            ('composer', lambda: list(ruamel.yaml.compose_all(stream, Loader))),
+            ('constructor', lambda: list(ruamel.yaml.load_all(stream, Loader))),
+            ('emitter', lambda: ruamel.yaml.emit(events, Dumper=Dumper)),
+            ('serializer', lambda: ruamel.yaml.serialize_all(nodes, Dumper=Dumper)),
+            ('representer', lambda: ruamel.yaml.dump_all(data, Dumper=Dumper)),
+        ]
+    )
+    return res
+
+
+def run(args):
+    # type: (Any) -> List[Dict[str, Any]]
+    results = []  # type: List[Dict[str, Any]]
+    for name, generate in corpus:
+        if args.input and name not in args.input:
+            continue
+        stream = generate(args.scale).encode('utf-8')
+        for typ in args.type or types:
+            for backend in args.backend or backends:
+                classes = loader_dumper(typ, backend)
+                if classes is None:
+                    continue
+                stages = []  # type: List[Tuple[str, Any]]
+                for stage, func in stage_functions(stream, classes[0], classes[1], backend):
+                    try:
+                        func()  # warm up, and check that the combination is supported
+                    except Exception:
+                        continue
+                    stages.append((stage, func))
+                results.extend(
+                    measure(
+                        stages, args, input=name, size=len(stream), type=typ, backend=backend
+                    )
+                )
+    return results
+
+
+def measure(stages, args, **info):
+    # type: (List[Tuple[str, Any]], Any, Any) -> List[Dict[str, Any]]
+    """
+    run the stages in turn, --repeat times, so that a slow period of the machine
+    does not affect just one of them
+    """
+    times = {}  # type: Dict[str, List[float]]
+    for _ in range(args.repeat):
+        for stage, func in stages:
+            if args.stage and stage not in args.stage:
+                continue
+            times.setdefault(stage, []).append(timeit.Timer(func).timeit(number=1))
+    results = []
+    previous = {}  # type: Dict[str, float]
+    for stage, _ in stages:
+        chain = 'load' if stage in load_stages else 'dump'
+        if stage not in times:
+            previous.pop(chain, None)
+            continue
+        best = min(times[stage])
+        result = dict(info)
+        result['stage'] = stage
+        result['cumulative'] = best
+        result['median'] = sorted(times[stage])[len(times[stage]) // 2]
+        result['self'] = best - previous[chain] if chain in previous else None
+        previous[chain] = best
+        results.append(result)
+        report(result, args.compare)
+    return results
+
+
+def key(result):
+    # type: (Dict[str, Any]) -> Tuple[str, str, str, str]
+    return result['input'], result['type'], result['backend'], result['stage']
+
+
+def report(result, compare):
+    # type: (Dict[str, Any], Optional[Dict[Any, Any]]) -> None
+    own = result['self']
+    line = '{:15s} {:7s} {:5s} {:12s} {:10.2f} {:>10s}'.format(
+        result['input'],
+        result['type'],
+        result['backend'],
+        result['stage'],
+        result['cumulative'] * 1000,
+        '' if own is None else '{:.2f}'.format(own * 1000),
+    )
+    old = None if compare is None else compare.get(key(result))
+    if old is not None:
+        line += ' {:+8.1f}%'.format((result['cumulative'] / old['cumulative'] - 1) * 100)
+    print(line)
+
+
+def main():
+    # type: () -> None
+    parser = argparse.ArgumentParser(description='ruamel.yaml benchmark suite')
+    parser.add_argument('--type', action='append', choices=types)
+    parser.add_argument('--backend', action='append', choices=backends)
+    parser.add_argument('--input', action='append', choices=[name for name, _ in corpus])
+    parser.add_argument('--stage', action='append', choices=load_stages + dump_stages)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results of an earlier run (--json) to compare with')
+    args = parser.parse_args()
+    if args.compare is not None:
+        with open(args.compare) as fp:
+            args.compare = {key(result): result for result in json.load(fp)['results']}
+    if CBaseLoader is None and args.backend != ['pure']:
+        print('C extension not available, only pure Python backends are measured')
+    print(
+        '{:15s} {:7s} {:5s} {:12s} {:>10s} {:>10s}'.format(
+            'input', 'type', 'impl', 'stage', 'cum. ms', 'self ms'
+        )
+    )
+    results = run(args)
+    if args.json is not None:
+        with open(args.json, 'w') as fp:
+            json.dump(
+                dict(
+                    ruamel_yaml=ruamel.yaml.__version__,
+                    python=platform.python_version(),
+                    implementation=platform.python_implementation(),
+                    platform=platform.platform(),
+                    repeat=args.repeat,
+                    scale=args.scale,
+                    results=results,
+                ),
+                fp,
+                indent=1,
+                sort_keys=True,
+            )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
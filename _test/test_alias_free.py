@@ -0,0 +1,102 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of the construction of documents without aliases with an explicit
+stack (construct_alias_free), against the generator based construction
+"""
+
+import sys
+
+import pytest  # NOQA
+
+from roundtrip import dedent
+
+
+def load(text, typ='safe', alias_free=True):
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ=typ, pure=True)
+    yaml.constructor.alias_free_construct = alias_free
+    return yaml.load(text)
+
+
+def check(text, typ='safe'):
+    data = load(text, typ)
+    assert data == load(text, typ, alias_free=False)
+    return data
+
+
+class TestAliasFree:
+    def test_collections(self):
+        data = check(dedent("""\
+        a: [1, 2.5, x, null, true, 2019-08-23]
+        b:
+          c: {d: [], e: {}}
+          ? [f, g]
+          : h
+        """))
+        assert data['b'][('f', 'g')] == 'h'
+        assert data['b']['c'] == {'d': [], 'e': {}}
+
+    def test_tags(self):
+        data = check(dedent("""\
+        - !!set {a, b}
+        - !!omap [x: 1, y: 2]
+        - !!binary aGVsbG8=
+        - !!str 42
+        """))
+        assert data[0] == {'a', 'b'}
+        assert data[3] == '42'
+        data = check('a: !!python/tuple [1, [2]]\n', typ='unsafe')
+        assert data['a'] == (1, [2])
+
+    def test_merge(self):
+        data = check('a:\n  <<: {b: 1, c: 2}\n  c: 3\n')
+        assert data['a'] == {'b': 1, 'c': 3}
+
+    def test_duplicate_key(self):
+        from ruamel.yaml.constructor import DuplicateKeyError
+
+        with pytest.raises(DuplicateKeyError):
+            load('a: 1\nb: 2\na: 3\n')
+
+    def test_unhashable_key(self):
+        from ruamel.yaml.constructor import ConstructorError
+
+        with pytest.raises(ConstructorError):
+            load('? {a: 1}\n: b\n')
+
+    def test_aliases(self):
+        # documents with aliases are constructed as before
+        data = check('a: &x [1]\nb: *x\n')
+        assert data['a'] is data['b']
+        data = load('&x [1, *x]\n')
+        assert data[1] is data
+
+    def test_composed_before_constructed(self):
+        # whether a document has aliases is known per document, not from the
+        # document composed last
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        constructor, parser = yaml.get_constructor_parser('a: &x [1]\nb: *x\n---\nc: 2\n')
+        try:
+            composer = yaml.composer
+            assert composer.check_node()
+            node1 = composer.get_node()
+            assert composer.check_node()
+            node2 = composer.get_node()
+            data = constructor.construct_document(node1)
+            assert data['a'] is data['b']
+            assert constructor.construct_document(node2) == {'c': 2}
+        finally:
+            parser.dispose()
+
+    def test_deep(self):
+        depth = sys.getrecursionlimit() * 3
+        data = load(u'{a:\n' * depth + u'1' + u'}\n' * depth)
+        for _ in range(depth):
+            data = data['a']
+        assert data == 1
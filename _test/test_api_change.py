@@ -170,6 +170,354 @@ class TestLoadAll:
         assert list(yaml.load_all(fn)) == [['a'], ['b']]
 
 
+class TestLoadAllParallel:
+    inp = textwrap.dedent(u"""\
+    %YAML 1.2
+    ---
+    a: 1
+    ...
+    # comment
+    --- |
+      text
+    ---
+    - 1
+    ...
+    b: 2
+    """)
+
+    def test_split_documents(self):
+        from ruamel.yaml.main import split_documents
+
+        assert list(split_documents(self.inp)) == [
+            u'%YAML 1.2\n---\na: 1\n...\n',
+            u'# comment\n--- |\n  text\n',
+            u'---\n- 1\n...\n',
+            u'b: 2\n',
+        ]
+
+    @pytest.mark.parametrize('typ', ['safe', 'base'])
+    def test_same_as_load_all(self, typ):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ=typ, pure=True)
+        res = list(yaml.load_all_parallel(self.inp, workers=2))
+        assert res == list(yaml.load_all(self.inp))
+        assert res[0] == {'a': 1 if typ == 'safe' else '1'}
+
+    @pytest.mark.parametrize(
+        'inp',
+        [
+            u'%YAML 1.1\n---\na: yes\n---\nb: yes\n',
+            u'%YAML 1.1\n---\na: yes\n...\n# comment\n---\nb: 010\n',
+            u'%YAML 1.1\n---\na: yes\n...\n%YAML 1.2\n---\nb: yes\n---\nc: yes\n',
+            u'a: yes\n---\nb: yes\n...\n# comment\n',
+        ],
+    )
+    @pytest.mark.parametrize('version', [None, '1.1'])
+    def test_version(self, inp, version):
+        # the version of a %YAML directive (or yaml.version) applies to the later
+        # documents as well
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        yaml.version = version
+        res = list(yaml.load_all_parallel(inp, workers=2))
+        yaml = YAML(typ='safe', pure=True)
+        yaml.version = version
+        assert res == list(yaml.load_all(inp))
+
+    def test_block_scalar_column_0(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.main import split_documents
+
+        inp = u'--- |\nfoo\n---\nbar\n...\n--- >\n  baz\n'
+        assert len(list(split_documents(inp))) == 3
+        yaml = YAML(typ='safe', pure=True)
+        res = list(yaml.load_all_parallel(inp, workers=2))
+        assert res == list(yaml.load_all(inp)) == ['foo\n', 'bar', 'baz\n']
+
+    def test_path(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'---\n'.join(u'- {}\n'.format(i) for i in range(20)))
+        yaml = YAML(typ='safe', pure=True)
+        assert list(yaml.load_all_parallel(fn, workers=2)) == [[i] for i in range(20)]
+
+    def test_error_mark(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.parser import ParserError
+
+        yaml = YAML(typ='safe', pure=True)
+        with pytest.raises(ParserError) as exc:
+            list(yaml.load_all_parallel(u'a: 1\n---\nb: 2\n---\nc: [\n', workers=2))
+        assert exc.value.problem_mark.line == 5
+
+    def test_round_trip_falls_back(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        res = list(yaml.load_all_parallel(u'a: 1  # one\n---\nb: 2\n', workers=2))
+        assert res == [dict(a=1), dict(b=2)]
+        assert res[0].ca.items['a'][2].value == '# one\n'
+
+
+class TestIterLoad:
+    def test_sequence_items(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        res = yaml.iter_load(u'- 1\n- a: 2\n- [3, 4]\n---\n- 5\n')
+        assert next(res) == 1
+        assert next(res) == dict(a=2)
+        assert list(res) == [[3, 4], 5]
+
+    def test_path(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        inp = textwrap.dedent(u"""\
+        meta: {version: 1}
+        items:
+        - {name: a, tags: [x, y]}
+        - {name: b, tags: [z]}
+        """)
+        assert list(yaml.iter_load(inp, path=['items', None, 'name'])) == ['a', 'b']
+        assert list(yaml.iter_load(inp, path=['items', 1, 'tags', None])) == ['z']
+        assert list(yaml.iter_load(inp, path=['meta', None])) == [1]
+        assert list(yaml.iter_load(inp, path=['missing', None])) == []
+        assert list(yaml.iter_load(inp, path=[])) == [yaml.load(inp)]
+
+    def test_alias_to_earlier_item(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        res = list(yaml.iter_load(u'- &a {x: 1}\n- *a\n- {<<: *a, y: 2}\n'))
+        assert res == [dict(x=1), dict(x=1), dict(x=1, y=2)]
+
+    def test_round_trip_items(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.compat import StringIO
+
+        yaml = YAML()
+        inp = textwrap.dedent(u"""\
+        - a: 1   # one
+          b: 2
+        - c: 3   # three
+        """)
+        res = list(yaml.iter_load(inp))
+        assert res[1].lc.line == 2
+        buf = StringIO()
+        yaml.dump(res[1], buf)
+        # the comment keeps its original column
+        assert buf.getvalue() == u'c: 3     # three\n'
+
+
+class TestMemoryMapped:
+    def test_mmap_load_path(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'a: 1  # comment\nb: [x, y]\n')
+        yaml = YAML()
+        data = yaml.load(fn, mmap=True)
+        assert data == dict(a=1, b=['x', 'y'])
+        assert data.lc.key('b') == (1, 0)
+
+    def test_mmap_load_file(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        file_name = str(tmpdir) + '/tstFile.yaml'
+        with open(file_name, 'wb') as fp:
+            fp.write(u'text: HELLO_WORLD©\n'.encode('utf-16'))
+        with open(file_name, 'rb') as fp:
+            data = YAML(typ='safe', pure=True).load(fp, mmap=True)
+        assert data['text'] == u'HELLO_WORLD©'
+
+    def test_mmap_load_all(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'- a\n---\n- b\n')
+        yaml = YAML()
+        assert list(yaml.load_all(fn, mmap=True)) == [['a'], ['b']]
+
+    def test_mmap_empty(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'')
+        assert YAML().load(fn, mmap=True) is None
+
+    def test_mmap_error_mark(self, tmpdir):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.scanner import ScannerError
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'a: 1\nb: "x\n')
+        with pytest.raises(ScannerError) as exc:
+            YAML().load(fn, mmap=True)
+        assert 'test.yaml", line 3' in str(exc.value)
+
+    def test_mmap_position(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        file_name = str(tmpdir) + '/test.yaml'
+        with open(file_name, 'wb') as fp:
+            fp.write(b'header line\na: 1\n')
+        with open(file_name, 'rb') as fp:
+            fp.readline()
+            assert YAML(typ='safe', pure=True).load(fp, mmap=True) == dict(a=1)
+            assert fp.read() == b''
+
+    @pytest.mark.parametrize(
+        'inp', [u'a: 1', u'a: "x"', u'a: [x, y]', u'a: 1  # end', u'- |\n  x', u'x', u'']
+    )
+    def test_mmap_end(self, tmpdir, inp):
+        # the text is not copied to append the terminating NUL
+        from ruamel.yaml import YAML
+        from ruamel.yaml.reader import Reader
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(inp)
+        with fn.open('rb') as fp:
+            reader = Reader(None)
+            reader.mmap_stream(fp)
+            assert reader.buffer == inp
+        for typ in ['safe', 'rt']:
+            assert YAML(typ=typ, pure=True).load(fn, mmap=True) == YAML(typ=typ).load(inp)
+
+    def test_mmap_no_fileno(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.error import YAMLStreamError
+        from ruamel.yaml.compat import StringIO
+
+        with pytest.raises(YAMLStreamError):
+            YAML().load(StringIO(u'a: 1\n'), mmap=True)
+
+
+class TestLoadCache:
+    @pytest.mark.parametrize('packed', [False, True])
+    def test_round_trip(self, tmpdir, packed):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.compat import StringIO
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'%YAML 1.1\n---\na: 1  # comment\nb: [x, 0o7]\n')
+        first = second = None
+        for _ in range(2):
+            yaml = YAML()
+            yaml.packed = packed
+            yaml.cache_dir = str(tmpdir.join('cache'))
+            first, second = second, yaml.load(fn)
+        assert yaml.load_cache.hits == 1
+        assert second == first and second is not first
+        # the attachments in __slots__ are cached as well
+        assert second.lc.key('b') == (3, 0)
+        assert second['b'].lc.item(1) == (3, 7)
+        assert second['b'].fa.flow_style() is True
+        assert second.ca.items['a'][2].value == '# comment\n'
+        assert yaml.version == (1, 1)
+        buf = StringIO()
+        yaml.dump(second, buf)
+        assert buf.getvalue() == u'%YAML 1.1\n---\na: 1  # comment\nb: [x, 0o7]\n'
+
+    def test_settings_in_key(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        cache_dir = str(tmpdir.join('cache'))
+        yaml = YAML(typ='safe', pure=True)
+        yaml.cache_dir = cache_dir
+        assert yaml.load(u'a: 1\n') == {'a': 1}
+        base = YAML(typ='base')
+        base.cache_dir = cache_dir
+        assert base.load(u'a: 1\n') == {'a': '1'}
+        assert yaml.load(u'a: 1\n') == {'a': 1}
+        assert yaml.load_cache.hits == 1
+
+    def test_resolvers_in_key(self, tmpdir):
+        import re
+        from ruamel.yaml import YAML
+        from ruamel.yaml.resolver import Resolver, implicit_resolvers
+
+        class MyResolver(Resolver):
+            pass
+
+        def load():
+            yaml = YAML(typ='safe', pure=True)
+            yaml.cache_dir = str(tmpdir)
+            return yaml.load(u'x: nada\n')
+
+        assert load() == {'x': 'nada'}
+        saved = implicit_resolvers[:]
+        try:
+            # also adds to the resolvers of the VersionedResolver used by YAML()
+            MyResolver.add_implicit_resolver(
+                u'tag:yaml.org,2002:null', re.compile(u'^nada$'), [u'n']
+            )
+            assert load() == {'x': None}
+        finally:
+            implicit_resolvers[:] = saved
+
+    def test_packed_in_key(self, tmpdir):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.comments import TableLineCol
+
+        for packed in [False, True]:
+            yaml = YAML()
+            yaml.cache_dir = str(tmpdir)
+            yaml.packed = packed
+            data = yaml.load(u'a: [1]\n')
+            assert isinstance(data.lc, TableLineCol) is packed
+            assert yaml.load_cache.hits == 0
+
+    def test_not_a_directory(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        tmpdir.join('file').write('')
+        yaml = YAML(typ='safe', pure=True)
+        yaml.cache_dir = str(tmpdir.join('file', 'sub'))
+        assert yaml.load(u'a: 1\n') == {'a': 1}
+        assert yaml.load(u'a: 1\n') == {'a': 1}
+        assert yaml.load_cache.misses == 2
+
+    def test_stale_entry(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        yaml.cache_dir = str(tmpdir)
+        yaml.load(u'a: 1\n')
+        cache = yaml.load_cache
+        cache.stamp = b'ruamel.yaml 0.0.0 python 0.0\n'  # upgraded ruamel.yaml
+        assert yaml.load(u'a: 1\n') == {'a': 1}
+        assert cache.misses == 2
+        assert len(tmpdir.listdir()) == 1
+
+    def test_eviction(self, tmpdir):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        yaml.cache_dir = str(tmpdir)
+        yaml.cache_size = 1000
+        for i in range(20):
+            yaml.load(u'- {}\n- {}\n'.format(i, u'x' * 100))
+        assert 0 < len(tmpdir.listdir()) < 20
+        assert sum(p.size() for p in tmpdir.listdir()) <= 1000
+
+    def test_error_not_cached(self, tmpdir):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.scanner import ScannerError
+
+        fn = Path(str(tmpdir)) / 'test.yaml'
+        fn.write_text(u'a: 1\nb: "x\n')
+        yaml = YAML()
+        yaml.cache_dir = str(tmpdir.join('cache'))
+        for _ in range(2):
+            with pytest.raises(ScannerError) as exc:
+                yaml.load(fn)
+            assert 'test.yaml", line 3' in str(exc.value)
+
+
 class TestDuplSet:
     def test_dupl_set_00(self):
         # round-trip-loader should except
@@ -241,6 +241,207 @@ class TestCommentsManipulation:
             """
         compare(data, exp)
 
+    def test_map_set_comment_after_key_change(self):
+        data = load("""
+            a: 1   # comment 1
+            b: 2
+            c: 3     # comment 3
+            """)
+        data.yaml_add_eol_comment('comment 2', key='b')
+        del data['b']
+        data.insert(0, 'x', 0)
+        data.move_to_end('c', last=False)
+        data['y'] = 4
+        data.yaml_add_eol_comment('comment 4', key='y')
+        data.yaml_add_eol_comment('comment 5', key='a')
+        exp = """
+            c: 3     # comment 3
+            x: 0
+            a: 1   # comment 5
+            y: 4   # comment 4
+            """
+        compare(data, exp)
+
+    def test_map_set_comments(self):
+        data = load("""
+            a: 1   # comment 1
+            b: 2
+            c: 3
+            d: 4
+            """)
+        data.yaml_add_eol_comments({'d': 'comment 4', 'c': 'comment 3', 'b': 'comment 2'})
+        exp = """
+            a: 1   # comment 1
+            b: 2   # comment 2
+            c: 3   # comment 3
+            d: 4   # comment 4
+            """
+        compare(data, exp)
+
+    def test_map_set_sparse_comments(self):
+        # the column comes from the nearest key before that has a comment
+        data = load("""
+            a: 1     # comment 1
+            b: 2
+            c: 3
+            d: 4
+            e: 5
+            f: 6
+            """)
+        data.yaml_add_eol_comments({'f': 'comment 6', 'd': 'comment 4'})
+        exp = """
+            a: 1     # comment 1
+            b: 2
+            c: 3
+            d: 4     # comment 4
+            e: 5
+            f: 6     # comment 6
+            """
+        compare(data, exp)
+
+    def test_map_set_comment_unsorted_keys(self):
+        # the keys before the first key that doesn't sort before the key
+        data = load("""
+            a: 1      # ca
+            x: 2
+            b: 3
+            m: 4
+            n: 5
+            o: 6
+            """)
+        data.yaml_add_eol_comment('new', 'n')
+        exp = """
+            a: 1      # ca
+            x: 2
+            b: 3
+            m: 4
+            n: 5      # new
+            o: 6
+            """
+        compare(data, exp)
+
+    def test_map_comment_column_as_scan(self):
+        # the column found through the key index is the one of going over the keys
+        import random
+
+        def scan_column(data, key):
+            pre = post = last = None
+            for x in data:
+                if pre is not None and x != key:
+                    post = x
+                    break
+                if x == key:
+                    pre = last
+                last = x
+            sel = None
+            if pre in data.ca.items:
+                sel = pre
+            elif post in data.ca.items:
+                sel = post
+            else:
+                for k in data:
+                    if k >= key:
+                        break
+                    if k in data.ca.items:
+                        sel = k
+            return None if sel is None else data._yaml_get_columnX(sel)
+
+        rnd = random.Random(42)
+        for idx in range(400):
+            if idx % 3:
+                keys = rnd.sample('abcdefghijklmnopqrstuvwxyz', rnd.randint(1, 12))
+                missing = ['0', 'm', 'zz']
+            else:
+                keys = rnd.sample(range(40), rnd.randint(1, 12))
+                missing = [-1, 20, 41]
+            data = round_trip_load(''.join(
+                '{0}: 1{1}{2}\n'.format(
+                    key, ' ' * rnd.randint(1, 8), '# c' if rnd.random() < 0.3 else ''
+                )
+                for key in keys
+            ))
+            for key in list(data) + missing:
+                assert data._yaml_get_column(key) == scan_column(data, key)
+            for key in rnd.sample(list(data), len(data)):
+                assert data._yaml_get_column(key) == scan_column(data, key)
+                data.yaml_add_eol_comment('new', key)
+
+    def test_seq_set_comments(self):
+        data = load("""
+            - a
+            - b
+            - c
+            """)
+        data.yaml_add_eol_comments({2: 'comment 3', 0: 'comment 1'}, column=6)
+        exp = """
+            - a   # comment 1
+            - b
+            - c   # comment 3
+            """
+        compare(data, exp)
+
+    def test_path_comments(self):
+        data = load("""
+            a: 1
+            b:
+              c: 2   # comment c
+              d:
+              - x
+              - y: 3
+                z: 4
+            e: 5
+            """)
+        data.yaml_add_path_comments(
+            eol={
+                ('a',): 'comment a',
+                ('b', 'd', 0): 'comment x',
+                ('b', 'd', 1, 'z'): 'comment z',
+            },
+            before={(): 'top', ('e',): 'before e', ('b', 'd', 1, 'z'): 'before z'},
+        )
+        exp = """
+            # top
+            a: 1  # comment a
+            b:
+              c: 2   # comment c
+              d:
+              - x  # comment x
+              - y: 3
+                # before z
+                z: 4  # comment z
+            # before e
+            e: 5
+            """
+        compare(data, exp)
+
+    def test_path_comments_from_scratch(self):
+        from ruamel.yaml.comments import CommentedMap, CommentedSeq
+
+        data = CommentedMap(a=CommentedMap(b=1, c=CommentedSeq([2, 3])))
+        data.yaml_add_path_comments(
+            eol={('a', 'b'): 'comment b', ('a', 'c', 1): 'comment 3'},
+            before={('a', 'c'): 'before c'},
+            column=8,
+        )
+        exp = """
+            a:
+              b: 1  # comment b
+              # before c
+              c:
+              - 2
+              - 3   # comment 3
+            """
+        compare(data, exp)
+
+    def test_path_comments_error(self):
+        data = load("""
+            a: [1]
+            """)
+        with pytest.raises(KeyError):
+            data.yaml_add_path_comments(eol={('b', 0): 'comment'})
+        with pytest.raises(IndexError):
+            data.yaml_add_path_comments(eol={('a', 1, 0): 'comment'})
+
     def test_before_top_map_rt(self):
         data = load("""
         a: 1
@@ -533,6 +533,123 @@ class TestCommentedMapMerge:
         assert data['y']['a'] == 1
         assert str(data['y']) == """ordereddict([('b', 2), ('a', 1)])"""
 
+    def test_merge_order(self):
+        data = round_trip_load("""
+        x: &x {a: 1, b: 2}
+        y: &y {a: 3, c: 4}
+        z:
+          <<: [*x, *y]
+          b: 5
+        """)
+        z = data['z']
+        assert z['a'] == 1
+        assert z['b'] == 5
+        assert z['c'] == 4
+        assert z.get('d') is None
+        with pytest.raises(KeyError):
+            z['d']
+
+    def test_merge_update(self):
+        data = round_trip_load("""
+        x: &x {a: 1, b: 2}
+        y: &y {a: 3, c: 4}
+        z:
+          <<: [*x, *y]
+          b: 5
+        """)
+        x, y, z = data['x'], data['y'], data['z']
+        y['d'] = 6
+        assert z['d'] == 6
+        del x['a']
+        assert z['a'] == 3
+        x['a'] = 7
+        assert z['a'] == 7
+        y['a'] = 8
+        assert z['a'] == 7
+        x['b'] = 9
+        assert z['b'] == 5
+        del y['d']
+        assert 'd' not in z
+
+    @pytest.mark.parametrize(
+        'mutate',
+        [
+            lambda m: m.pop('x'),
+            lambda m: m.popitem(),
+            lambda m: m.popitem(last=False),
+            lambda m: m.clear(),
+        ],
+    )
+    def test_merge_remove(self, mutate):
+        data = round_trip_load("""
+        a: &a {x: 1}
+        b: &b {x: 2, z: 3}
+        c:
+          <<: [*a, *b]
+          y: 0
+        """)
+        c = data['c']
+        del c['x']
+        assert c['x'] == 1  # builds the index
+        mutate(data['a'])
+        assert 'x' not in data['a']
+        assert c['x'] == 2
+        assert c.pop('x') == 2
+        assert c.pop('x', None) is None
+        with pytest.raises(KeyError):
+            c.pop('x')
+
+    def test_merge_add(self):
+        data = round_trip_load("""
+        a: &a {x: 1}
+        b: &b {z: 3}
+        c:
+          <<: [*a, *b]
+          y: 0
+        """)
+        c = data['c']
+        assert c.get('w') is None  # builds the index
+        data['b'].insert(0, 'w', 4)
+        assert c['w'] == 4
+        data['b'].setdefault('v', 5)
+        assert c['v'] == 5
+        data['a'].update({'v': 6, 'u': 7})
+        assert (c['v'], c['u']) == (6, 7)
+
+    def test_merge_chain(self):
+        data = round_trip_load("""
+        a: &a {k: 1}
+        b: &b
+          <<: *a
+          l: 2
+        c:
+          <<: *b
+          m: 3
+        """)
+        data['a']['k'] = 4
+        assert data['b']['k'] == 4
+        assert data['c']['k'] == 4
+        data['a']['n'] = 5
+        assert data['c']['n'] == 5
+        del data['a']['n']
+        assert 'n' not in data['c']
+
+    def test_merge_copy(self):
+        import copy
+        import pickle
+
+        data = round_trip_load("""
+        x: &x {a: 1}
+        z:
+          <<: *x
+          b: 2
+        """)
+        assert data['z']['a'] == 1
+        for res in [copy.deepcopy(data), pickle.loads(pickle.dumps(data))]:
+            assert res['z']['a'] == 1
+            with pytest.raises(KeyError):
+                res['z']['c']
+
 
 class TestEmptyLines:
     # prompted by issue 46 from Alex Harvey
@@ -846,3 +963,85 @@ class TestBlockScalarWithComments:
             data = ruamel.yaml.round_trip_load(commented_line)
 
             assert ruamel.yaml.round_trip_dump(data) == commented_line
+
+
+class TestPackedAttachments:
+    def load(self, inp):
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        yaml.packed = True
+        return yaml.load(inp)
+
+    def test_shared_format(self):
+        from ruamel.yaml.comments import Format, SharedFormat
+
+        data = self.load('a: {b: 1}\nc: {d: 2}\ne:\n  f: 3\n')
+        assert getattr(data['a'], Format.attrib) is getattr(data['c'], Format.attrib)
+        assert type(getattr(data['e'], Format.attrib)) is SharedFormat
+        data['a'].fa.set_block_style()
+        assert type(getattr(data['a'], Format.attrib)) is Format
+        assert data['c'].fa.flow_style() is True
+        assert round_trip_dump(data) == 'a:\n  b: 1\nc: {d: 2}\ne:\n  f: 3\n'
+
+    def test_round_trip(self):
+        inp = dedent("""\
+        # comment
+        a: [1, 2]   # eol
+        b:
+        - {x: 1}
+        - y
+        """)
+        data = self.load(inp)
+        assert round_trip_dump(data) == inp
+        assert data['b'].lc.item(1) == (4, 2)
+
+    def test_line_col_slots(self):
+        data = self.load('a: 1\n')
+        with pytest.raises(AttributeError):
+            data.lc.other = 1
+
+    def test_line_col_table(self):
+        from ruamel.yaml.comments import TableLineCol
+
+        inp = 'a: {b: 1}\nc: [1, 2]\nd:\n- x\n- y: 2\n  z: 3\n' + ''.join(
+            'k{0}: {0}\n'.format(i) for i in range(10)
+        )
+        data = self.load(inp)
+        expected = round_trip_load(inp)
+        assert isinstance(data.lc, TableLineCol)
+        assert data['a'].lc.table is data.lc.table
+        assert data.lc.data == expected.lc.data
+        assert data['c'].lc.data == {0: [1, 4], 1: [1, 7]}
+        for key in data:
+            assert data.lc.key(key) == expected.lc.key(key)
+            assert data.lc.value(key) == expected.lc.value(key)
+        assert data['d'].lc.item(1) == (4, 2)
+        assert (data['d'][1].lc.line, data['d'][1].lc.col) == (4, 2)
+        assert data['d'][1].lc.value('z') == (5, 5)
+        with pytest.raises(KeyError):
+            data.lc.key('missing')
+
+    def test_line_col_table_added(self):
+        import pickle
+
+        data = self.load('a: 1\nb: 2\n')
+        data['c'] = 3
+        data.lc.add_kv_line_col('c', [2, 0, 2, 3])
+        assert data.lc.key('c') == (2, 0)
+        assert data.lc.data['c'] == [2, 0, 2, 3]
+        copy = pickle.loads(pickle.dumps(data, 2))
+        assert copy.lc.value('b') == (1, 3) and copy.lc.value('c') == (2, 3)
+
+    def test_line_col_table_deepcopy(self):
+        import copy
+
+        data = self.load('a: {b: 1}\nc: [1, 2]\nd: {e: 3}\n')
+        res = copy.deepcopy(data)
+        # one copy of the table of the document, shared by the copied collections
+        assert res.lc.table is not data.lc.table
+        assert res['a'].lc.table is res.lc.table
+        assert res['c'].lc.table is res.lc.table
+        assert res['d'].lc.value('e') == (2, 7)
+        assert res['c'].lc.item(1) == (1, 7)
+        assert res['c'].fa.flow_style() is True
@@ -115,3 +115,36 @@ class TestCopy:
         - 2
         - 3
         """)
+
+
+class TestCopyAttributes:
+    # .lc, .fa and .ca are in __slots__ of CommentedMap/CommentedSeq
+    @pytest.mark.parametrize('packed', [False, True])
+    @pytest.mark.parametrize('how', ['copy', 'deepcopy', 'pickle'])
+    def test_line_col_format(self, how, packed):
+        import pickle
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        yaml.packed = packed
+        data = yaml.load(dedent("""\
+        a: 1   # comment
+        b: {c: 2}
+        d: [3, 4]
+        """))
+        func = dict(
+            copy=copy.copy,
+            deepcopy=copy.deepcopy,
+            pickle=lambda x: pickle.loads(pickle.dumps(x)),
+        )[how]
+        for org in [data, data['b'], data['d']]:
+            res = func(org)
+            assert res == org
+            assert res.lc.line == org.lc.line
+            assert res.lc.col == org.lc.col
+            assert res.lc.data == org.lc.data
+            assert res.fa.flow_style() == org.fa.flow_style()
+        res = func(data)
+        assert res.lc.key('b') == (1, 0)
+        assert res.ca.items['a'][2].value == '# comment\n'
+        assert round_trip_dump(res) == round_trip_dump(data)
@@ -0,0 +1,92 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of the collecting of the emitter output before it is written
+(Emitter.output_chunk_size)
+"""
+
+import pytest  # NOQA
+
+from ruamel.yaml.compat import StringIO, BytesIO
+
+inp = u"""\
+# comment
+a: &x [1, 2]   # eol
+b: *x
+c: |
+  literal
+  text
+d: "quoted \\u00e9"
+e: plain text that is long enough to be folded over more than one line if the width is small
+"""
+
+
+class WriteCounter(object):
+    def __init__(self, stream):
+        self.stream = stream
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+        return self.stream.write(data)
+
+
+def dump(data, encoding=None, typ='rt', explicit_start=False):
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ=typ, pure=True)
+    yaml.encoding = encoding
+    yaml.explicit_start = explicit_start
+    stream = WriteCounter(StringIO() if encoding is None else BytesIO())
+    if isinstance(data, list):
+        yaml.dump_all(data, stream)
+    else:
+        yaml.dump(data, stream)
+    return stream.stream.getvalue(), stream.writes
+
+
+def load(typ='rt'):
+    from ruamel.yaml import YAML
+
+    return YAML(typ=typ, pure=True).load(inp)
+
+
+class TestEmitterOutput:
+    @pytest.mark.parametrize('encoding', [None, 'utf-8', 'utf-16-le', 'utf-16-be'])
+    @pytest.mark.parametrize('typ', ['safe', 'rt'])
+    def test_chunk_size(self, monkeypatch, encoding, typ):
+        from ruamel.yaml.emitter import Emitter
+
+        data = load(typ)
+        expected, writes = dump(data, encoding, typ)
+        assert len(writes) == 1
+        monkeypatch.setattr(Emitter, 'output_chunk_size', 16)
+        value, writes = dump(data, encoding, typ)
+        assert value == expected
+        assert len(writes) > 1
+        # every chunk holds at least output_chunk_size characters, but the last
+        assert all(len(chunk) >= 16 for chunk in writes[:-1])
+        if encoding is not None:
+            assert all(isinstance(chunk, bytes) for chunk in writes)
+            if encoding.startswith('utf-16'):
+                assert value.decode(encoding).count(u'\ufeff') == 1
+                assert value.decode(encoding)[0] == u'\ufeff'
+
+    def test_document_end(self):
+        # every document is written when it is complete
+        value, writes = dump([{'a': 1}, {'b': 2}, {'c': 3}], explicit_start=True)
+        assert writes == ['---\na: 1\n', '---\nb: 2\n', '---\nc: 3\n']
+        assert value == ''.join(writes)
+
+    def test_context_manager(self):
+        from ruamel.yaml import YAML
+
+        stream = WriteCounter(BytesIO())
+        with YAML(typ='safe', pure=True, output=stream) as yaml:
+            yaml.explicit_start = True
+            yaml.dump({'a': 1})
+            assert stream.writes == [b'--- {a: 1}\n']
+            yaml.dump({'b': 2})
+        assert stream.stream.getvalue() == b'--- {a: 1}\n--- {b: 2}\n'
@@ -0,0 +1,200 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of incremental loading, where after an edit of the text only the
+affected entry is parsed again
+"""
+
+import pytest  # NOQA
+
+from roundtrip import dedent
+
+
+def dump(data, yaml):
+    from ruamel.yaml.compat import StringIO
+
+    buf = StringIO()
+    yaml.dump(data, buf)
+    return buf.getvalue()
+
+
+def line_cols(data, path=''):
+    from ruamel.yaml.comments import CommentedMap, CommentedSeq
+
+    res = []
+    if isinstance(data, (CommentedMap, CommentedSeq)):
+        lc = data.lc
+        entries = sorted((str(k), v) for k, v in (lc.data or {}).items())
+        res.append((path, lc.line, lc.col, entries))
+        items = data.items() if isinstance(data, CommentedMap) else enumerate(data)
+        for k, v in items:
+            res.extend(line_cols(v, path + '/' + str(k)))
+    return res
+
+
+inp = dedent("""\
+# head
+a: 1   # comment a
+b:
+  c: 2
+  d:
+  - x   # comment x
+  - y
+  -
+    z: 3
+    w: [1, 2]
+  # between
+  e: |
+    text
+    more
+f:
+- - p
+  - q
+- k: v
+  l: m
+g: "quoted"  # comment g
+
+# trailing
+""")
+
+
+class TestIncremental:
+    def check(self, doc, expect_reloaded=False):
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        data = yaml.load(doc.text)
+        assert doc.data == data
+        assert dump(doc.data, yaml) == dump(data, yaml)
+        assert line_cols(doc.data) == line_cols(data)
+        assert doc.reloaded is expect_reloaded
+
+    def edit(self, doc, old, new, expect_reloaded=False):
+        offset = doc.text.index(old)
+        data = doc.data
+        res = doc.edit(offset, len(old), new)
+        assert res is doc.data
+        assert (res is not data) is expect_reloaded
+        self.check(doc, expect_reloaded)
+
+    def test_scalar_value(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.check(doc, expect_reloaded=True)
+        self.edit(doc, 'z: 3', 'z: 42')
+        assert doc.data['b']['d'][2]['z'] == 42
+        self.edit(doc, '- y', '- yy')
+        self.edit(doc, '"quoted"', '"requoted"')
+        assert doc.data['g'] == 'requoted'
+
+    def test_add_lines(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.edit(doc, '  - y\n', '  - y\n  - y2\n  - y3\n')
+        assert doc.data['b']['d'][:4] == ['x', 'y', 'y2', 'y3']
+        assert doc.data['b']['e'] == 'text\nmore\n'
+        self.edit(doc, '  c: 2\n', '  c: 2\n  n: 4\n')
+        assert list(doc.data['b']) == ['c', 'n', 'd', 'e']
+        self.edit(doc, '    text\n', '    text\n    even\n')
+        assert doc.data['b']['e'] == 'text\neven\nmore\n'
+
+    def test_remove_lines(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.edit(doc, '  - y\n', '')
+        self.edit(doc, '    z: 3\n', '')
+        assert doc.data['b']['d'] == ['x', {'w': [1, 2]}]
+        self.edit(doc, '  l: m\n', '')
+        assert doc.data['f'][1] == {'k': 'v'}
+
+    def test_comments(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.edit(doc, '# comment x', '# comment xx')
+        self.edit(doc, '- y', '- y  # comment y')
+        self.edit(doc, 'k: v', 'k: v  # comment k')
+        assert '# comment y' in dump(doc.data, YAML())
+
+    def test_comments_between_entries(self):
+        from ruamel.yaml import YAML
+
+        # the comment precedes d, after the edit it is the eol comment of c
+        doc = YAML().load_incremental(u'b:\n  c: [1, 2]\n# eol c\n  d: 1\n')
+        self.edit(doc, '[', 'x[')
+        assert dump(doc.data, YAML()).count('# eol c') == 1
+        self.edit(doc, 'x[', '[')
+        doc = YAML().load_incremental(u'- [1, 2]\n# c\n- 3\n')
+        self.edit(doc, '[1', 'x[1')
+        self.edit(doc, 'x[1', '[1')
+
+    @pytest.mark.parametrize(
+        'text',
+        [
+            u'b:\n  c: [1, 2]\n# eol c\n  d: 1\n',
+            u'- [1, 2]\n# c\n- 3\n- {a: 1}\n\n# x\n- y  # eol\n',
+            u'a:\n  - x\n  # between\n  - [y]\n  # two\n  - z\nb: {q: 1}\n# c\nc: 3\n',
+        ],
+    )
+    def test_same_as_full_load(self, text):
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        edits = [(0, 'x'), (0, '['), (0, ' # c'), (0, '\n# z\n'), (1, '')]
+        for offset in range(len(text) + 1):
+            for removed, inserted in edits:
+                doc = yaml.load_incremental(text)
+                try:
+                    doc.edit(offset, min(removed, len(text) - offset), inserted)
+                except Exception:
+                    continue  # the edited text is not valid YAML
+                data = yaml.load(doc.text)
+                assert dump(doc.data, yaml) == dump(data, yaml)
+                assert line_cols(doc.data) == line_cols(data)
+
+    def test_rename_key(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.edit(doc, '  c: 2', '  cc: 2')
+        assert list(doc.data['b']) == ['cc', 'd', 'e']
+        # keys that already exist are loaded as duplicate keys would be
+        with pytest.raises(Exception):
+            doc.edit(doc.text.index('  cc: 2'), 7, '  d: 2')
+
+    def test_structure_change(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        self.edit(doc, 'a: 1', 'a:\n  n: 1')
+        assert doc.data['a'] == {'n': 1}
+        self.edit(doc, '- - p', '- -   p')
+        # the indicator of the outer sequence is part of the entry at the f level
+        with pytest.raises(Exception):
+            doc.edit(doc.text.index('- -   p'), 1, ' ')
+
+    def test_full_load(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        doc = yaml.load_incremental('a: &x 1\nb: *x\n')
+        assert doc.node is None
+        self.edit(doc, 'a: &x 1', 'a: &x 2', expect_reloaded=True)
+        assert doc.data['b'] == 2
+        doc = yaml.load_incremental('a: 1\nb: 2\n')
+        self.edit(doc, 'b: 2', 'b: &y 2', expect_reloaded=True)
+        assert doc.node is None
+
+    def test_error(self):
+        from ruamel.yaml import YAML
+
+        doc = YAML().load_incremental(inp)
+        with pytest.raises(ValueError):
+            doc.edit(len(inp), 1, '')
+        with pytest.raises(Exception):
+            doc.edit(doc.text.index('z: 3'), 4, 'z: [3')
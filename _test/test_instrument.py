@@ -0,0 +1,87 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of the timing of the stages of load and dump (yaml.instrument)
+"""
+
+import pytest  # NOQA
+
+from ruamel.yaml.compat import StringIO
+
+inp = 'a: &x [1, 2]\nb: *x\nc: {d: e, f: [g, h]}\n'
+
+
+def instrumented(typ='safe'):
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ=typ, pure=True)
+    calls = []
+    yaml.instrument = calls.append
+    return yaml, calls
+
+
+class TestInstrument:
+    @pytest.mark.parametrize('typ', ['safe', 'unsafe', 'rt'])
+    def test_load(self, typ):
+        yaml, calls = instrumented(typ)
+        yaml.load(inp)
+        yaml.load(inp.replace('*x', '3'))  # without aliases
+        stats = calls[0]
+        assert stats.call == 'load'
+        assert sorted(stats.stages) == ['composer', 'constructor', 'parser', 'scanner']
+        assert all(seconds > 0 for seconds in stats.stages.values())
+        assert stats.time == sum(stats.stages.values())
+        # the alias is an event, but neither a node nor an object
+        assert (stats.tokens, stats.events, stats.nodes, stats.objects) == (35, 23, 14, 14)
+        stats = calls[1]
+        assert (stats.tokens, stats.events, stats.nodes, stats.objects) == (35, 23, 15, 15)
+        assert stats.written == 0
+
+    def test_load_all(self):
+        yaml, calls = instrumented()
+        assert len(list(yaml.load_all(inp + '---\nx: 1\n'))) == 2
+        assert len(calls) == 1
+        assert (calls[0].nodes, calls[0].objects) == (17, 17)
+
+    @pytest.mark.parametrize('encoding', [None, 'utf-16-le'])
+    def test_dump(self, encoding):
+        from ruamel.yaml.compat import BytesIO
+
+        yaml, calls = instrumented('rt')
+        data = yaml.load('a: [1, 2]\nb: {c: d}\n')
+        yaml.encoding = encoding
+        buf = StringIO() if encoding is None else BytesIO()
+        yaml.dump(data, buf)
+        stats = calls[-1]
+        assert stats.call == 'dump'
+        assert sorted(stats.stages) == ['emitter', 'representer', 'serializer']
+        assert (stats.events, stats.nodes) == (16, 9)
+        assert stats.written == len(buf.getvalue())
+
+    def test_stats(self):
+        from ruamel.yaml.instrument import Stats
+
+        yaml, calls = instrumented()
+        yaml.instrument = stats = Stats()
+        for _ in range(3):
+            yaml.dump(yaml.load(inp), StringIO())
+        assert stats.calls == {'load': 3, 'dump': 3}
+        assert stats.totals['load'].tokens == 3 * 35
+        assert stats.totals['load'].time > 0
+        assert 'scanner' in str(stats)
+        stats.reset()
+        assert stats.calls == {}
+
+    def test_unwrapped(self):
+        yaml, calls = instrumented()
+        with pytest.raises(Exception):
+            yaml.load('a: [1\n')
+        assert len(calls) == 1
+        yaml.load(inp)
+        for component in (yaml.constructor, yaml.composer, yaml.parser, yaml.scanner):
+            assert not [x for x in vars(component) if x.startswith(('get_', 'check_'))]
+        yaml.instrument = None
+        assert yaml.load(inp)['b'] == [1, 2]
+        assert len(calls) == 2
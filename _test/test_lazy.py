@@ -0,0 +1,124 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of lazy loading, where collections in mappings and sequences
+are constructed on first access
+"""
+
+import copy
+import pytest  # NOQA
+
+from roundtrip import dedent
+
+
+def lazy_yaml():
+    from ruamel.yaml import YAML
+
+    yaml = YAML()
+    yaml.lazy = True
+    return yaml
+
+
+def dump(data, yaml):
+    from ruamel.yaml.compat import StringIO
+
+    buf = StringIO()
+    yaml.dump(data, buf)
+    return buf.getvalue()
+
+
+inp = dedent("""\
+# top comment
+base: &b
+  x: 1   # eol comment x
+  y: [1, 2]
+items: &i
+- {p: 1}
+- q   # eol comment q
+- [r, s]
+alias: *i
+merged:
+  <<: *b
+  z: 3
+omap: !!omap
+- k: v
+empty:
+""")
+
+
+class TestLazyLoad:
+    def test_deferred(self):
+        from ruamel.yaml.comments import LazyCommentedMap, LazyValue
+
+        data = lazy_yaml().load(inp)
+        assert isinstance(data, LazyCommentedMap)
+        assert isinstance(dict.__getitem__(data, 'items'), LazyValue)
+        assert dict.__getitem__(data, 'empty') is None
+        data['items']
+        assert not isinstance(dict.__getitem__(data, 'items'), LazyValue)
+        assert isinstance(dict.__getitem__(data, 'base'), LazyValue)
+
+    def test_equal_to_eager(self):
+        from ruamel.yaml import YAML
+
+        assert lazy_yaml().load(inp) == YAML().load(inp)
+
+    def test_len_in_iter(self):
+        data = lazy_yaml().load(inp)
+        assert len(data) == 6
+        assert 'alias' in data
+        assert list(data) == ['base', 'items', 'alias', 'merged', 'omap', 'empty']
+        seq = data['items']
+        assert len(seq) == 3
+        assert 'q' in seq
+        assert list(seq) == [dict(p=1), 'q', ['r', 's']]
+        assert list(data.values())[1] == seq
+        assert seq[1:] == [u'q', ['r', 's']]
+
+    def test_alias_identity(self):
+        data = lazy_yaml().load(inp)
+        assert data['alias'] is data['items']
+        assert data['merged']['y'] is data['base']['y']
+
+    def test_merge(self):
+        data = lazy_yaml().load(inp)
+        assert data['merged']['x'] == 1
+        assert dict(data['merged']) == dict(z=3, x=1, y=[1, 2])
+
+    def test_recursive(self):
+        data = lazy_yaml().load('&r [1, *r, {a: *r}]')
+        assert data[1] is data
+        assert data[2]['a'] is data
+
+    def test_line_col(self):
+        data = lazy_yaml().load(inp)
+        assert data.lc.key('items') == (4, 0)
+        assert data['items'].lc.item(2) == (7, 2)
+
+    def test_deepcopy(self):
+        data = lazy_yaml().load(inp)
+        res = copy.deepcopy(data)
+        assert res == data
+
+    def test_dump_unaccessed(self):
+        from ruamel.yaml import YAML
+
+        yaml = lazy_yaml()
+        assert dump(yaml.load(inp), yaml) == dump(YAML().load(inp), YAML())
+
+    def test_dump_partially_accessed(self):
+        from ruamel.yaml import YAML
+
+        yaml = lazy_yaml()
+        data = yaml.load(inp)
+        data['items'][2].append('t')
+        expected = YAML().load(inp)
+        expected['items'][2].append('t')
+        assert dump(data, yaml) == dump(expected, YAML())
+
+    def test_load_all(self):
+        res = list(lazy_yaml().load_all('a: [1]\n---\nb: {c: 2}\n'))
+        assert res[1]['b']['c'] == 2
+        assert res[0]['a'] == [1]
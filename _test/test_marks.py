@@ -0,0 +1,116 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of the compact marks (yaml.compact_marks = True), that do not keep the
+input alive after loading
+"""
+
+import pytest  # NOQA
+
+
+def load_error(inp, compact, typ='safe'):
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ=typ, pure=True)
+    yaml.compact_marks = compact
+    with pytest.raises(Exception) as exc:
+        yaml.load(inp)
+    return exc.value
+
+
+class TestCompactMarks:
+    @pytest.mark.parametrize(
+        'inp',
+        [
+            'a: 1\nb: [1, 2\nc: 3\n',
+            'a:\n  - 1\n - 2\n',
+            'x' * 200 + ': 1\n' + 'y' * 100 + ' : : - [\n',
+            b'a: {b: 1\n',
+            'a: 1\na: 2\n',
+            'a: !!map x\n',
+        ],
+    )
+    def test_error_message(self, inp):
+        from ruamel.yaml.error import StringMark
+
+        exc = load_error(inp, True)
+        assert str(exc) == str(load_error(inp, False))
+        assert isinstance(exc.problem_mark, StringMark)
+
+    def test_input_released(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.error import CompactMark
+
+        yaml = YAML()
+        yaml.compact_marks = True
+        data = yaml.load('a: 1  # comment\nb: [1, 2]\n')
+        mark = data.ca.items['a'][2].start_mark
+        assert isinstance(mark, CompactMark)
+        assert mark.source.buffer is None
+        assert (mark.line, mark.column) == (0, 6)
+        assert str(mark) == '  in "<unicode string>", line 1, column 7'
+        assert data.lc.data == {'a': [0, 0, 0, 3], 'b': [1, 0, 1, 3]}
+
+    def test_marks(self):
+        from ruamel.yaml import YAML
+
+        inp = 'a: 1\nb:\n- c\n- {d: e}\n'
+        res = []
+        for compact in (False, True):
+            yaml = YAML()
+            yaml.compact_marks = compact
+            res.append(
+                [
+                    (m.index, m.line, m.column)
+                    for event in yaml.parse(inp)
+                    for m in (event.start_mark, event.end_mark)
+                ]
+            )
+        assert res[0] == res[1]
+
+
+class TestNoMarks:
+    def yaml(self, typ='safe'):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ=typ, pure=True)
+        yaml.marks = False
+        return yaml
+
+    def test_load(self):
+        yaml = self.yaml()
+        assert yaml.load('a: [1, {b: 2}]\n') == {'a': [1, {'b': 2}]}
+        assert all(
+            event.start_mark is None and event.end_mark is None
+            for event in yaml.parse('a: [1, {b: 2}]\n')
+        )
+
+    @pytest.mark.parametrize(
+        'inp',
+        ['a: 1\nb: [1, 2\nc: 3\n', 'a: 1\na: 2\n', 'a: !!map x\n', 'a: &x 1\nb: *y\n'],
+    )
+    def test_error_position(self, inp):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.compat import StringIO
+
+        exc = load_error(inp, False)
+        assert exc.problem_mark is not None
+        yaml = self.yaml()
+        for stream in (lambda: inp, lambda: inp.encode('utf-8'), lambda: StringIO(inp)):
+            with pytest.raises(type(exc)) as no_marks:
+                yaml.load(stream())
+            assert str(no_marks.value) == str(load_error(stream(), False))
+        with pytest.raises(type(exc)) as no_marks:
+            list(yaml.load_all('---\nx: 1\n---\n' + inp))
+        assert no_marks.value.problem_mark.line == exc.problem_mark.line + 3
+        # the marks are only created for the rescan
+        assert yaml.load('a: 1\n') == {'a': 1}
+        assert yaml.reader.create_marks is False
+        assert YAML(typ='safe', pure=True).load(StringIO('a: 1')) == {'a': 1}
+
+    def test_round_trip(self):
+        yaml = self.yaml('rt')
+        data = yaml.load('a: 1  # comment\nb: [1, 2]\n')
+        assert data.lc.data == {'a': [0, 0, 0, 3], 'b': [1, 0, 1, 3]}
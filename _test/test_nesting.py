@@ -0,0 +1,86 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of composing and serializing documents nested deeper than the
+recursion limit
+"""
+
+import sys
+
+import pytest  # NOQA
+
+
+depth = sys.getrecursionlimit() * 3
+
+
+class TestNesting:
+    def test_compose_serialize_sequences(self):
+        import ruamel.yaml
+        from ruamel.yaml.nodes import SequenceNode
+
+        node = ruamel.yaml.compose(u'[\n' * depth + u']\n' * depth)
+        nr = 0
+        while node.value:
+            assert isinstance(node, SequenceNode)
+            node = node.value[0]
+            nr += 1
+        assert nr == depth - 1
+        out = ruamel.yaml.serialize(ruamel.yaml.compose(u'[\n' * depth + u']\n' * depth))
+        assert out.replace(u'\n', u'').replace(u' ', u'') == u'[' * depth + u']' * depth
+
+    def test_compose_serialize_mappings(self):
+        import ruamel.yaml
+
+        text = u'{a:\n' * depth + u'1' + u'}\n' * depth
+        out = ruamel.yaml.serialize(ruamel.yaml.compose(text))
+        out = out.replace(u'\n', u'').replace(u' ', u'')
+        assert out == u'{a:' * depth + u'1' + u'}' * depth
+
+    def test_anchors(self):
+        import ruamel.yaml
+
+        node = ruamel.yaml.compose(u'&a\n- b\n- &c\n  d: *c\n  e: &f [1]\n- *f\n- *a\n')
+        assert node.value[3] is node
+        assert node.value[1].value[0][1] is node.value[1]
+        assert node.value[2] is node.value[1].value[1][1]
+        # anchors are numbered in the order of their second occurrence
+        out = ruamel.yaml.serialize(node)
+        assert out == (
+            u'&id003\n- b\n- &id001\n  d: *id001\n  e: &id002 [1]\n- *id002\n- *id003\n'
+        )
+
+    def test_rt_load(self):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.compat import StringIO
+
+        yaml = YAML()
+        text = u'a:\n  b: [c, d]\n  f: &g\n    h: i  # comment\n  j: *g\n  k: {l: m}\n'
+        data = yaml.load(text)
+        buf = StringIO()
+        yaml.dump(data, buf)
+        assert buf.getvalue() == text
+
+    def test_compose_overrides(self):
+        # compose_sequence_node/compose_mapping_node of a subclass are called
+        from ruamel.yaml import YAML
+        from ruamel.yaml.composer import Composer
+
+        class MyComposer(Composer):
+            def compose_sequence_node(self, anchor):
+                node = Composer.compose_sequence_node(self, anchor)
+                node.value.reverse()
+                return node
+
+            def compose_mapping_node(self, anchor):
+                node = Composer.compose_mapping_node(self, anchor)
+                node.value.append((node.value[0][0], node.value[0][1]))
+                del node.value[0]
+                return node
+
+        yaml = YAML(typ='safe', pure=True)
+        yaml.Composer = MyComposer
+        data = yaml.load(u'- [1, 2, {a: 1, b: [3, 4]}]\n- x\n')
+        assert data == ['x', [{'b': [4, 3], 'a': 1}, 2, 1]]
+        assert list(data[1][0]) == ['b', 'a']
@@ -0,0 +1,38 @@
+# coding: utf-8
+
+import pytest  # NOQA
+
+from ruamel.yaml.reader import Reader
+
+
+def positions(text, steps, bulk_length, method='forward'):
+    reader = Reader(text)
+    reader.forward_bulk_length = bulk_length
+    for step in steps:
+        getattr(reader, method)(step)
+    return reader.index, reader.line, reader.column, reader.pointer
+
+
+class TestForward:
+    @pytest.mark.parametrize(
+        'text',
+        [
+            u'abcdefghijklmnopqrstuvwxyz',
+            u'abc\ndefgh\nijklmnopqrstuvwxyz\n',
+            u'abc\r\ndefgh\rijklm\r\nnopqrstuvwxyz',
+            u'\uFEFFabcdefghij\nklm\uFEFFnopqrstuvwxyz',
+            u'abc\x85defgh ijklm nopqrs\r',
+        ],
+    )
+    @pytest.mark.parametrize('method', ['forward', 'forward_1_1'])
+    def test_bulk_matches_loop(self, text, method):
+        for steps in ([len(text)], [3, 9, len(text) - 12], [11, 1, len(text) - 12]):
+            assert positions(text, steps, 1, method) == positions(
+                text, steps, len(text) + 1, method
+            )
+
+    def test_cr_at_end_of_span(self):
+        # the '\r' is only a line break if the character following the span is not '\n'
+        text = u'abcdefgh\r\nijk'
+        assert positions(text, [9], 1) == (9, 0, 9, 9)
+        assert positions(text, [10], 1) == (10, 1, 0, 10)
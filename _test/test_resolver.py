@@ -0,0 +1,114 @@
+# coding: utf-8
+
+import re
+
+import pytest  # NOQA
+
+from ruamel.yaml.nodes import ScalarNode
+from ruamel.yaml.resolver import BaseResolver, VersionedResolver, CompiledResolvers
+
+scalars = [
+    u'', u'~', u'null', u'Null', u'nul', u'true', u'tRue', u'yes', u'No', u'on', u'0', u'-12',
+    u'+1_000', u'0o17', u'017', u'0x1F', u'0b101', u'1:30', u'1:30.5', u'1.5', u'-.5', u'.inf',
+    u'.nan', u'1e5', u'2001-12-14', u'2001-12-14t21:59:43.10-05:00', u'<<', u'=', u'abc',
+    u'1.2.3', u'12abc', u'.', u'-',
+]
+
+
+class TestCompiledResolvers:
+    @pytest.mark.parametrize('version', [(1, 1), (1, 2)])
+    def test_combined_matches_sequential(self, version):
+        resolvers = VersionedResolver(version=version).versioned_resolver
+        combined = CompiledResolvers(resolvers)
+        sequential = CompiledResolvers(resolvers, combine=False)
+        for value in scalars:
+            assert combined.resolve(value) == sequential.resolve(value), value
+
+    def test_add_version_implicit_resolver(self):
+        resolver = VersionedResolver(version=(1, 2))
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'tag:yaml.org,2002:str'
+        resolver.add_version_implicit_resolver(
+            (1, 2), u'!si', re.compile(u'^[0-9]+[kMG]$'), list(u'0123456789')
+        )
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'!si'
+        assert resolver.resolve(ScalarNode, u'12', (True, False)) == u'tag:yaml.org,2002:int'
+
+    def test_add_implicit_resolver_any_first(self):
+        class MyResolver(BaseResolver):
+            pass
+
+        tag = MyResolver().resolve(ScalarNode, u'x-1', (True, False))
+        assert tag == u'tag:yaml.org,2002:str'
+        MyResolver.add_implicit_resolver_base(u'!dashed', re.compile(u'^\\w+-\\w+$'), None)
+        assert MyResolver().resolve(ScalarNode, u'x-1', (True, False)) == u'!dashed'
+        # resolving does not grow the list of resolvers (as += on the looked up list did)
+        MyResolver().resolve(ScalarNode, u'y-2', (True, False))
+        assert len(MyResolver.yaml_implicit_resolvers[None]) == 1
+
+    def test_groups_not_combined(self):
+        pattern = re.compile(u'^(?P<value>[0-9]+)(?P<prefix>[kMG])$')
+        resolvers = {u'1': [(u'!si', pattern), (u'!int', re.compile(u'^[0-9]+$'))]}
+        compiled = CompiledResolvers(resolvers)
+        assert compiled.resolve(u'10k') == u'!si'
+        assert compiled.resolve(u'10') == u'!int'
+        assert compiled.resolve(u'1x') is None
+
+
+class TestResolverCache:
+    def test_cache_hits(self):
+        resolver = VersionedResolver(version=(1, 2))
+        resolver.implicit_cache_size = 2
+        for value in [u'true', u'42', u'true', u'abc', u'true', u'42']:
+            resolver.resolve(ScalarNode, value, (True, False))
+        info = resolver.cache_info()
+        # '42' was dropped when 'abc' was added, 'true' was used more recently
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (2, 4, 2, 2)
+        assert resolver.resolve(ScalarNode, u'42', (True, False)) == u'tag:yaml.org,2002:int'
+
+    def test_cache_invalidated(self):
+        resolver = VersionedResolver(version=(1, 2))
+        resolver.implicit_cache_size = 10
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'tag:yaml.org,2002:str'
+        resolver.add_version_implicit_resolver(
+            (1, 2), u'!si', re.compile(u'^[0-9]+[kMG]$'), list(u'0123456789')
+        )
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'!si'
+
+    def test_cache_per_resolver(self):
+        from ruamel.yaml.resolver import Resolver
+
+        resolvers = [Resolver(), Resolver()]
+        for resolver in resolvers:
+            resolver.implicit_cache_size = 10
+        for value in [u'true', u'true', u'42']:
+            resolvers[0].resolve(ScalarNode, value, (True, False))
+        resolvers[1].resolve(ScalarNode, u'true', (True, False))
+        assert resolvers[0].cache_info()[:2] == (1, 2)
+        assert resolvers[1].cache_info()[:2] == (0, 1)
+
+    def test_cache_invalidated_by_class(self):
+        class MyResolver(BaseResolver):
+            pass
+
+        resolver = MyResolver()
+        resolver.implicit_cache_size = 10
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'tag:yaml.org,2002:str'
+        MyResolver.add_implicit_resolver_base(
+            u'!si', re.compile(u'^[0-9]+[kMG]$'), list(u'0123456789')
+        )
+        assert resolver.resolve(ScalarNode, u'12k', (True, False)) == u'!si'
+        # changed in place, seen by the resolvers made afterwards
+        MyResolver.yaml_implicit_resolvers[u'1'] = []
+        tag = MyResolver().resolve(ScalarNode, u'12k', (True, False))
+        assert tag == u'tag:yaml.org,2002:str'
+
+    def test_yaml_resolver_cache_size(self):
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ='safe', pure=True)
+        yaml.resolver_cache_size = 100
+        assert yaml.load(u'[true, 1, true, 1, null, a, a]') == [
+            True, 1, True, 1, None, 'a', 'a'
+        ]
+        info = yaml.resolver.cache_info()
+        assert info.hits == 3 and info.misses == 4
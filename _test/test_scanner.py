@@ -0,0 +1,77 @@
+# coding: utf-8
+
+from __future__ import print_function
+
+"""
+testing of the scanning of plain and quoted scalars, the runs of characters
+that cannot end a scalar are matched with a regex on the reader buffer
+"""
+
+import re
+
+import pytest  # NOQA
+
+inputs = [
+    u'a: b\nc d: e f  # comment\ng:h: i#j\n',
+    u'- a ? b\n- ?c\n- a : b\n- x:\n    y\n',
+    u'[a, b:c, {x: y, z}, d?e, f g]\n',
+    u'{a: [b, c], "d": \'e\', f: g h, i:j: 1}\n',
+    u'k: plain\n  continued # not a comment\n  line # comment\n',
+    u'é: ü中文 😀 x\n"q é": \'😀 \'\'\'\nu: "a\\tb \\u00e9 \\\n  c"\n',
+    u'a: b\u2028c\x85d\n',
+    u'long: ' + u'word é ' * 300 + u'\nflow: [' + u'item, ' * 200 + u'end]\n',
+    u'a: 1',
+]
+
+
+class ChunkedStream(object):
+    """file like object returning at most size bytes per read()"""
+
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+        self.pos = 0
+
+    def read(self, size=-1):
+        res = self.data[self.pos : self.pos + self.size]
+        self.pos += len(res)
+        return res
+
+
+def tokens(stream, loader):
+    import ruamel.yaml
+
+    return [
+        (
+            type(token).__name__,
+            getattr(token, 'value', None),
+            getattr(token, 'style', None),
+            token.start_mark.index,
+            token.start_mark.line,
+            token.start_mark.column,
+            token.end_mark.index,
+            token.end_mark.column,
+        )
+        for token in ruamel.yaml.scan(stream, Loader=loader)
+    ]
+
+
+class TestScalarRuns:
+    @pytest.mark.parametrize('inp', inputs)
+    @pytest.mark.parametrize('loader', ['SafeLoader', 'RoundTripLoader'])
+    def test_runs_match_character_loop(self, monkeypatch, inp, loader):
+        import ruamel.yaml
+        import ruamel.yaml.scanner
+
+        Loader = getattr(ruamel.yaml, loader)
+        # regexes matching nothing make the scanner go over every character
+        nothing = re.compile(u'')
+        with monkeypatch.context() as m:
+            for name in ['_PLAIN_RUN', '_PLAIN_FLOW_RUN', '_FLOW_SCALAR_RUN']:
+                m.setattr(ruamel.yaml.scanner, name, nothing)
+            expected = tokens(inp, Loader)
+        assert tokens(inp, Loader) == expected
+        data = inp.encode('utf-8')
+        for size in [1, 2, 3, 7, 64]:
+            # the runs end at the end of what is read, and multi-byte characters are split
+            assert tokens(ChunkedStream(data, size), Loader) == expected
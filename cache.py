@@ -0,0 +1,198 @@
+# coding: utf-8
+
+from __future__ import print_function, absolute_import, division, unicode_literals
+
+"""
+on-disk cache of the data loaded by YAML.load(), keyed by a hash of the input
+and of the settings that influence loading. An entry is a stamp line (the
+ruamel.yaml and Python version) followed by the pickled data, an entry with a
+different stamp is removed when found and replaced after loading. When the
+total size of the entries exceeds the maximum, the least recently used ones
+are removed. When the directory cannot be written, the data is not cached.
+
+The entries are unpickled, so only use a directory that is not writable by
+others.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+import ruamel.yaml
+from ruamel.yaml.compat import text_type, PY3
+from ruamel.yaml.resolver import VersionedResolver, implicit_resolvers
+
+if False:  # MYPY
+    from typing import Any, List, Optional, Tuple  # NOQA
+
+__all__ = ['LoadCache']
+
+suffix = '.pickle'
+
+
+class LoadCache(object):
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        # type: (Any, int) -> None
+        self.directory = str(directory)
+        self.max_size = max_size
+        self.stamp = 'ruamel.yaml {} python {}.{}\n'.format(
+            ruamel.yaml.__version__, *sys.version_info[:2]
+        ).encode('ascii')
+        self.hits = self.misses = 0
+
+    def key(self, yaml, data):
+        # type: (Any, Any) -> str
+        """hash of the input data and the settings of yaml that affect loading"""
+        if isinstance(data, text_type):
+            data = data.encode('utf-8', 'surrogatepass' if PY3 else 'strict')
+        constructor = yaml.Constructor
+        settings = [
+            yaml.typ,
+            yaml.version,
+            yaml.tags,
+            yaml.preserve_quotes,
+            yaml.allow_duplicate_keys,
+            yaml.packed,
+            resolver_settings(yaml.Resolver),
+            # add_constructor()/register_class() change what is constructed
+            sorted(
+                (repr(tag), qualified_name(func))
+                for tag, func in list(constructor.yaml_constructors.items())
+                + list(constructor.yaml_multi_constructors.items())
+            ),
+        ]
+        h = hashlib.sha256(repr(settings).encode('utf-8'))
+        h.update(data)
+        return h.hexdigest()
+
+    def path(self, key):
+        # type: (str) -> str
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key):
+        # type: (str) -> Tuple[bool, Any]
+        """(True, value) for a cached entry, else (False, None)"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fp:
+                if fp.readline() != self.stamp:
+                    raise ValueError('stamp')
+                value = pickle.load(fp)
+        except (IOError, OSError):
+            self.misses += 1
+            return False, None
+        except Exception:  # stale or damaged entry
+            self.remove(path)
+            self.misses += 1
+            return False, None
+        try:
+            os.utime(path, None)  # most recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return True, value
+
+    def put(self, key, value):
+        # type: (str, Any) -> bool
+        """store value, False if it cannot be pickled or written"""
+        try:
+            pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # write to a temporary file, so that a concurrent get never reads a partial entry
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        except (IOError, OSError):  # not a (writable) directory
+            return False
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(self.stamp)
+                fp.write(pickled)
+            getattr(os, 'replace', os.rename)(tmp_path, self.path(key))
+        except (IOError, OSError):  # e.g. the disk is full
+            self.remove(tmp_path)
+            return False
+        except Exception:
+            self.remove(tmp_path)
+            raise
+        self.evict()
+        return True
+
+    def evict(self):
+        # type: () -> None
+        """remove the least recently used entries until they fit in max_size"""
+        entries = []  # type: List[Any]
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path, st.st_size))
+            total += st.st_size
+        entries.sort()
+        for _, path, size in entries:
+            if total <= self.max_size:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        # type: () -> None
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(suffix):
+                self.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def remove(path):
+        # type: (str) -> None
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def resolver_settings(resolver):
+    # type: (Any) -> List[Any]
+    """
+    the implicit and path resolvers of the resolver class, these change with
+    add_implicit_resolver() and add_path_resolver()
+    """
+    res = [
+        sorted(
+            (repr(ch), [(tag, pattern(regexp)) for tag, regexp in resolvers])
+            for ch, resolvers in resolver.yaml_implicit_resolvers.items()
+        ),
+        sorted(repr(item) for item in resolver.yaml_path_resolvers.items()),
+    ]  # type: List[Any]
+    if issubclass(resolver, VersionedResolver):
+        # the version dependent resolvers are created from this list when loading
+        res.append(
+            [
+                (versions, tag, pattern(regexp), first)
+                for versions, tag, regexp, first in implicit_resolvers
+            ]
+        )
+    return res
+
+
+def pattern(regexp):
+    # type: (Any) -> Any
+    return getattr(regexp, 'pattern', regexp), getattr(regexp, 'flags', None)
+
+
+def qualified_name(func):
+    # type: (Any) -> str
+    return '{}.{}'.format(
+        getattr(func, '__module__', None),
+        getattr(func, '__qualname__', getattr(func, '__name__', type(func).__name__)),
+    )
@@ -10,12 +10,16 @@ a separate base
 
 import sys
 import copy
+from array import array
+from bisect import bisect_left
 
 
 from ruamel.yaml.compat import ordereddict  # type: ignore
 from ruamel.yaml.compat import PY2, string_types, MutableSliceableSequence
 from ruamel.yaml.scalarstring import ScalarString
 from ruamel.yaml.anchor import Anchor
+from ruamel.yaml.error import CommentMark
+from ruamel.yaml.tokens import CommentToken
 
 if PY2:
     from collections import MutableSet, Sized, Set, Mapping
@@ -28,7 +32,8 @@ if False:  # MYPY
 # fmt: off
 __all__ = ['CommentedSeq', 'CommentedKeySeq',
            'CommentedMap', 'CommentedOrderedMap',
-           'CommentedSet', 'comment_attrib', 'merge_attrib']
+           'CommentedSet', 'LazyCommentedMap', 'LazyCommentedSeq',
+           'comment_attrib', 'merge_attrib']
 # fmt: on
 
 comment_attrib = '_yaml_comment'
@@ -121,7 +126,22 @@ class Format(object):
         return self._flow_style
 
 
+class SharedFormat(Format):
+    """
+    the Format of collections loaded with yaml.packed, one instance per flow
+    style is shared by all collections of a document. Accessing .fa replaces
+    it by a Format of the collection's own
+    """
+
+    __slots__ = ()
+
+    def __init__(self, flow_style):
+        # type: (Any) -> None
+        self._flow_style = flow_style
+
+
 class LineCol(object):
+    __slots__ = ('line', 'col', 'data')
     attrib = line_col_attrib
 
     def __init__(self):
@@ -164,6 +184,142 @@ class LineCol(object):
         self.data[key] = data
 
 
+class LineColTable(object):
+    """
+    the line/col of the mapping entries (key line, key col, value line, value
+    col) and sequence items (line, col, line, col) of a document, in one array
+    indexed by the ordinal of the entry (-1 for entries that are not set). The
+    entries of a collection have consecutive ordinals, keys has the mapping
+    key for each ordinal
+    """
+
+    __slots__ = ('positions', 'keys')
+
+    def __init__(self):
+        # type: () -> None
+        self.positions = array('i')
+        self.keys = []  # type: List[Any]
+
+    def reserve(self, count):
+        # type: (int) -> int
+        """add count entries, returns the ordinal of the first"""
+        first = len(self.keys)
+        self.keys.extend([None] * count)
+        self.positions.extend(empty_positions * count)
+        return first
+
+
+empty_positions = array('i', [-1] * 4)
+
+
+class TableLineCol(LineCol):
+    """
+    the .lc of a collection loaded with yaml.packed, with the line/col of its
+    entries in the LineColTable of the document. Entries added after loading
+    are kept in a dict of their own. The .data dict is built on access, so
+    changing it has no effect (but assigning to .data has)
+    """
+
+    __slots__ = ('table', 'sequence', 'first', 'count', '_index', '_extra')
+
+    def __init__(self, table, line, col, sequence=False):
+        # type: (LineColTable, Any, Any, bool) -> None
+        self.table = table
+        self.line = line
+        self.col = col
+        self.sequence = sequence
+        self.first = self.count = 0
+        self._index = None  # type: Optional[Dict[Any, int]]
+        self._extra = None  # type: Optional[Dict[Any, Any]]
+
+    def reserve(self, count):
+        # type: (int) -> None
+        self.first = self.table.reserve(count)
+        self.count = count
+        self._index = None
+
+    def set_entry(self, idx, key, line, col, value_line, value_col):
+        # type: (int, Any, int, int, int, int) -> None
+        ordinal = self.first + idx
+        self.table.keys[ordinal] = key
+        self.table.positions[4 * ordinal : 4 * ordinal + 4] = array(
+            'i', (line, col, value_line, value_col)
+        )
+
+    def _ordinal(self, k):
+        # type: (Any) -> Optional[int]
+        keys, positions = self.table.keys, self.table.positions
+        if self.count <= 8:
+            for ordinal in range(self.first, self.first + self.count):
+                key = keys[ordinal]
+                if (key is k or key == k) and positions[4 * ordinal] >= 0:
+                    return ordinal
+            return None
+        if self._index is None:
+            self._index = {}
+            for ordinal in range(self.first + self.count - 1, self.first - 1, -1):
+                if positions[4 * ordinal] >= 0:
+                    self._index[keys[ordinal]] = ordinal
+        return self._index.get(k)
+
+    def _kv(self, k, x0, x1):
+        # type: (Any, Any, Any) -> Any
+        if self._extra is not None and k in self._extra:
+            data = self._extra[k]
+            return data[x0], data[x1]
+        ordinal = self._ordinal(k)
+        if ordinal is None:
+            if not self.count and self._extra is None:
+                return None
+            raise KeyError(k)
+        return self.table.positions[4 * ordinal + x0], self.table.positions[4 * ordinal + x1]
+
+    def item(self, idx):
+        # type: (Any) -> Any
+        if self._extra is not None and idx in self._extra:
+            return self._extra[idx][0], self._extra[idx][1]
+        if not self.count and self._extra is None:
+            return None
+        ordinal = 4 * (self.first + idx)
+        if not 0 <= idx < self.count or self.table.positions[ordinal] < 0:
+            raise KeyError(idx)
+        return self.table.positions[ordinal], self.table.positions[ordinal + 1]
+
+    @property  # type: ignore
+    def data(self):
+        # type: () -> Any
+        if not self.count and self._extra is None:
+            return None
+        res = {}  # type: Dict[Any, Any]
+        positions = self.table.positions
+        for idx in range(self.count):
+            ordinal = self.first + idx
+            if positions[4 * ordinal] < 0:
+                continue
+            if self.sequence:
+                res[idx] = list(positions[4 * ordinal : 4 * ordinal + 2])
+            else:
+                res[self.table.keys[ordinal]] = list(positions[4 * ordinal : 4 * ordinal + 4])
+        if self._extra is not None:
+            res.update(self._extra)
+        return res
+
+    @data.setter
+    def data(self, value):
+        # type: (Any) -> None
+        self.count = 0
+        self._index = None
+        self._extra = value
+
+    def add_kv_line_col(self, key, data):
+        # type: (Any, Any) -> None
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = data
+
+    add_idx_line_col = add_kv_line_col
+
+
 class Tag(object):
     """store tag information for roundtripping"""
 
@@ -255,6 +411,8 @@ class CommentedBase(object):
             after = after[:-1]  # strip final newline if there
         start_mark = CommentMark(indent)
         c = self.ca.items.setdefault(key, [None, [], None, None])
+        if before and c[1] is None:  # e.g. after an eol comment was added
+            c[1] = []
         if before == '\n':
             c[1].append(comment_token("", start_mark))
         elif before:
@@ -273,9 +431,21 @@ class CommentedBase(object):
         """format attribute
 
         set_flow_style()/set_block_style()"""
-        if not hasattr(self, Format.attrib):
-            setattr(self, Format.attrib, Format())
-        return getattr(self, Format.attrib)
+        fa = getattr(self, Format.attrib, None)
+        if fa is None or type(fa) is SharedFormat:
+            shared, fa = fa, Format()
+            if shared is not None:
+                fa._flow_style = shared._flow_style
+            setattr(self, Format.attrib, fa)
+        return fa
+
+    def _yaml_get_flow_style(self, default=None):
+        # type: (Optional[Any]) -> Any
+        """flow style as fa.flow_style(default), without setting a format attribute"""
+        fa = getattr(self, Format.attrib, None)
+        if fa is None:
+            return default
+        return fa.flow_style(default)
 
     def yaml_add_eol_comment(self, comment, key=NoComment, column=None):
         # type: (Any, Optional[Any], Optional[Any]) -> None
@@ -284,23 +454,100 @@ class CommentedBase(object):
         (but at the beginning of the line the space doesn't have to be before
         the #. The column index is for the # mark
         """
-        from .tokens import CommentToken
-        from .error import CommentMark
-
         if column is None:
             try:
                 column = self._yaml_get_column(key)
             except AttributeError:
                 column = 0
+        self._yaml_add_eol_comment_column(comment, key, column)
+
+    def yaml_add_eol_comments(self, comments, column=None):
+        # type: (Any, Optional[Any]) -> None
+        """
+        add the eol comments from comments, a mapping of key (index for a
+        sequence) to comment. They are added in the order of the keys in self,
+        so a comment without column gets the column of the one added before it
+        """
+        position = self._yaml_key_position
+        marks = {}  # type: Dict[Any, Any]  # shared by the comments in the same column
+        prev_pos = prev_col = None
+        for pos, _, key in sorted((position(k), i, k) for i, k in enumerate(comments)):
+            col = column
+            if col is None:
+                if prev_pos is not None and pos == prev_pos + 1 and pos < len(self):  # type: ignore  # NOQA
+                    # the entry before key has the comment just added
+                    col = prev_col
+                else:
+                    try:
+                        col = self._yaml_get_column(key)
+                    except AttributeError:
+                        col = 0
+            prev_col = self._yaml_add_eol_comment_column(comments[key], key, col, marks)
+            prev_pos = pos
+
+    def _yaml_add_eol_comment_column(self, comment, key, column, marks=None):
+        # type: (Any, Any, Any, Optional[Dict[Any, Any]]) -> Any
+        """returns the column of the added comment"""
         if comment[0] != '#':
             comment = '# ' + comment
         if column is None:
             if comment[0] == '#':
                 comment = ' ' + comment
                 column = 0
-        start_mark = CommentMark(column)
+        if marks is None:
+            start_mark = CommentMark(column)
+        else:
+            start_mark = marks.get(column)
+            if start_mark is None:
+                start_mark = marks[column] = CommentMark(column)
         ct = [CommentToken(comment, start_mark, None), None]
         self._yaml_add_eol_comment(ct, key=key)
+        return column
+
+    def yaml_add_path_comments(self, eol=None, before=None, column=None, indent=2):
+        # type: (Any, Any, Optional[Any], int) -> None
+        """
+        add comments to the collections nested in self, eol and before map a
+        path (a tuple of keys/indices relative to self) to the end-of-line
+        comment of that entry, resp. the comment lines before it. The empty
+        path in before sets the start comment of self.
+
+        Each collection is looked up once, for all the comments on its entries.
+        The comments before the entries of a collection are indented to the
+        collection's column when it was loaded, else indent per level of nesting
+        """
+        found = {(): self}  # type: Dict[Any, Any]
+
+        def collection(path):
+            # type: (Any) -> Any
+            try:
+                return found[path]
+            except KeyError:
+                pass
+            res = found[path] = collection(path[:-1])[path[-1]]
+            return res
+
+        def grouped(comments):
+            # type: (Any) -> Any
+            groups = {}  # type: Dict[Any, Any]
+            for path, comment in comments.items():
+                groups.setdefault(tuple(path[:-1]), {})[path[-1]] = comment
+            return groups
+
+        if eol:
+            for path, comments in grouped(eol).items():
+                collection(path).yaml_add_eol_comments(comments, column=column)
+        if before:
+            before = dict(before)
+            start = before.pop((), None)
+            if start is not None:
+                self.yaml_set_start_comment(start)
+            for path, comments in grouped(before).items():
+                coll = collection(path)
+                lc = getattr(coll, LineCol.attrib, None)
+                col = lc.col if lc is not None and lc.col is not None else indent * len(path)
+                for key, comment in comments.items():
+                    coll.yaml_set_comment_before_after_key(key, before=comment, indent=col)
 
     @property
     def lc(self):
@@ -358,7 +605,7 @@ class CommentedBase(object):
                   Tag.attrib, merge_attrib]:
             if hasattr(self, a):
                 if memo is not None:
-                    setattr(t, a, copy.deepcopy(getattr(self, a, memo)))
+                    setattr(t, a, copy.deepcopy(getattr(self, a), memo))
                 else:
                     setattr(t, a, getattr(self, a))
         # fmt: on
@@ -375,9 +622,14 @@ class CommentedBase(object):
         # type: (Any) -> Any
         raise NotImplementedError
 
+    def _yaml_key_position(self, key):
+        # type: (Any) -> int
+        # no known order, the comments are added in their own order
+        return 0
+
 
 class CommentedSeq(MutableSliceableSequence, list, CommentedBase):  # type: ignore
-    __slots__ = (Comment.attrib, '_lst')
+    __slots__ = (Comment.attrib, Format.attrib, LineCol.attrib, '_lst')
 
     def __init__(self, *args, **kw):
         # type: (Any, Any) -> None
@@ -454,17 +706,19 @@ class CommentedSeq(MutableSliceableSequence, list, CommentedBase):  # type: igno
         elif post in self.ca.items:
             sel_idx = post
         else:
-            # self.ca.items is not ordered
-            for row_idx, _k1 in enumerate(self):
-                if row_idx >= key:
+            # self.ca.items is not ordered, look for the nearest preceding index
+            for row_idx in range(min(key, len(self)) - 1, -1, -1):
+                if row_idx in self.ca.items:
+                    sel_idx = row_idx
                     break
-                if row_idx not in self.ca.items:
-                    continue
-                sel_idx = row_idx
         if sel_idx is not None:
             column = self._yaml_get_columnX(sel_idx)
         return column
 
+    def _yaml_key_position(self, key):
+        # type: (Any) -> int
+        return key  # type: ignore
+
     def _yaml_get_pre_comment(self):
         # type: () -> Any
         pre_comments = []  # type: List[Any]
@@ -480,7 +734,7 @@ class CommentedSeq(MutableSliceableSequence, list, CommentedBase):  # type: igno
         memo[id(self)] = res
         for k in self:
             res.append(copy.deepcopy(k, memo))
-            self.copy_attributes(res, memo=memo)
+        self.copy_attributes(res, memo=memo)
         return res
 
     def __add__(self, other):
@@ -631,12 +885,16 @@ class CommentedMapValuesView(CommentedMapView):
 
 
 class CommentedMap(ordereddict, CommentedBase):  # type: ignore
-    __slots__ = (Comment.attrib, '_ok', '_ref')
+    __slots__ = (
+        Comment.attrib, Format.attrib, LineCol.attrib, '_ok', '_ref', '_merged', '_kpos'
+    )
 
     def __init__(self, *args, **kw):
         # type: (Any, Any) -> None
         self._ok = set()  # type: MutableSet[Any]  #  own keys
         self._ref = []  # type: List[CommentedMap]
+        self._merged = None  # type: Optional[MergeIndex]
+        self._kpos = None  # type: Optional[KeyPositions]
         ordereddict.__init__(self, *args, **kw)
 
     def _yaml_add_comment(self, comment, key=NoComment, value=NoComment):
@@ -661,31 +919,12 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
 
     def _yaml_get_column(self, key):
         # type: (Any) -> Any
-        column = None
-        sel_idx = None
-        pre, post, last = None, None, None
-        for x in self:
-            if pre is not None and x != key:
-                post = x
-                break
-            if x == key:
-                pre = last
-            last = x
-        if pre in self.ca.items:
-            sel_idx = pre
-        elif post in self.ca.items:
-            sel_idx = post
-        else:
-            # self.ca.items is not ordered
-            for k1 in self:
-                if k1 >= key:
-                    break
-                if k1 not in self.ca.items:
-                    continue
-                sel_idx = k1
-        if sel_idx is not None:
-            column = self._yaml_get_columnX(sel_idx)
-        return column
+        # the column of the comment of the key before or after key, else of the
+        # last commented key before the first key that doesn't sort before key
+        sel_idx = self._key_positions().nearest(key, self.ca.items)
+        if sel_idx is None:
+            return None
+        return self._yaml_get_columnX(sel_idx)
 
     def _yaml_get_pre_comment(self):
         # type: () -> Any
@@ -696,8 +935,21 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
             self.ca.comment[1] = pre_comments
         return pre_comments
 
+    def _key_positions(self):
+        # type: () -> KeyPositions
+        """the positions of the keys, built on first use after the keys changed"""
+        # pop()/popitem()/clear() don't go through __delitem__, hence the length check
+        if self._kpos is None or len(self._kpos.keys) != len(self):
+            self._kpos = KeyPositions(ordereddict.__iter__(self))
+        return self._kpos
+
+    def _yaml_key_position(self, key):
+        # type: (Any) -> int
+        return self._key_positions().positions.get(key, len(self))
+
     def update(self, vals):
         # type: (Any) -> None
+        self._kpos = None
         try:
             ordereddict.update(self, vals)
         except TypeError:
@@ -717,9 +969,12 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
         attach comment if provided
         """
         ordereddict.insert(self, pos, key, value)
+        self._kpos = None
         self._ok.add(key)
         if comment is not None:
             self.yaml_add_eol_comment(comment, key=key)
+        for referer in self._ref:
+            referer.update_key_value(key, self)
 
     def mlget(self, key, default=None, list_ok=False):
         # type: (Any, Any, Any) -> Any
@@ -752,10 +1007,10 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
         try:
             return ordereddict.__getitem__(self, key)
         except KeyError:
-            for merged in getattr(self, merge_attrib, []):
-                if key in merged[1]:
-                    return merged[1][key]
-            raise
+            index = self._merge_index()
+            if index is None or key not in index.sources:
+                raise
+            return index.sources[key][key]
 
     def __setitem__(self, key, value):
         # type: (Any, Any) -> None
@@ -767,8 +1022,12 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
                 and isinstance(self[key], ScalarString)
             ):
                 value = type(self[key])(value)
+        else:
+            self._kpos = None
         ordereddict.__setitem__(self, key, value)
         self._ok.add(key)
+        for referer in self._ref:
+            referer.update_key_value(key, self)
 
     def _unmerged_contains(self, key):
         # type: (Any) -> Any
@@ -814,8 +1073,40 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
         # self._ok.discard(key)
         self._ok.discard(key)
         ordereddict.__delitem__(self, key)
+        self._kpos = None
         for referer in self._ref:
-            referer.update_key_value(key)
+            referer.update_key_value(key, self)
+
+    # pop(), popitem() and clear() of the (C) OrderedDict don't call __delitem__
+
+    def pop(self, key, *default):
+        # type: (Any, Any) -> Any
+        if not ordereddict.__contains__(self, key):
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self, last=True):
+        # type: (bool) -> Any
+        if not ordereddict.__len__(self):
+            raise KeyError('dictionary is empty')
+        key = next((ordereddict.__reversed__ if last else ordereddict.__iter__)(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        # type: () -> None
+        for key in list(ordereddict.__iter__(self)):
+            del self[key]
+
+    if hasattr(ordereddict, 'move_to_end'):
+
+        def move_to_end(self, key, last=True):
+            # type: (Any, bool) -> None
+            ordereddict.move_to_end(self, key, last)
+            self._kpos = None
 
     def __iter__(self):
         # type: () -> Any
@@ -934,16 +1225,45 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
                     continue
                 ordereddict.__setitem__(self, k, v)
         self.merge.extend(value)
-
-    def update_key_value(self, key):
-        # type: (Any) -> None
+        self._merged = self._kpos = None
+
+    def _merge_index(self):
+        # type: () -> Optional[MergeIndex]
+        """the index of the merged maps (built on first use), None without merges"""
+        if self._merged is None:
+            merge = getattr(self, merge_attrib, None)
+            if not merge:
+                return None
+            self._merged = MergeIndex(merge)
+        return self._merged
+
+    def update_key_value(self, key, source=None):
+        # type: (Any, Any) -> None
+        """
+        key changed in the merged map source (when not given, all merged maps are
+        checked), update the key's value if it isn't one of the map's own keys
+        """
+        index = self._merge_index()
+        if index is None:
+            return
+        if source is None:
+            self._merged = index = MergeIndex(self.merge)
+            provider = index.sources.get(key)
+        else:
+            provider = index.update(key, source, self.merge)
         if key in self._ok:
             return
-        for v in self.merge:
-            if key in v[1]:
-                ordereddict.__setitem__(self, key, v[1][key])
-                return
-        ordereddict.__delitem__(self, key)
+        if provider is not None:
+            if not ordereddict.__contains__(self, key):
+                self._kpos = None
+            ordereddict.__setitem__(self, key, provider[key])
+        elif ordereddict.__contains__(self, key):
+            ordereddict.__delitem__(self, key)
+            self._kpos = None
+        else:
+            return
+        for referer in self._ref:
+            referer.update_key_value(key, self)
 
     def __deepcopy__(self, memo):
         # type: (Any) -> Any
@@ -954,6 +1274,145 @@ class CommentedMap(ordereddict, CommentedBase):  # type: ignore
         self.copy_attributes(res, memo=memo)
         return res
 
+    def __reduce__(self):
+        # type: () -> Any
+        # OrderedDict.__reduce__ before Python 3.11 only keeps the __dict__, the
+        # attributes in __slots__ (.ca, .fa, .lc, ...) are added for copy/pickle
+        slots = {}
+        for cls in type(self).__mro__:
+            names = cls.__dict__.get('__slots__', ())
+            if isinstance(names, string_types):
+                names = (names,)
+            for name in names:
+                if name not in ('__dict__', '__weakref__') and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        state = (getattr(self, '__dict__', None) or None, slots)
+        return self.__class__, (), state, None, iter(self.items())
+
+
+class MergeIndex(object):
+    """
+    for a CommentedMap with merges: the merged map providing each key (the
+    first one in the merge list that has the key) and the position of each
+    merged map in the merge list, so that lookups and updates don't have to
+    go over the merge list
+    """
+
+    __slots__ = ('sources', 'ranks')
+
+    def __init__(self, merge):
+        # type: (Any) -> None
+        self.sources = {}  # type: Dict[Any, Any]
+        self.ranks = {}  # type: Dict[int, int]
+        for rank, (_, source) in enumerate(merge):
+            self.ranks.setdefault(id(source), rank)
+            for key in source:
+                self.sources.setdefault(key, source)
+
+    def __reduce__(self):
+        # type: () -> Any
+        # the ranks are by id() of the merged maps: rebuild after unpickling/copying
+        return no_index, ()
+
+    def update(self, key, source, merge):
+        # type: (Any, Any, Any) -> Any
+        """key was set in or deleted from source, returns the map now providing key"""
+        rank = self.ranks.get(id(source))
+        if rank is None or merge[rank][1] is not source:  # e.g. after unpickling
+            self.__init__(merge)  # type: ignore
+            return self.sources.get(key)
+        current = self.sources.get(key)
+        if key in source:
+            if current is None or rank < self.ranks[id(current)]:
+                self.sources[key] = current = source
+            return current
+        if current is not source:
+            return current
+        for _, other in merge[rank + 1 :]:
+            if key in other:
+                self.sources[key] = other
+                return other
+        del self.sources[key]
+        return None
+
+
+class KeyPositions(object):
+    """the keys of a CommentedMap in order, and the position of each key"""
+
+    __slots__ = ('keys', 'positions', '_maxima')
+
+    def __init__(self, keys):
+        # type: (Any) -> None
+        self.keys = list(keys)
+        self.positions = {}  # type: Dict[Any, int]
+        for pos, key in enumerate(self.keys):
+            self.positions[key] = pos
+        self._maxima = None  # type: Any
+
+    def __reduce__(self):
+        # type: () -> Any
+        return no_index, ()
+
+    def nearest(self, key, selected):
+        # type: (Any, Any) -> Any
+        """
+        the key before key if it is in selected, else the one after it (if
+        there is a key before). Else the last key in selected before the first
+        key that does not sort before key (None if there is none)
+        """
+        keys = self.keys
+        pre = post = None
+        pos = self.positions.get(key)
+        if pos:
+            pre = keys[pos - 1]
+            if pre is not None and pos + 1 < len(keys):
+                post = keys[pos + 1]
+        if pre in selected:
+            return pre
+        if post in selected:
+            return post
+        for idx in range(self.first_not_before(key) - 1, -1, -1):
+            if keys[idx] in selected:
+                return keys[idx]
+        return None
+
+    def first_not_before(self, key):
+        # type: (Any) -> int
+        """position of the first key >= key, the number of keys if there is none"""
+        if self._maxima is None:
+            # the largest key up to each position, for keys that are all strings
+            # or all integers, in which the position is found by bisection
+            self._maxima = False
+            if all(isinstance(k, string_types) for k in self.keys) or all(
+                isinstance(k, int) for k in self.keys
+            ):
+                self._maxima = []
+                for k in self.keys:
+                    if not self._maxima or k > self._maxima[-1]:
+                        self._maxima.append(k)
+                    else:
+                        self._maxima.append(self._maxima[-1])
+        if self._maxima and isinstance(key, string_types) == isinstance(
+            self._maxima[0], string_types
+        ):
+            try:
+                return bisect_left(self._maxima, key)
+            except TypeError:
+                pass
+        for idx, k in enumerate(self.keys):
+            try:
+                if k >= key:
+                    return idx
+            except TypeError:  # keys of types that cannot be compared
+                return idx
+        return len(self.keys)
+
+
+def no_index():
+    # type: () -> None
+    """unpickled/copied MergeIndex and KeyPositions are rebuilt on first use"""
+    return None
+
 
 # based on brownie mappings
 @classmethod  # type: ignore
@@ -1059,6 +1518,168 @@ class CommentedOrderedMap(CommentedMap):
     __slots__ = (Comment.attrib,)
 
 
+class LazyValue(object):
+    """placeholder for a mapping value or sequence item of a lazily loaded
+    document, constructed from its node when first accessed. The objects
+    dictionary is shared by all placeholders of one document, so aliases
+    resolve to the same data"""
+
+    __slots__ = ('node', 'constructor', 'objects')
+
+    def __init__(self, node, constructor, objects):
+        # type: (Any, Any, Dict[Any, Any]) -> None
+        self.node = node
+        self.constructor = constructor
+        self.objects = objects
+
+    def construct(self):
+        # type: () -> Any
+        return self.constructor.construct_lazy(self.node, self.objects)
+
+    def __repr__(self):
+        # type: () -> Any
+        return 'LazyValue({!r})'.format(self.node.tag)
+
+
+class LazyCommentedMap(CommentedMap):
+    """CommentedMap of which the values are constructed on first access"""
+
+    __slots__ = ()
+
+    def _lazy_getitem(self, key):
+        # type: (Any) -> Any
+        value = ordereddict.__getitem__(self, key)
+        if isinstance(value, LazyValue):
+            value = value.construct()
+            ordereddict.__setitem__(self, key, value)  # keeps the position of key
+        return value
+
+    def yaml_construct_all(self):
+        # type: () -> None
+        """construct all values not yet accessed (not recursively)"""
+        for x in ordereddict.__iter__(self):
+            self._lazy_getitem(x)
+
+    def __getitem__(self, key):
+        # type: (Any) -> Any
+        try:
+            return self._lazy_getitem(key)
+        except KeyError:
+            index = self._merge_index()
+            if index is None or key not in index.sources:
+                raise
+            return index.sources[key][key]
+
+    def __eq__(self, other):
+        # type: (Any) -> bool
+        return bool(dict(self._items()) == other)
+
+    def __ne__(self, other):
+        # type: (Any) -> bool
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        # type: () -> Any
+        self.yaml_construct_all()
+        return ordereddict.__repr__(self).replace('LazyCommentedMap', 'ordereddict')
+
+    def non_merged_items(self):
+        # type: () -> Any
+        for x in ordereddict.__iter__(self):
+            if x in self._ok:
+                yield x, self._lazy_getitem(x)
+
+    if PY2:
+
+        def _values(self):
+            # type: () -> Any
+            for x in ordereddict.__iter__(self):
+                yield self._lazy_getitem(x)
+
+    def _items(self):
+        # type: () -> Any
+        for x in ordereddict.__iter__(self):
+            yield x, self._lazy_getitem(x)
+
+
+class LazyCommentedSeq(CommentedSeq):
+    """CommentedSeq of which the items are constructed on first access"""
+
+    __slots__ = ()
+
+    def __getsingleitem__(self, idx):
+        # type: (Any) -> Any
+        value = list.__getitem__(self, idx)
+        if isinstance(value, LazyValue):
+            value = value.construct()
+            list.__setitem__(self, idx, value)
+        return value
+
+    def yaml_construct_all(self):
+        # type: () -> None
+        """construct all items not yet accessed (not recursively)"""
+        for idx in range(list.__len__(self)):
+            self.__getsingleitem__(idx)
+
+    def __eq__(self, other):
+        # type: (Any) -> bool
+        self.yaml_construct_all()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        # type: (Any) -> bool
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        # type: (Any) -> bool
+        self.yaml_construct_all()
+        return list.__lt__(self, other)
+
+    def __le__(self, other):
+        # type: (Any) -> bool
+        self.yaml_construct_all()
+        return list.__le__(self, other)
+
+    def __gt__(self, other):
+        # type: (Any) -> bool
+        self.yaml_construct_all()
+        return list.__gt__(self, other)
+
+    def __ge__(self, other):
+        # type: (Any) -> bool
+        self.yaml_construct_all()
+        return list.__ge__(self, other)
+
+    def __add__(self, other):
+        # type: (Any) -> Any
+        self.yaml_construct_all()
+        return list.__add__(self, other)
+
+    def __mul__(self, other):
+        # type: (Any) -> Any
+        self.yaml_construct_all()
+        return list.__mul__(self, other)
+
+    __rmul__ = __mul__
+
+    def sort(self, key=None, reverse=False):  # type: ignore
+        # type: (Any, bool) -> None
+        self.yaml_construct_all()
+        CommentedSeq.sort(self, key=key, reverse=reverse)
+
+    if not PY2:
+
+        def copy(self):
+            # type: () -> Any
+            self.yaml_construct_all()
+            return list.copy(self)
+
+    def __repr__(self):
+        # type: () -> Any
+        self.yaml_construct_all()
+        return list.__repr__(self)
+
+
 class CommentedSet(MutableSet, CommentedBase):  # type: ignore  # NOQA
     __slots__ = Comment.attrib, 'odict'
 
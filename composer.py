@@ -5,7 +5,7 @@ from __future__ import absolute_import, print_function
 import warnings
 
 from ruamel.yaml.error import MarkedYAMLError, ReusedAnchorWarning
-from ruamel.yaml.compat import utf8, nprint, nprintf  # NOQA
+from ruamel.yaml.compat import utf8, nprint, nprintf, text_type  # NOQA
 
 from ruamel.yaml.events import (
     StreamStartEvent,
@@ -36,6 +36,11 @@ class Composer(object):
         if self.loader is not None and getattr(self.loader, '_composer', None) is None:
             self.loader._composer = self
         self.anchors = {}  # type: Dict[Any, Any]
+        # the document being composed has aliases, without them no node is shared
+        # and the constructor doesn't have to keep track of the constructed nodes.
+        # Recorded on the root node, as documents can be composed before the
+        # previous one is constructed
+        self.has_aliases = True
 
     @property
     def parser(self):
@@ -92,10 +97,83 @@ class Composer(object):
 
         return document
 
+    def compose_path_nodes(self, path):
+        # type: (Any) -> Any
+        """
+        generate the nodes at path in every document, as soon as each of them is
+        composed. The documents themselves are not kept: collections on the
+        path are only composed as far as needed to find the selected nodes.
+        A path element selects the value for a key in a mapping (compared with
+        the string value of a scalar key) or an index in a sequence; None selects
+        every value of a mapping resp. every item of a sequence.
+        """
+        # Drop the STREAM-START event.
+        if self.parser.check_event(StreamStartEvent):
+            self.parser.get_event()
+        while not self.parser.check_event(StreamEndEvent):
+            # Drop the DOCUMENT-START event.
+            self.parser.get_event()
+            self.has_aliases = False
+            self.anchors = {}
+            for node in self.compose_path_node(None, None, list(path)):
+                node.has_aliases = self.has_aliases
+                yield node
+            # Drop the DOCUMENT-END event.
+            self.parser.get_event()
+            self.anchors = {}
+        # Drop the STREAM-END event.
+        self.parser.get_event()
+
+    def compose_path_node(self, parent, index, path):
+        # type: (Any, Any, Any) -> Any
+        if not path:
+            yield self.compose_node(parent, index)
+            return
+        if not self.parser.check_event(SequenceStartEvent, MappingStartEvent):
+            # a scalar or alias cannot contain the path
+            self.compose_node(parent, index)
+            return
+        # the collection node is not registered as anchor, as it doesn't get any
+        # items, an alias to it therefore results in an "undefined alias" error
+        self.resolver.descend_resolver(parent, index)
+        start_event = self.parser.get_event()
+        tag = start_event.tag
+        selector, rest = path[0], path[1:]
+        if isinstance(start_event, SequenceStartEvent):
+            if tag is None or tag == u'!':
+                tag = self.resolver.resolve(SequenceNode, None, start_event.implicit)
+            node = SequenceNode(tag, [], start_event.start_mark, None)  # type: Any
+            item_index = 0
+            while not self.parser.check_event(SequenceEndEvent):
+                if selector is None or selector == item_index:
+                    for item in self.compose_path_node(node, item_index, rest):
+                        yield item
+                else:
+                    self.compose_node(node, item_index)
+                item_index += 1
+        else:
+            if tag is None or tag == u'!':
+                tag = self.resolver.resolve(MappingNode, None, start_event.implicit)
+            node = MappingNode(tag, [], start_event.start_mark, None)
+            while not self.parser.check_event(MappingEndEvent):
+                item_key = self.compose_node(node, None)
+                if selector is None or (
+                    isinstance(item_key, ScalarNode) and item_key.value == text_type(selector)
+                ):
+                    for item in self.compose_path_node(node, item_key, rest):
+                        yield item
+                else:
+                    self.compose_node(node, item_key)
+        # Drop the SEQUENCE-END/MAPPING-END event.
+        self.parser.get_event()
+        self.resolver.ascend_resolver()
+
     def compose_document(self):
         # type: (Any) -> Any
         # Drop the DOCUMENT-START event.
         self.parser.get_event()
+        self.has_aliases = False
+        self.anchors = {}  # not cleared if composing the previous document failed
 
         # Compose the root node.
         node = self.compose_node(None, None)
@@ -104,40 +182,94 @@ class Composer(object):
         self.parser.get_event()
 
         self.anchors = {}
+        node.has_aliases = self.has_aliases
         return node
 
     def compose_node(self, parent, index):
         # type: (Any, Any) -> Any
-        if self.parser.check_event(AliasEvent):
-            event = self.parser.get_event()
-            alias = event.anchor
-            if alias not in self.anchors:
-                raise ComposerError(
-                    None, None, 'found undefined alias %r' % utf8(alias), event.start_mark
-                )
-            return self.anchors[alias]
-        event = self.parser.peek_event()
-        anchor = event.anchor
-        if anchor is not None:  # have an anchor
-            if anchor in self.anchors:
-                # raise ComposerError(
-                #     "found duplicate anchor %r; first occurrence"
-                #     % utf8(anchor), self.anchors[anchor].start_mark,
-                #     "second occurrence", event.start_mark)
-                ws = (
-                    '\nfound duplicate anchor {!r}\nfirst occurrence {}\nsecond occurrence '
-                    '{}'.format((anchor), self.anchors[anchor].start_mark, event.start_mark)
-                )
-                warnings.warn(ws, ReusedAnchorWarning)
-        self.resolver.descend_resolver(parent, index)
-        if self.parser.check_event(ScalarEvent):
-            node = self.compose_scalar_node(anchor)
-        elif self.parser.check_event(SequenceStartEvent):
-            node = self.compose_sequence_node(anchor)
-        elif self.parser.check_event(MappingStartEvent):
-            node = self.compose_mapping_node(anchor)
-        self.resolver.ascend_resolver()
-        return node
+        """
+        compose the node of the next event(s). The collections nested in the
+        node are kept on an explicit stack, instead of composing them through
+        recursive calls, so the depth of a document is not limited by the
+        recursion limit. A compose_sequence_node()/compose_mapping_node() of a
+        subclass is still called (recursively) for every sequence/mapping
+        """
+        parser = self.parser
+        resolver = self.resolver
+        cls = self.__class__
+        stack_sequences = cls.compose_sequence_node == Composer.compose_sequence_node
+        stack_mappings = cls.compose_mapping_node == Composer.compose_mapping_node
+        # per open collection [node, key], key is the next item's index for a
+        # sequence, the key node waiting for its value (or None) for a mapping
+        stack = []  # type: List[Any]
+        while True:
+            node = None
+            if parser.check_event(AliasEvent):
+                event = parser.get_event()
+                alias = event.anchor
+                if alias not in self.anchors:
+                    raise ComposerError(
+                        None, None, 'found undefined alias %r' % utf8(alias), event.start_mark
+                    )
+                node = self.anchors[alias]
+                self.has_aliases = True
+            else:
+                event = parser.peek_event()
+                anchor = event.anchor
+                if anchor is not None:  # have an anchor
+                    if anchor in self.anchors:
+                        # raise ComposerError(
+                        #     "found duplicate anchor %r; first occurrence"
+                        #     % utf8(anchor), self.anchors[anchor].start_mark,
+                        #     "second occurrence", event.start_mark)
+                        ws = (
+                            '\nfound duplicate anchor {!r}\nfirst occurrence {}\nsecond '
+                            'occurrence {}'.format(
+                                (anchor), self.anchors[anchor].start_mark, event.start_mark
+                            )
+                        )
+                        warnings.warn(ws, ReusedAnchorWarning)
+                resolver.descend_resolver(parent, index)
+                if isinstance(event, ScalarEvent):
+                    node = self.compose_scalar_node(anchor)
+                    resolver.ascend_resolver()
+                elif isinstance(event, SequenceStartEvent):
+                    if stack_sequences:
+                        stack.append([self.start_sequence_node(anchor), 0])
+                    else:
+                        node = self.compose_sequence_node(anchor)
+                        resolver.ascend_resolver()
+                elif stack_mappings:
+                    stack.append([self.start_mapping_node(anchor), None])
+                else:
+                    node = self.compose_mapping_node(anchor)
+                    resolver.ascend_resolver()
+            while True:
+                if node is not None:
+                    # add the composed node to the innermost open collection
+                    if not stack:
+                        return node
+                    top = stack[-1]
+                    if isinstance(top[0], SequenceNode):
+                        top[0].value.append(node)
+                        top[1] += 1
+                    elif top[1] is None:
+                        top[1] = node
+                    else:
+                        top[0].value.append((top[1], node))
+                        top[1] = None
+                top = stack[-1]
+                if isinstance(top[0], SequenceNode):
+                    if not parser.check_event(SequenceEndEvent):
+                        break
+                    node = self.end_sequence_node(top[0])
+                else:
+                    if top[1] is not None or not parser.check_event(MappingEndEvent):
+                        break
+                    node = self.end_mapping_node(top[0])
+                resolver.ascend_resolver()
+                stack.pop()
+            parent, index = top
 
     def compose_scalar_node(self, anchor):
         # type: (Any) -> Any
@@ -159,6 +291,15 @@ class Composer(object):
         return node
 
     def compose_sequence_node(self, anchor):
+        # type: (Any) -> Any
+        node = self.start_sequence_node(anchor)
+        index = 0
+        while not self.parser.check_event(SequenceEndEvent):
+            node.value.append(self.compose_node(node, index))
+            index += 1
+        return self.end_sequence_node(node)
+
+    def start_sequence_node(self, anchor):
         # type: (Any) -> Any
         start_event = self.parser.get_event()
         tag = start_event.tag
@@ -175,10 +316,10 @@ class Composer(object):
         )
         if anchor is not None:
             self.anchors[anchor] = node
-        index = 0
-        while not self.parser.check_event(SequenceEndEvent):
-            node.value.append(self.compose_node(node, index))
-            index += 1
+        return node
+
+    def end_sequence_node(self, node):
+        # type: (Any) -> Any
         end_event = self.parser.get_event()
         if node.flow_style is True and end_event.comment is not None:
             if node.comment is not None:
@@ -192,6 +333,21 @@ class Composer(object):
         return node
 
     def compose_mapping_node(self, anchor):
+        # type: (Any) -> Any
+        node = self.start_mapping_node(anchor)
+        while not self.parser.check_event(MappingEndEvent):
+            # key_event = self.parser.peek_event()
+            item_key = self.compose_node(node, None)
+            # if item_key in node.value:
+            #     raise ComposerError("while composing a mapping",
+            #             start_event.start_mark,
+            #             "found duplicate key", key_event.start_mark)
+            item_value = self.compose_node(node, item_key)
+            # node.value[item_key] = item_value
+            node.value.append((item_key, item_value))
+        return self.end_mapping_node(node)
+
+    def start_mapping_node(self, anchor):
         # type: (Any) -> Any
         start_event = self.parser.get_event()
         tag = start_event.tag
@@ -208,16 +364,10 @@ class Composer(object):
         )
         if anchor is not None:
             self.anchors[anchor] = node
-        while not self.parser.check_event(MappingEndEvent):
-            # key_event = self.parser.peek_event()
-            item_key = self.compose_node(node, None)
-            # if item_key in node.value:
-            #     raise ComposerError("while composing a mapping",
-            #             start_event.start_mark,
-            #             "found duplicate key", key_event.start_mark)
-            item_value = self.compose_node(node, item_key)
-            # node.value[item_key] = item_value
-            node.value.append((item_key, item_value))
+        return node
+
+    def end_mapping_node(self, node):
+        # type: (Any) -> Any
         end_event = self.parser.get_event()
         if node.flow_style is True and end_event.comment is not None:
             node.comment = end_event.comment
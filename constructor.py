@@ -14,7 +14,7 @@ import warnings
 from ruamel.yaml.error import (MarkedYAMLError, MarkedYAMLFutureWarning,
                                MantissaNoDotYAML1_1Warning)
 from ruamel.yaml.nodes import *                               # NOQA
-from ruamel.yaml.nodes import (SequenceNode, MappingNode, ScalarNode)
+from ruamel.yaml.nodes import (SequenceNode, MappingNode, ScalarNode, CollectionNode)
 from ruamel.yaml.compat import (utf8, builtins_module, to_str, PY2, PY3,  # NOQA
                                 text_type, nprint, nprintf, version_tnf)
 from ruamel.yaml.compat import ordereddict, Hashable, MutableSequence  # type: ignore
@@ -23,7 +23,9 @@ from ruamel.yaml.compat import MutableMapping  # type: ignore
 from ruamel.yaml.comments import *                               # NOQA
 from ruamel.yaml.comments import (CommentedMap, CommentedOrderedMap, CommentedSet,
                                   CommentedKeySeq, CommentedSeq, TaggedScalar,
-                                  CommentedKeyMap)
+                                  CommentedKeyMap, LazyCommentedMap, LazyCommentedSeq,
+                                  LazyValue, Format, SharedFormat, LineCol, LineColTable,
+                                  TableLineCol)
 from ruamel.yaml.scalarstring import (SingleQuotedScalarString, DoubleQuotedScalarString,
                                       LiteralScalarString, FoldedScalarString,
                                       PlainScalarString, ScalarString,)
@@ -116,6 +118,12 @@ class BaseConstructor(object):
     def construct_document(self, node):
         # type: (Any) -> Any
         data = self.construct_object(node)
+        self.end_document()
+        return data
+
+    def end_document(self):
+        # type: () -> None
+        """complete the objects of which the construction was deferred"""
         while bool(self.state_generators):
             state_generators = self.state_generators
             self.state_generators = []
@@ -125,7 +133,6 @@ class BaseConstructor(object):
         self.constructed_objects = {}
         self.recursive_objects = {}
         self.deep_construct = False
-        return data
 
     def construct_object(self, node, deep=False):
         # type: (Any, bool) -> Any
@@ -227,31 +234,7 @@ class BaseConstructor(object):
         for values, check in todo:
             mapping = self.yaml_base_dict_type()  # type: Dict[Any, Any]
             for key_node, value_node in values:
-                # keys can be list -> deep
-                key = self.construct_object(key_node, deep=True)
-                # lists are not hashable, but tuples are
-                if not isinstance(key, Hashable):
-                    if isinstance(key, list):
-                        key = tuple(key)
-                if PY2:
-                    try:
-                        hash(key)
-                    except TypeError as exc:
-                        raise ConstructorError(
-                            'while constructing a mapping',
-                            node.start_mark,
-                            'found unacceptable key (%s)' % exc,
-                            key_node.start_mark,
-                        )
-                else:
-                    if not isinstance(key, Hashable):
-                        raise ConstructorError(
-                            'while constructing a mapping',
-                            node.start_mark,
-                            'found unhashable key',
-                            key_node.start_mark,
-                        )
-
+                key = self.construct_mapping_key(node, key_node)
                 value = self.construct_object(value_node, deep=deep)
                 if check:
                     if self.check_mapping_key(node, key_node, mapping, key, value):
@@ -261,6 +244,34 @@ class BaseConstructor(object):
             total_mapping.update(mapping)
         return total_mapping
 
+    def construct_mapping_key(self, node, key_node):
+        # type: (Any, Any) -> Any
+        # keys can be list -> deep
+        key = self.construct_object(key_node, deep=True)
+        # lists are not hashable, but tuples are
+        if not isinstance(key, Hashable):
+            if isinstance(key, list):
+                key = tuple(key)
+        if PY2:
+            try:
+                hash(key)
+            except TypeError as exc:
+                raise ConstructorError(
+                    'while constructing a mapping',
+                    node.start_mark,
+                    'found unacceptable key (%s)' % exc,
+                    key_node.start_mark,
+                )
+        else:
+            if not isinstance(key, Hashable):
+                raise ConstructorError(
+                    'while constructing a mapping',
+                    node.start_mark,
+                    'found unhashable key',
+                    key_node.start_mark,
+                )
+        return key
+
     def check_mapping_key(self, node, key_node, mapping, key, value):
         # type: (Any, Any, Any, Any, Any) -> bool
         """return True if key is unique"""
@@ -351,6 +362,108 @@ class BaseConstructor(object):
 
 
 class SafeConstructor(BaseConstructor):
+    # construct documents without aliases with construct_alias_free()
+    alias_free_construct = True
+
+    def construct_document(self, node):
+        # type: (Any) -> Any
+        if (
+            self.alias_free_construct
+            and not getattr(node, 'has_aliases', True)
+            and self.plain_collections()
+        ):
+            data = self.construct_alias_free(node)
+            self.end_document()
+            return data
+        return BaseConstructor.construct_document(self, node)
+
+    def plain_collections(self):
+        # type: () -> bool
+        """
+        sequences and mappings are constructed with the methods of SafeConstructor
+        (which construct_alias_free() does without calling them)
+        """
+        cls = self.__class__
+        return bool(
+            self.yaml_constructors.get(u'tag:yaml.org,2002:seq')
+            == SafeConstructor.construct_yaml_seq
+            and self.yaml_constructors.get(u'tag:yaml.org,2002:map')
+            == SafeConstructor.construct_yaml_map
+            and cls.construct_object == BaseConstructor.construct_object
+            and cls.construct_sequence == BaseConstructor.construct_sequence
+            and cls.construct_mapping == SafeConstructor.construct_mapping
+        )
+
+    def construct_alias_free(self, node):
+        # type: (Any) -> Any
+        """
+        construct a document without aliases, in which no node can be reached
+        twice. The sequences and mappings with the default tags are built
+        bottom up with an explicit stack, without generators and without
+        recording the constructed nodes. Other nodes are constructed as usual,
+        but deep, as nothing can refer back to them
+        """
+        seq_tag = u'tag:yaml.org,2002:seq'
+        map_tag = u'tag:yaml.org,2002:map'
+        construct_scalar = self.construct_non_recursive_object
+        self.deep_construct = True
+        # per sequence/mapping being constructed: [node, data, position of the
+        # next item, (key node, key) waiting for its value or None for a
+        # sequence, whether to check for duplicate keys]
+        stack = []  # type: List[Any]
+        while True:
+            if isinstance(node, ScalarNode):
+                value = construct_scalar(node)
+                done = True
+            elif isinstance(node, SequenceNode) and node.tag == seq_tag:
+                stack.append([node, self.yaml_base_list_type(), 0, None, False])
+                done = False
+            elif isinstance(node, MappingNode) and node.tag == map_tag:
+                self.flatten_mapping(node)
+                # with merge keys later keys override without warning
+                check = getattr(node, 'merge', None) is None
+                stack.append([node, self.yaml_base_dict_type(), 0, None, check])
+                done = False
+            else:
+                value = self.construct_object(node, deep=True)
+                done = True
+            while True:
+                if done:
+                    if not stack:
+                        return value
+                    top = stack[-1]
+                    if top[3] is None:
+                        top[1].append(value)
+                    else:
+                        key_node, key = top[3]
+                        if not top[4] or self.check_mapping_key(
+                            top[0], key_node, top[1], key, value
+                        ):
+                            top[1][key] = value
+                    done = False
+                top = stack[-1]
+                parent, pos = top[0], top[2]
+                if pos < len(parent.value):
+                    top[2] = pos + 1
+                    if top[3] is None and isinstance(parent, SequenceNode):
+                        node = parent.value[pos]
+                    else:
+                        key_node, node = parent.value[pos]
+                        key = None
+                        if isinstance(key_node, ScalarNode):
+                            key = construct_scalar(key_node)
+                            try:
+                                hash(key)
+                            except TypeError:
+                                key = None
+                        if key is None:  # let construct_mapping_key() deal with it
+                            key = self.construct_mapping_key(parent, key_node)
+                        top[3] = (key_node, key)
+                    break
+                stack.pop()
+                value = top[1]
+                done = True
+
     def construct_scalar(self, node):
         # type: (Any) -> Any
         if isinstance(node, MappingNode):
@@ -1076,6 +1189,84 @@ class RoundTripConstructor(SafeConstructor):
     as well as on the items
     """
 
+    def __init__(self, preserve_quotes=None, loader=None):
+        # type: (Optional[bool], Any) -> None
+        SafeConstructor.__init__(self, preserve_quotes=preserve_quotes, loader=loader)
+        # construct mapping values and sequence items that are collections on access
+        self.lazy = False
+        # share the Format of the collections with the same flow style, and keep
+        # the line/col of their entries in a LineColTable per document
+        self.packed = False
+        self.shared_formats = {True: SharedFormat(True), False: SharedFormat(False)}
+        self.line_col_table = None  # type: Any
+
+    def construct_document(self, node):
+        # type: (Any) -> Any
+        data = SafeConstructor.construct_document(self, node)
+        self.line_col_table = None
+        return data
+
+    def set_line_col(self, data, node, sequence=False):
+        # type: (Any, Any, bool) -> None
+        if not self.packed:
+            data._yaml_set_line_col(node.start_mark.line, node.start_mark.column)
+            return
+        if self.line_col_table is None:
+            self.line_col_table = LineColTable()
+        lc = TableLineCol(
+            self.line_col_table, node.start_mark.line, node.start_mark.column, sequence
+        )
+        setattr(data, LineCol.attrib, lc)
+
+    def table_line_col(self, data, count):
+        # type: (Any, int) -> Any
+        """the TableLineCol of data with count entries reserved, None if data has a LineCol"""
+        lc = getattr(data, LineCol.attrib, None)
+        if type(lc) is not TableLineCol:
+            return None
+        lc.reserve(count)
+        return lc
+
+    def construct_lazy(self, node, objects):
+        # type: (Any, Dict[Any, Any]) -> Any
+        """construct the data for a node whose construction was deferred, objects
+        are the already constructed objects of the document the node belongs to"""
+        if node in objects:
+            return objects[node]
+        saved = (
+            self.constructed_objects,
+            self.recursive_objects,
+            self.state_generators,
+            self.deep_construct,
+        )
+        self.constructed_objects = objects
+        self.recursive_objects = {}
+        self.state_generators = []
+        self.deep_construct = False
+        try:
+            # deep, so that merge sources are complete, values that are
+            # collections are deferred anyway
+            return self.construct_object(node, deep=True)
+        finally:
+            (
+                self.constructed_objects,
+                self.recursive_objects,
+                self.state_generators,
+                self.deep_construct,
+            ) = saved
+
+    def construct_item(self, node, container, deep=False):
+        # type: (Any, Any, bool) -> Any
+        """construct a mapping value or sequence item, for lazy containers
+        collections not yet constructed are deferred"""
+        if (
+            isinstance(container, (LazyCommentedMap, LazyCommentedSeq))
+            and isinstance(node, CollectionNode)
+            and node not in self.constructed_objects
+        ):
+            return LazyValue(node, self, self.constructed_objects)
+        return self.construct_object(node, deep=deep)
+
     def construct_scalar(self, node):
         # type: (Any) -> Any
         if not isinstance(node, ScalarNode):
@@ -1310,13 +1501,18 @@ class RoundTripConstructor(SafeConstructor):
 
             if not templated_id(node.anchor):
                 seqtyp.yaml_set_anchor(node.anchor)
+        lc = self.table_line_col(seqtyp, len(node.value))
         for idx, child in enumerate(node.value):
-            ret_val.append(self.construct_object(child, deep=deep))
+            ret_val.append(self.construct_item(child, seqtyp, deep=deep))
             if child.comment:
                 seqtyp._yaml_add_comment(child.comment, key=idx)
-            seqtyp._yaml_set_idx_line_col(
-                idx, [child.start_mark.line, child.start_mark.column]
-            )
+            if lc is None:
+                seqtyp._yaml_set_idx_line_col(
+                    idx, [child.start_mark.line, child.start_mark.column]
+                )
+            else:
+                line, col = child.start_mark.line, child.start_mark.column
+                lc.set_entry(idx, None, line, col, line, col)
         return ret_val
 
     def flatten_mapping(self, node):
@@ -1333,10 +1529,12 @@ class RoundTripConstructor(SafeConstructor):
             # merge marker, then they won't have been constructed
             # yet. But if they were already constructed, we need to use
             # the existing object.
+            # When loading lazily the merge source might not have been
+            # constructed yet, even if it is defined before the merge.
             if value_node in self.constructed_objects:
                 value = self.constructed_objects[value_node]
             else:
-                value = self.construct_object(value_node, deep=False)
+                value = self.construct_object(value_node, deep=self.lazy)
             return value
 
         # merge = []
@@ -1428,7 +1626,8 @@ class RoundTripConstructor(SafeConstructor):
             if not templated_id(node.anchor):
                 maptyp.yaml_set_anchor(node.anchor)
         last_key, last_value = None, self._sentinel
-        for key_node, value_node in node.value:
+        lc = self.table_line_col(maptyp, len(node.value))
+        for idx, (key_node, value_node) in enumerate(node.value):
             # keys can be list -> deep
             key = self.construct_object(key_node, deep=True)
             # lists are not hashable, but tuples are
@@ -1465,7 +1664,7 @@ class RoundTripConstructor(SafeConstructor):
                         'found unhashable key',
                         key_node.start_mark,
                     )
-            value = self.construct_object(value_node, deep=deep)
+            value = self.construct_item(value_node, maptyp, deep=deep)
             if self.check_mapping_key(node, key_node, maptyp, key, value):
 
                 if key_node.comment and len(key_node.comment) > 4 and key_node.comment[4]:
@@ -1480,15 +1679,25 @@ class RoundTripConstructor(SafeConstructor):
                     maptyp._yaml_add_comment(key_node.comment, key=key)
                 if value_node.comment:
                     maptyp._yaml_add_comment(value_node.comment, value=key)
-                maptyp._yaml_set_kv_line_col(
-                    key,
-                    [
+                if lc is None:
+                    maptyp._yaml_set_kv_line_col(
+                        key,
+                        [
+                            key_node.start_mark.line,
+                            key_node.start_mark.column,
+                            value_node.start_mark.line,
+                            value_node.start_mark.column,
+                        ],
+                    )
+                else:
+                    lc.set_entry(
+                        idx,
+                        key,
                         key_node.start_mark.line,
                         key_node.start_mark.column,
                         value_node.start_mark.line,
                         value_node.start_mark.column,
-                    ],
-                )
+                    )
                 maptyp[key] = value
                 last_key, last_value = key, value  # could use indexing
         # do this last, or <<: before a key will prevent insertion in instances
@@ -1547,8 +1756,8 @@ class RoundTripConstructor(SafeConstructor):
 
     def construct_yaml_seq(self, node):
         # type: (Any) -> Any
-        data = CommentedSeq()
-        data._yaml_set_line_col(node.start_mark.line, node.start_mark.column)
+        data = LazyCommentedSeq() if self.lazy else CommentedSeq()
+        self.set_line_col(data, node, sequence=True)
         if node.comment:
             data._yaml_add_comment(node.comment)
         yield data
@@ -1557,8 +1766,8 @@ class RoundTripConstructor(SafeConstructor):
 
     def construct_yaml_map(self, node):
         # type: (Any) -> Any
-        data = CommentedMap()
-        data._yaml_set_line_col(node.start_mark.line, node.start_mark.column)
+        data = LazyCommentedMap() if self.lazy else CommentedMap()
+        self.set_line_col(data, node)
         yield data
         self.construct_mapping(node, data, deep=True)
         self.set_collection_style(data, node)
@@ -1567,7 +1776,9 @@ class RoundTripConstructor(SafeConstructor):
         # type: (Any, Any) -> None
         if len(data) == 0:
             return
-        if node.flow_style is True:
+        if self.packed and node.flow_style is not None:
+            setattr(data, Format.attrib, self.shared_formats[node.flow_style])
+        elif node.flow_style is True:
             data.fa.set_flow_style()
         elif node.flow_style is False:
             data.fa.set_block_style()
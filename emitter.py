@@ -11,6 +11,8 @@ from __future__ import print_function
 # mapping ::= MAPPING-START (node node)* MAPPING-END
 
 import sys
+from collections import deque
+from itertools import islice
 from ruamel.yaml.error import YAMLError, YAMLStreamError
 from ruamel.yaml.events import *  # NOQA
 
@@ -99,6 +101,8 @@ class Emitter(object):
     # fmt: on
 
     MAX_SIMPLE_KEY_LENGTH = 128
+    # number of characters collected before they are written to the stream
+    output_chunk_size = 16384
 
     def __init__(
         self,
@@ -118,6 +122,9 @@ class Emitter(object):
         self.dumper = dumper
         if self.dumper is not None and getattr(self.dumper, '_emitter', None) is None:
             self.dumper._emitter = self
+        # the text written, not yet passed on to the stream
+        self.output_buffer = []  # type: List[Any]
+        self.output_size = 0
         self.stream = stream
 
         # Encoding can be overriden by STREAM-START.
@@ -130,7 +137,7 @@ class Emitter(object):
         self.state = self.expect_stream_start  # type: Any
 
         # Current event and the event queue.
-        self.events = []  # type: List[Any]
+        self.events = deque()  # type: Any
         self.event = None  # type: Any
 
         # The current indentation level and the stack of previous indents.
@@ -221,6 +228,8 @@ class Emitter(object):
             return
         if not hasattr(val, 'write'):
             raise YAMLStreamError('stream argument needs to have a write() method')
+        if self.output_buffer:
+            self.flush_output()
         self._stream = val
 
     @property
@@ -250,7 +259,7 @@ class Emitter(object):
             nprint(event)
         self.events.append(event)
         while not self.need_more_events():
-            self.event = self.events.pop(0)
+            self.event = self.events.popleft()
             self.state()
             self.event = None
 
@@ -273,7 +282,7 @@ class Emitter(object):
     def need_events(self, count):
         # type: (int) -> bool
         level = 0
-        for event in self.events[1:]:
+        for event in islice(self.events, 1, None):
             if isinstance(event, (DocumentStartEvent, CollectionStartEvent)):
                 level += 1
             elif isinstance(event, (DocumentEndEvent, CollectionEndEvent)):
@@ -688,7 +697,7 @@ class Emitter(object):
                 self.states.append(self.expect_block_mapping_simple_value)
                 self.expect_node(mapping=True, simple_key=True)
                 if isinstance(self.event, AliasEvent):
-                    self.stream.write(u' ')
+                    self.write_text(u' ')
             else:
                 self.write_indicator(u'?', True, indention=True)
                 self.states.append(self.expect_block_mapping_value)
@@ -1177,8 +1186,31 @@ class Emitter(object):
 
     # Writers.
 
+    def write_text(self, data):
+        # type: (Any) -> None
+        """
+        collect data for the stream, it is passed on (encoded) when output_chunk_size
+        characters are collected and at the end of every document
+        """
+        self.output_buffer.append(data)
+        self.output_size += len(data)
+        if self.output_size >= self.output_chunk_size:
+            self.flush_output()
+
+    def flush_output(self):
+        # type: () -> None
+        if not self.output_buffer:
+            return
+        data = u''.join(self.output_buffer)
+        self.output_buffer = []
+        self.output_size = 0
+        if self.encoding:
+            data = data.encode(self.encoding)
+        self.stream.write(data)
+
     def flush_stream(self):
         # type: () -> None
+        self.flush_output()
         if hasattr(self.stream, 'flush'):
             self.stream.flush()
 
@@ -1186,7 +1218,7 @@ class Emitter(object):
         # type: () -> None
         # Write BOM if needed.
         if self.encoding and self.encoding.startswith('utf-16'):
-            self.stream.write(u'\uFEFF'.encode(self.encoding))
+            self.write_text(u'\uFEFF')
 
     def write_stream_end(self):
         # type: () -> None
@@ -1202,9 +1234,7 @@ class Emitter(object):
         self.indention = self.indention and indention
         self.column += len(data)
         self.open_ended = False
-        if bool(self.encoding):
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
 
     def write_indent(self):
         # type: () -> None
@@ -1222,9 +1252,7 @@ class Emitter(object):
             self.whitespace = True
             data = u' ' * (indent - self.column)
             self.column = indent
-            if self.encoding:
-                data = data.encode(self.encoding)
-            self.stream.write(data)
+            self.write_text(data)
 
     def write_line_break(self, data=None):
         # type: (Any) -> None
@@ -1234,24 +1262,18 @@ class Emitter(object):
         self.indention = True
         self.line += 1
         self.column = 0
-        if bool(self.encoding):
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
 
     def write_version_directive(self, version_text):
         # type: (Any) -> None
         data = u'%%YAML %s' % version_text
-        if self.encoding:
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
         self.write_line_break()
 
     def write_tag_directive(self, handle_text, prefix_text):
         # type: (Any, Any) -> None
         data = u'%%TAG %s %s' % (handle_text, prefix_text)
-        if self.encoding:
-            data = data.encode(self.encoding)
-        self.stream.write(data)
+        self.write_text(data)
         self.write_line_break()
 
     # Scalar streams.
@@ -1284,9 +1306,7 @@ class Emitter(object):
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             elif breaks:
                 if ch is None or ch not in u'\n\x85\u2028\u2029':
@@ -1304,16 +1324,12 @@ class Emitter(object):
                     if start < end:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                         start = end
             if ch == u"'":
                 data = u"''"
                 self.column += 2
-                if bool(self.encoding):
-                    data = data.encode(self.encoding)
-                self.stream.write(data)
+                self.write_text(data)
                 start = end + 1
             if ch is not None:
                 spaces = ch == u' '
@@ -1366,9 +1382,7 @@ class Emitter(object):
                 if start < end:
                     data = text[start:end]
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     start = end
                 if ch is not None:
                     if ch in self.ESCAPE_REPLACEMENTS:
@@ -1380,9 +1394,7 @@ class Emitter(object):
                     else:
                         data = u'\\U%08X' % ord(ch)
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     start = end + 1
             if (
                 0 < end < len(text) - 1
@@ -1394,18 +1406,14 @@ class Emitter(object):
                 if start < end:
                     start = end
                 self.column += len(data)
-                if bool(self.encoding):
-                    data = data.encode(self.encoding)
-                self.stream.write(data)
+                self.write_text(data)
                 self.write_indent()
                 self.whitespace = False
                 self.indention = False
                 if text[start] == u' ':
                     data = u'\\'
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
             end += 1
         self.write_indicator(u'"', False)
 
@@ -1482,17 +1490,13 @@ class Emitter(object):
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if bool(self.encoding):
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             else:
                 if ch is None or ch in u' \n\x85\u2028\u2029\a':
                     data = text[start:end]
                     self.column += len(data)
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     if ch == u'\a':
                         if end < (len(text) - 1) and not text[end + 2].isspace():
                             self.write_line_break()
@@ -1515,7 +1519,7 @@ class Emitter(object):
         try:
             comment = comment[1][0]
             if comment:
-                self.stream.write(comment)
+                self.write_text(comment)
         except (TypeError, IndexError):
             pass
         if _indicator == u'+':
@@ -1537,16 +1541,14 @@ class Emitter(object):
                     if ch is not None:
                         if self.root_context:
                             idnx = self.indent if self.indent is not None else 0
-                            self.stream.write(u' ' * (_indent + idnx))
+                            self.write_text(u' ' * (_indent + idnx))
                         else:
                             self.write_indent()
                     start = end
             else:
                 if ch is None or ch in u'\n\x85\u2028\u2029':
                     data = text[start:end]
-                    if bool(self.encoding):
-                        data = data.encode(self.encoding)
-                    self.stream.write(data)
+                    self.write_text(data)
                     if ch is None:
                         self.write_line_break()
                     start = end
@@ -1568,11 +1570,16 @@ class Emitter(object):
         if not self.whitespace:
             data = u' '
             self.column += len(data)
-            if self.encoding:
-                data = data.encode(self.encoding)
-            self.stream.write(data)
+            self.write_text(data)
         self.whitespace = False
         self.indention = False
+        if (not split or self.column + len(text) <= self.best_width) and not (
+            u'\n' in text or u'\x85' in text or u'\u2028' in text or u'\u2029' in text
+        ):
+            # no line breaks and no folding possible, write in one go
+            self.column += len(text)
+            self.write_text(text)
+            return
         spaces = False
         breaks = False
         start = end = 0
@@ -1589,9 +1596,7 @@ class Emitter(object):
                     else:
                         data = text[start:end]
                         self.column += len(data)
-                        if self.encoding:
-                            data = data.encode(self.encoding)
-                        self.stream.write(data)
+                        self.write_text(data)
                     start = end
             elif breaks:
                 if ch not in u'\n\x85\u2028\u2029':  # type: ignore
@@ -1610,13 +1615,7 @@ class Emitter(object):
                 if ch is None or ch in u' \n\x85\u2028\u2029':
                     data = text[start:end]
                     self.column += len(data)
-                    if self.encoding:
-                        data = data.encode(self.encoding)
-                    try:
-                        self.stream.write(data)
-                    except:  # NOQA
-                        sys.stdout.write(repr(data) + '\n')
-                        raise
+                    self.write_text(data)
                     start = end
             if ch is not None:
                 spaces = ch == u' '
@@ -1648,12 +1647,9 @@ class Emitter(object):
             if self.column and value.strip() and nr_spaces < 1 and value[0] != '\n':
                 nr_spaces = 1
             value = ' ' * nr_spaces + value
-            try:
-                if bool(self.encoding):
-                    value = value.encode(self.encoding)
-            except UnicodeDecodeError:
-                pass
-            self.stream.write(value)
+            if PY2 and not isinstance(value, text_type):
+                value = value.decode('utf-8')
+            self.write_text(value)
         except TypeError:
             raise
         if not pre:
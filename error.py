@@ -14,6 +14,7 @@ if False:  # MYPY
 __all__ = [
     'FileMark',
     'StringMark',
+    'CompactMark',
     'CommentMark',
     'YAMLError',
     'MarkedYAMLError',
@@ -107,6 +108,78 @@ class StringMark(StreamMark):
         return where
 
 
+class MarkSource(object):
+    """
+    the buffer of a Reader, shared by the CompactMarks it creates. start is the
+    index of the first character of the buffer in the stream. The Reader sets
+    buffer to None when it is reset, after which the marks no longer keep the
+    input alive
+    """
+
+    __slots__ = 'buffer', 'start'
+
+    def __init__(self, buffer, start):
+        # type: (Any, int) -> None
+        self.buffer = buffer
+        self.start = start
+
+
+class CompactMark(StreamMark):
+    """
+    mark with the position only, the snippet for an error message is taken from
+    the shared source while the Reader still holds the input (see detach())
+    """
+
+    __slots__ = ('source',)
+
+    def __init__(self, name, index, line, column, source):
+        # type: (Any, int, int, int, Any) -> None
+        self.name = name
+        self.index = index
+        self.line = line
+        self.column = column
+        self.source = source
+
+    def detach(self, width=80):
+        # type: (int) -> Any
+        """
+        StringMark with a copy of the width characters around the position, enough
+        for get_snippet(), or a FileMark if the input is no longer available
+        """
+        buffer = self.source.buffer
+        pointer = self.index - self.source.start
+        if buffer is None or not 0 <= pointer < len(buffer):
+            return FileMark(self.name, self.index, self.line, self.column)
+        start = max(pointer - width, 0)
+        return StringMark(
+            self.name,
+            self.index,
+            self.line,
+            self.column,
+            buffer[start : pointer + width],
+            pointer - start,
+        )
+
+    def get_snippet(self, indent=4, max_length=75):
+        # type: (int, int) -> Any
+        mark = self.detach(max_length + 5)
+        if isinstance(mark, StringMark):
+            return mark.get_snippet(indent, max_length)
+        return None
+
+    def __str__(self):
+        # type: () -> Any
+        return str(self.detach())
+
+
+def detached(mark):
+    # type: (Any) -> Any
+    """mark that keeps its snippet after the Reader releases its input"""
+    if isinstance(mark, CompactMark):
+        return mark.detach()
+    return mark
+
+
 class CommentMark(object):
     __slots__ = ('column',)
 
@@ -131,9 +204,12 @@ class MarkedYAMLError(YAMLError):
     ):
         # type: (Any, Any, Any, Any, Any, Any) -> None
         self.context = context
-        self.context_mark = context_mark
+        self.context_mark = detached(context_mark)
         self.problem = problem
-        self.problem_mark = problem_mark
+        if problem_mark is context_mark:
+            self.problem_mark = self.context_mark
+        else:
+            self.problem_mark = detached(problem_mark)
         self.note = note
         # warn is ignored
 
@@ -180,9 +256,12 @@ class MarkedYAMLWarning(YAMLWarning):
     ):
         # type: (Any, Any, Any, Any, Any, Any) -> None
         self.context = context
-        self.context_mark = context_mark
+        self.context_mark = detached(context_mark)
         self.problem = problem
-        self.problem_mark = problem_mark
+        if problem_mark is context_mark:
+            self.problem_mark = self.context_mark
+        else:
+            self.problem_mark = detached(problem_mark)
         self.note = note
         self.warn = warn
 
@@ -278,9 +357,12 @@ class MarkedYAMLFutureWarning(YAMLFutureWarning):
     ):
         # type: (Any, Any, Any, Any, Any, Any) -> None
         self.context = context
-        self.context_mark = context_mark
+        self.context_mark = detached(context_mark)
         self.problem = problem
-        self.problem_mark = problem_mark
+        if problem_mark is context_mark:
+            self.problem_mark = self.context_mark
+        else:
+            self.problem_mark = detached(problem_mark)
         self.note = note
         self.warn = warn
 
@@ -0,0 +1,488 @@
+# coding: utf-8
+
+from __future__ import print_function, absolute_import, division, unicode_literals
+
+"""
+incremental loading of round-trip documents: after an edit of the text only
+the entry of the innermost block mapping/sequence that contains the edit
+is parsed again, and the resulting nodes and data are spliced into the
+existing node tree and CommentedMap/CommentedSeq data. The marks of the
+nodes and the line/col information (.lc) of the data following the edit
+are shifted, so that they stay in line with the text.
+
+Documents with anchors/aliases, merge keys, directives or more than one
+document, as well as edits that don't fall within a single entry, are
+loaded completely.
+"""
+
+import re
+
+from ruamel.yaml.compat import ordereddict  # type: ignore
+from ruamel.yaml.comments import CommentedMap, CommentedSeq, merge_attrib, line_col_attrib
+from ruamel.yaml.error import YAMLError
+from ruamel.yaml.nodes import MappingNode, SequenceNode, CollectionNode
+from ruamel.yaml.main import document_marker
+
+if False:  # MYPY
+    from typing import Any, Dict, List, Optional, Set, Text, Tuple  # NOQA
+
+__all__ = ['IncrementalDocument']
+
+directive = re.compile(r'^%', re.MULTILINE)
+
+map_tag = 'tag:yaml.org,2002:map'
+seq_tag = 'tag:yaml.org,2002:seq'
+
+
+class IncrementalDocument(object):
+    """
+    a round-trip loaded document (the data is in .data, its root node
+    in .node) that can be updated after an edit of its text (.text)
+    """
+
+    def __init__(self, yaml, text):
+        # type: (Any, Text) -> None
+        self.yaml = yaml
+        self.text = text
+        self.node = None  # type: Any
+        self.data = None  # type: Any
+        self.reloaded = True  # the last update loaded the whole text
+        self.load()
+
+    def load(self):
+        # type: () -> Any
+        """load the whole text"""
+        self.reloaded = True
+        yaml = self.yaml
+        if 'rt' not in yaml.typ or yaml.lazy or yaml.packed or yaml.allow_duplicate_keys:
+            self.node = None
+            self.data = yaml.load(self.text)
+            return self.data
+        self.node, self.data = self.compose_construct(self.text)
+        if self.node is not None:
+            start = self.node.start_mark.index
+            if (
+                directive.search(self.text, 0, start) is not None
+                or document_marker.search(self.text, start) is not None
+                or not plain_nodes(self.node)
+                or not plain_data(self.data)
+            ):
+                self.node = None  # always load the whole text
+        return self.data
+
+    def compose_construct(self, text):
+        # type: (Text) -> Any
+        yaml = self.yaml
+        constructor, parser = yaml.get_constructor_parser(text)
+        try:
+            node = yaml.composer.get_single_node()
+            data = None if node is None else constructor.construct_document(node)
+            return node, data
+        finally:
+            parser.dispose()
+            try:
+                yaml._reader.reset_reader()
+            except AttributeError:
+                pass
+            try:
+                yaml._scanner.reset_scanner()
+            except AttributeError:
+                pass
+
+    def edit(self, offset, removed, inserted):
+        # type: (int, int, Text) -> Any
+        """
+        replace the removed number of characters of the text at offset by
+        the inserted text and update the data, which is returned (this is
+        only a different object than before if the whole text was loaded)
+        """
+        text = self.text
+        end = offset + removed
+        if not (0 <= offset <= end <= len(text)):
+            raise ValueError('edit ({}, {}) outside of text'.format(offset, removed))
+        self.text = text[:offset] + inserted + text[end:]
+        changed = inserted + text[offset:end]
+        if self.node is None or any(ch in changed for ch in '\r\x85\u2028\u2029'):
+            # lines are shifted by the difference in newlines
+            return self.load()
+        shift = len(inserted) - removed
+        line_shift = inserted.count('\n') - text.count('\n', offset, end)
+        path = self.entry_path(text, offset, end)
+        for depth in range(len(path) - 1, -1, -1):
+            if self.splice(path, depth, shift, line_shift):
+                self.reloaded = False
+                return self.data
+        return self.load()
+
+    def entry_path(self, text, offset, end):
+        # type: (Text, int, int) -> List[Any]
+        """
+        the nested entries in which the text between offset and end lies
+        for each the container node and data, the entry's index and the start,
+        line and end of the entry's text
+        """
+        path = []  # type: List[Any]
+        node, data = self.node, self.data
+        limit = len(text)
+        while is_block_collection(node, data):
+            idx = self.entry_index(text, node, offset)
+            if idx is None:
+                break
+            start, line = self.entry_start(text, node, idx)
+            column = start + node.start_mark.column
+            if offset < column and text[start:column].strip(' '):
+                break  # the edit changes the indicators of an outer entry
+            if idx + 1 < len(node.value):
+                entry_end = self.entry_start(text, node, idx + 1)[0]
+            else:
+                entry_end = limit
+            if end > entry_end:
+                break
+            path.append((node, data, idx, start, line, entry_end))
+            if isinstance(node, MappingNode):
+                node = node.value[idx][1]
+                data = ordereddict.__getitem__(data, list(data._keys())[idx])
+            else:
+                node = node.value[idx]
+                data = list.__getitem__(data, idx)
+            limit = entry_end
+        return path
+
+    def entry_index(self, text, node, offset):
+        # type: (Text, Any, int) -> Optional[int]
+        """index of the last entry of node starting before offset"""
+        low, high = 0, len(node.value)
+        while low < high:
+            mid = (low + high) // 2
+            if self.entry_start(text, node, mid)[0] <= offset:
+                low = mid + 1
+            else:
+                high = mid
+        return low - 1 if low > 0 else None
+
+    def entry_start(self, text, node, idx):
+        # type: (Text, Any, int) -> Tuple[int, int]
+        """index and line of the start of the line on which entry idx starts"""
+        column = node.start_mark.column
+        if isinstance(node, MappingNode):
+            mark = node.value[idx][0].start_mark
+            start = text.rfind('\n', 0, mark.index) + 1
+            return start, mark.line
+        mark = node.value[idx].start_mark
+        index, line = mark.index, mark.line
+        while True:  # find the line with the '-'
+            start = text.rfind('\n', 0, index) + 1
+            if text[start + column : start + column + 1] == '-' or start == 0:
+                return start, line
+            index = start - 1
+            line -= 1
+
+    def splice(self, path, depth, shift, line_shift):
+        # type: (List[Any], int, int, int) -> bool
+        """
+        parse the entry at depth in the path again, and when it is still one or
+        more entries of the same kind and indent, replace it in node and data
+        """
+        node, data, idx, start, line, end = path[depth]
+        # the snippet includes the line of the next entry (if any), so that the
+        # marks of empty values and the comments at the end of the entry are
+        # the same as when loading the whole text; that entry is dropped again
+        stop = end + shift
+        if stop < len(self.text):
+            following = self.text.find('\n', stop) + 1 or len(self.text)
+        else:
+            following = stop
+        snippet = self.text[start:following]
+        try:
+            new_node, new_data = self.compose_construct(snippet)
+        except YAMLError:
+            return False
+        if not (
+            is_block_collection(new_node, new_data)
+            and type(new_node) is type(node)
+            and type(new_data) is type(data)
+            and new_node.start_mark.line == 0
+            and new_node.start_mark.column == node.start_mark.column
+            and new_data.ca.comment is None
+            and not new_data.ca.end
+            and plain_nodes(new_node)
+            and plain_data(new_data)
+        ):
+            return False
+        if isinstance(node, MappingNode):
+            keys = list(data._keys())
+            old_key, next_key = keys[idx], keys[idx + 1 : idx + 2]
+        else:
+            old_key, next_key = idx, [idx + 1] if idx + 1 < len(data) else []
+        with_next = following > stop
+        if with_next:
+            last = len(new_node.value) - 1
+            if last < 1 or self.entry_start(snippet, new_node, last)[0] != stop - start:
+                return False
+            if isinstance(node, MappingNode):
+                last = list(new_data._keys())[last]
+            # comments between the entry and the next one are attached to the entry,
+            # or precede the next one: those are taken from the parsed next entry
+            item = new_data.ca.items.get(last) or [None, None]
+            before = item[1]
+            stop_line = snippet.count('\n', 0, stop - start)
+            if comment_before(item[:1] + item[2:], stop_line) or leading_comment(
+                get_value(new_data, last)
+            ):
+                return False
+            if not next_key or leading_comment(get_value(data, next_key[0])):
+                return False
+            drop_last(new_node, new_data)
+        if isinstance(node, MappingNode):
+            for key in new_data._keys():
+                if key != old_key and ordereddict.__contains__(data, key):
+                    return False
+        # comments preceding the entry are not in the snippet
+        old_value = get_value(data, old_key)
+        if (data.ca.items.get(old_key) or [None, None])[1] or leading_comment(old_value):
+            return False
+        seen = set()  # type: Set[Any]
+        shift_nodes(new_node.value, start, line, seen)
+        for lvl in range(depth, -1, -1):
+            lnode, ldata, lidx, lstart, lline, lend = path[lvl]
+            if lnode.end_mark is not None and id(lnode.end_mark) not in seen:
+                seen.add(id(lnode.end_mark))
+                lnode.end_mark.index += shift
+                lnode.end_mark.line += line_shift
+            following = slice(lidx + 1, None)
+            shift_nodes(lnode.value[following], shift, line_shift, seen)
+            if isinstance(lnode, MappingNode):
+                keys = list(ldata._keys())[following]
+            else:
+                keys = range(lidx + 1, len(ldata))
+            shift_entries(ldata, keys, line_shift)
+        if with_next:
+            set_comments_before(data, next_key[0], before)
+        node.value[idx : idx + 1] = new_node.value
+        if isinstance(node, MappingNode):
+            splice_map(data, idx, new_data, line)
+        else:
+            splice_seq(data, idx, new_data, line)
+        return True
+
+
+def is_block_collection(node, data):
+    # type: (Any, Any) -> bool
+    if isinstance(node, MappingNode):
+        return node.tag == map_tag and type(data) is CommentedMap and node.flow_style is False
+    if isinstance(node, SequenceNode):
+        return node.tag == seq_tag and type(data) is CommentedSeq and node.flow_style is False
+    return False
+
+
+def plain_nodes(node):
+    # type: (Any) -> bool
+    """no anchors (and therefore no aliases) in the nodes"""
+    todo = [node]
+    while todo:
+        node = todo.pop()
+        if node.anchor is not None:
+            return False
+        if isinstance(node, MappingNode):
+            for key_node, value_node in node.value:
+                todo.append(key_node)
+                todo.append(value_node)
+        elif isinstance(node, CollectionNode):
+            todo.extend(node.value)
+    return True
+
+
+def plain_data(data):
+    # type: (Any) -> bool
+    """no merge keys in the data"""
+    todo = [data]
+    while todo:
+        data = todo.pop()
+        if isinstance(data, dict):
+            if getattr(data, merge_attrib, None):
+                return False
+            todo.extend(ordereddict.values(data))
+        elif isinstance(data, list):
+            todo.extend(list.__iter__(data))
+    return True
+
+
+def shift_nodes(entries, index, line, seen):
+    # type: (Any, int, int, Set[Any]) -> None
+    """
+    shift the marks of the entries (nodes, or key and value node pairs) and
+    their descendants, marks can be shared
+    """
+    todo = []  # type: List[Any]
+    for entry in entries:
+        if isinstance(entry, tuple):
+            todo.extend(entry)
+        else:
+            todo.append(entry)
+    while todo:
+        node = todo.pop()
+        for mark in (node.start_mark, node.end_mark):
+            if mark is not None and id(mark) not in seen:
+                seen.add(id(mark))
+                mark.index += index
+                mark.line += line
+        if isinstance(node, MappingNode):
+            for key_node, value_node in node.value:
+                todo.append(key_node)
+                todo.append(value_node)
+        elif isinstance(node, CollectionNode):
+            todo.extend(node.value)
+
+
+def shift_entries(data, keys, line):
+    # type: (Any, Any, int) -> None
+    """shift the line/col information of the entries with keys in data"""
+    if not line:
+        return
+    lc = getattr(data, line_col_attrib, None)
+    for key in keys:
+        if lc is not None and lc.data is not None and key in lc.data:
+            lc.data[key] = shifted(lc.data[key], line)
+        if isinstance(data, dict):
+            shift_data(ordereddict.__getitem__(data, key), line)
+        else:
+            shift_data(list.__getitem__(data, key), line)
+
+
+def shift_data(data, line):
+    # type: (Any, int) -> None
+    """shift the line/col information of data and its descendants"""
+    todo = [data]
+    while todo:
+        data = todo.pop()
+        lc = getattr(data, line_col_attrib, None)
+        if lc is not None:
+            if lc.line is not None:
+                lc.line += line
+            if lc.data is not None:
+                for key in lc.data:
+                    lc.data[key] = shifted(lc.data[key], line)
+        if isinstance(data, dict):
+            todo.extend(ordereddict.values(data))
+        elif isinstance(data, list):
+            todo.extend(list.__iter__(data))
+
+
+def shifted(line_col, line):
+    # type: (List[int], int) -> List[int]
+    """line/col of a sequence item [line, col], or a mapping entry [line, col, line, col]"""
+    res = list(line_col)
+    for idx in range(0, len(res), 2):
+        res[idx] += line
+    return res
+
+
+def leading_comment(data):
+    # type: (Any) -> bool
+    """
+    the (first nested) collection has a comment preceding it, which can be
+    outside of the text of the entry
+    """
+    while isinstance(data, (CommentedMap, CommentedSeq)):
+        if data.ca.comment is not None:
+            return True
+        if not data:
+            break
+        if isinstance(data, CommentedMap):
+            data = ordereddict.__getitem__(data, list(data._keys())[0])
+        else:
+            data = list.__getitem__(data, 0)
+    return False
+
+
+def comment_before(item, line):
+    # type: (Any, int) -> bool
+    """a comment in the (nested lists of the) comment item starts before line"""
+    todo = [item]
+    while todo:
+        item = todo.pop()
+        if isinstance(item, list):
+            todo.extend(item)
+        elif item is not None and item.start_mark.line < line:
+            return True
+    return False
+
+
+def get_value(data, key):
+    # type: (Any, Any) -> Any
+    if isinstance(data, dict):
+        return ordereddict.__getitem__(data, key)
+    return list.__getitem__(data, key)
+
+
+def set_comments_before(data, key, comments):
+    # type: (Any, Any, Any) -> None
+    """replace the comments preceding the entry with key in data"""
+    item = data.ca.items.get(key)
+    if item is None:
+        if not comments:
+            return
+        item = data.ca.items[key] = [None, None, None, None]
+    item[1] = comments or None
+    if not any(item):
+        del data.ca.items[key]
+
+
+def drop_last(node, data):
+    # type: (Any, Any) -> None
+    """remove the last entry from node and data"""
+    node.value.pop()
+    if isinstance(node, MappingNode):
+        key = list(data._keys())[-1]
+        ordereddict.__delitem__(data, key)
+    else:
+        key = len(data) - 1
+        list.pop(data)
+    data.ca.items.pop(key, None)
+    if data.lc.data is not None:
+        data.lc.data.pop(key, None)
+
+
+def splice_map(data, idx, new_data, line):
+    # type: (Any, int, Any, int) -> None
+    """replace the entry at idx in data by those of new_data (parsed at line)"""
+    keys = list(data._keys())
+    old_key, following = keys[idx], keys[idx + 1 :]
+    values = [ordereddict.__getitem__(data, key) for key in following]
+    del data[old_key]
+    data.ca.items.pop(old_key, None)
+    lc = data.lc
+    if lc.data is not None:
+        lc.data.pop(old_key, None)
+    for key in following:
+        ordereddict.__delitem__(data, key)
+    for key, value in new_data._items():
+        shift_data(value, line)
+        data[key] = value
+        if key in new_data.ca.items:
+            data.ca.items[key] = new_data.ca.items[key]
+        lc.add_kv_line_col(key, shifted(new_data.lc.data[key], line))
+    for key, value in zip(following, values):
+        ordereddict.__setitem__(data, key, value)
+
+
+def splice_seq(data, idx, new_data, line):
+    # type: (Any, int, Any, int) -> None
+    """replace the item at idx in data by those of new_data (parsed at line)"""
+    added = len(new_data) - 1
+    for value in list.__iter__(new_data):
+        shift_data(value, line)
+    list.__setitem__(data, slice(idx, idx + 1), list(list.__iter__(new_data)))
+    items = data.ca.items
+    lc = data.lc
+    lc_data = {} if lc.data is None else lc.data
+    for old in (items, lc_data):
+        moved = dict((key, old.pop(key)) for key in list(old) if key > idx)
+        old.pop(idx, None)
+        for key, value in moved.items():
+            old[key + added] = value
+    for key, value in new_data.ca.items.items():
+        items[idx + key] = value
+    for key, value in new_data.lc.data.items():
+        lc_data[idx + key] = shifted(value, line)
+    lc.data = lc_data
@@ -0,0 +1,286 @@
+# coding: utf-8
+
+from __future__ import print_function, absolute_import, division, unicode_literals
+
+"""
+timing of the stages of YAML.load(), load_all() and dump(), dump_all(), and
+counts of what they produce, enabled by setting yaml.instrument to a callable.
+That gets a CallStats after every call, use a Stats instance to accumulate them.
+
+For the duration of a call, the methods through which a stage is entered are
+wrapped on the instances of the components (constructor, composer, parser and
+scanner resp. representer, serializer and emitter) and the time is charged to
+the innermost stage entered. The reader is part of the scanner, the resolver
+part of the composer resp. representer. With the C based parser (emitter) the
+stages it implements are charged to the composer (emitter) and their tokens
+and events are not counted. Without yaml.instrument nothing is wrapped.
+"""
+
+import time
+
+from ruamel.yaml.nodes import MappingNode, SequenceNode
+
+if False:  # MYPY
+    from typing import Any, Callable, Dict, List, Optional, Tuple  # NOQA
+
+__all__ = ['CallStats', 'Stats']
+
+clock = getattr(time, 'perf_counter', time.time)
+
+load_stages = ['constructor', 'composer', 'parser', 'scanner']
+dump_stages = ['representer', 'serializer', 'emitter']
+counters = ['tokens', 'events', 'nodes', 'objects', 'written']
+
+
+class CallStats(object):
+    """
+    the stages of one call: call is 'load' or 'dump' (load_all/dump_all
+    included), stages maps a stage to its time in seconds, time is their sum.
+    Counted are the tokens scanned, events parsed resp. emitted, nodes composed
+    resp. represented, objects constructed, and the characters (bytes when
+    encoding) written
+    """
+
+    __slots__ = ['call', 'stages'] + counters
+
+    def __init__(self, call, stages):
+        # type: (str, List[str]) -> None
+        self.call = call
+        self.stages = dict.fromkeys(stages, 0.0)  # type: Dict[str, float]
+        for name in counters:
+            setattr(self, name, 0)
+
+    @property
+    def time(self):
+        # type: () -> float
+        return sum(self.stages.values())
+
+    def __repr__(self):
+        # type: () -> str
+        return '{}({}, {:.6f}s, {})'.format(
+            self.__class__.__name__,
+            self.call,
+            self.time,
+            ', '.join('{}={}'.format(name, getattr(self, name)) for name in counters),
+        )
+
+
+class Stats(object):
+    """
+    accumulates the CallStats of the calls: yaml.instrument = stats = Stats().
+    calls, stages, and the counters are kept per kind of call ('load', 'dump')
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.reset()
+
+    def reset(self):
+        # type: () -> None
+        self.calls = {}  # type: Dict[str, int]
+        self.totals = {}  # type: Dict[str, CallStats]
+
+    def __call__(self, stats):
+        # type: (CallStats) -> None
+        self.calls[stats.call] = self.calls.get(stats.call, 0) + 1
+        total = self.totals.get(stats.call)
+        if total is None:
+            total = self.totals[stats.call] = CallStats(stats.call, list(stats.stages))
+        for stage, seconds in stats.stages.items():
+            total.stages[stage] += seconds
+        for name in counters:
+            setattr(total, name, getattr(total, name) + getattr(stats, name))
+
+    def __str__(self):
+        # type: () -> str
+        lines = []
+        for call, total in sorted(self.totals.items()):
+            lines.append(
+                '{} calls: {}, {:.3f} ms'.format(call, self.calls[call], total.time * 1000)
+            )
+            for stage, seconds in sorted(total.stages.items(), key=lambda x: -x[1]):
+                lines.append('  {:12s} {:10.3f} ms'.format(stage, seconds * 1000))
+            for name in counters:
+                if getattr(total, name):
+                    lines.append('  {:12s} {:10d}'.format(name, getattr(total, name)))
+        return '\n'.join(lines)
+
+
+class Probe(object):
+    """
+    wraps the methods of the components for the duration of one call, keeps
+    track of the stage that is active and charges the time spent to it
+    """
+
+    def __init__(self, sink, stats):
+        # type: (Callable[[CallStats], None], CallStats) -> None
+        self.sink = sink
+        self.stats = stats
+        self.active = []  # type: List[str]
+        self.last = clock()
+        self.wrapped = []  # type: List[Tuple[Any, str]]
+        self.restore = []  # type: List[Tuple[Any, str, Any]]
+
+    @classmethod
+    def load(cls, sink, constructor, parser, scanner):
+        # type: (Any, Any, Any, Any) -> Probe
+        probe = cls(sink, CallStats('load', load_stages))
+        composer = constructor.composer
+        for name in ('get_single_data', 'check_data', 'get_data'):
+            probe.wrap(constructor, name, 'constructor')
+        probe.wrap(constructor, 'construct_non_recursive_object', None, probe.count_object)
+        probe.wrap(constructor, 'construct_alias_free', None, None, probe.count_collections)
+        probe.wrap(composer, 'check_node', 'composer')
+        for name in ('get_single_node', 'get_node'):
+            probe.wrap(composer, name, 'composer', probe.count_nodes)
+        for name in ('check_event', 'peek_event'):
+            probe.wrap(parser, name, 'parser')
+        probe.wrap(parser, 'get_event', 'parser', probe.count_event)
+        if scanner is not None:
+            for name in ('check_token', 'peek_token'):
+                probe.wrap(scanner, name, 'scanner')
+            probe.wrap(scanner, 'get_token', 'scanner', probe.count_token)
+        return probe
+
+    @classmethod
+    def dump(cls, sink, serializer, representer, emitter):
+        # type: (Any, Any, Any, Any) -> Probe
+        probe = cls(sink, CallStats('dump', dump_stages))
+        probe.wrap(representer, 'represent', 'representer')
+        for name in ('open', 'close'):
+            probe.wrap(serializer, name, 'serializer')
+        probe.wrap(serializer, 'serialize', 'serializer', None, probe.count_nodes)
+        probe.wrap(emitter, 'emit', 'emitter', probe.count_event)
+        stream = getattr(emitter, '_stream', None)
+        if stream is not None:  # not for the C based emitter
+            probe.restore.append((emitter, '_stream', stream))
+            emitter._stream = CountingStream(stream, probe.stats)
+        return probe
+
+    def wrap(self, obj, name, stage, count=None, count_argument=None):
+        # type: (Any, str, Optional[str], Any, Any) -> None
+        """
+        wrap method name of obj, the time spent in it is charged to stage (if not
+        None), count is called with the result, count_argument with the argument
+        """
+        method = getattr(obj, name, None)
+        if method is None:
+            return
+        if name in getattr(obj, '__dict__', {}):
+            # left by a call that did not finish (dump_all() raising), else not a method
+            method = getattr(method, 'wrapped', None)
+            if method is None:
+                return
+        enter, leave = self.enter, self.leave
+
+        def wrapper(*args, **kw):
+            # type: (Any, Any) -> Any
+            if count_argument is not None:
+                count_argument(args[0])
+            if stage is None:
+                res = method(*args, **kw)
+            else:
+                enter(stage)
+                try:
+                    res = method(*args, **kw)
+                finally:
+                    leave()
+            if count is not None:
+                count(res)
+            return res
+
+        wrapper.wrapped = method  # type: ignore
+        setattr(obj, name, wrapper)
+        self.wrapped.append((obj, name))
+
+    def enter(self, stage):
+        # type: (str) -> None
+        now = clock()
+        if self.active:
+            self.stats.stages[self.active[-1]] += now - self.last
+        self.active.append(stage)
+        self.last = now
+
+    def leave(self):
+        # type: () -> None
+        now = clock()
+        self.stats.stages[self.active.pop()] += now - self.last
+        self.last = now
+
+    def finish(self):
+        # type: () -> None
+        """remove the wrappers and pass on the stats"""
+        for obj, name in self.wrapped:
+            delattr(obj, name)
+        for obj, name, value in self.restore:
+            setattr(obj, name, value)
+        self.wrapped = []
+        self.restore = []
+        self.sink(self.stats)
+
+    def count_token(self, token):
+        # type: (Any) -> None
+        self.stats.tokens += 1
+
+    def count_event(self, event):
+        # type: (Any) -> None
+        self.stats.events += 1
+
+    def count_object(self, data):
+        # type: (Any) -> None
+        self.stats.objects += 1
+
+    def count_nodes(self, node):
+        # type: (Any) -> None
+        self.stats.nodes += len(self.walk(node))
+
+    def count_collections(self, node):
+        # type: (Any) -> None
+        # construct_alias_free() constructs these without construct_non_recursive_object()
+        seq_tag = u'tag:yaml.org,2002:seq'
+        map_tag = u'tag:yaml.org,2002:map'
+        for child in self.walk(node):
+            if (isinstance(child, SequenceNode) and child.tag == seq_tag) or (
+                isinstance(child, MappingNode) and child.tag == map_tag
+            ):
+                self.stats.objects += 1
+
+    def walk(self, node):
+        # type: (Any) -> List[Any]
+        """the nodes of the tree at node, counting is not charged to any stage"""
+        start = clock()
+        res = []  # type: List[Any]
+        seen = set()
+        todo = [] if node is None else [node]
+        while todo:
+            node = todo.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            res.append(node)
+            if isinstance(node, SequenceNode):
+                todo.extend(node.value)
+            elif isinstance(node, MappingNode):
+                for key_node, value_node in node.value:
+                    todo.append(key_node)
+                    todo.append(value_node)
+        self.last += clock() - start
+        return res
+
+
+class CountingStream(object):
+    """output stream that counts what is written to it"""
+
+    def __init__(self, stream, stats):
+        # type: (Any, CallStats) -> None
+        self.stream = stream
+        self.stats = stats
+
+    def write(self, data):
+        # type: (Any) -> Any
+        self.stats.written += len(data)
+        return self.stream.write(data)
+
+    def __getattr__(self, name):
+        # type: (str) -> Any
+        return getattr(self.stream, name)
@@ -4,13 +4,17 @@ from __future__ import absolute_import, unicode_literals, print_function
 
 import sys
 import os
+import re
 import warnings
 import glob
+import multiprocessing
 from importlib import import_module
 
 
 import ruamel.yaml
-from ruamel.yaml.error import UnsafeLoaderWarning, YAMLError  # NOQA
+from ruamel.yaml.error import UnsafeLoaderWarning, YAMLError, MarkedYAMLError  # NOQA
+from ruamel.yaml.error import MarkedYAMLFutureWarning
+from ruamel.yaml.instrument import Probe
 
 from ruamel.yaml.tokens import *  # NOQA
 from ruamel.yaml.events import *  # NOQA
@@ -131,7 +135,9 @@ class YAML(object):
             self.Serializer = ruamel.yaml.serializer.Serializer
             self.Representer = ruamel.yaml.representer.RoundTripRepresenter  # type: Any
             self.Scanner = ruamel.yaml.scanner.RoundTripScanner
-            # no optimized rt-parser yet
+            # no optimized rt-parser yet: the C based CParser (from ruamel.yaml.clib)
+            # drops comments and does not provide the RoundTripScanner token stream,
+            # so a CParser cannot feed the Composer/RoundTripConstructor here
             self.Parser = ruamel.yaml.parser.RoundTripParser  # type: Any
             self.Composer = ruamel.yaml.composer.Composer  # type: Any
             self.Constructor = ruamel.yaml.constructor.RoundTripConstructor  # type: Any
@@ -164,6 +170,22 @@ class YAML(object):
         self.scalar_after_indicator = None
         # [a, b: 1, c: {d: 2}]  vs. [a, {b: 1}, {c: {d: 2}}]
         self.brace_single_entry_mapping_in_flow_sequence = False
+        # number of scalar values for which implicitly resolved tags are cached
+        self.resolver_cache_size = 0
+        # construct the values of (round-trip) mappings and sequences on first access
+        self.lazy = False
+        # (round-trip) collections share their Format attachment, see SharedFormat
+        self.packed = False
+        # marks that do not keep the input string alive after loading, see CompactMark
+        self.compact_marks = False
+        # False: no marks for the tokens, events and nodes (not for round-trip loading),
+        # on an error the input is loaded again with marks, to report the position
+        self.marks = True
+        # called with the ruamel.yaml.instrument.CallStats of every load and dump
+        self.instrument = None  # type: Any
+        # directory for the on-disk cache of loaded data (see ruamel.yaml.cache)
+        self.cache_dir = None  # type: Any
+        self.cache_size = 256 * 1024 * 1024
         for module in self.plug_ins:
             if getattr(module, 'typ', None) in self.typ:
                 typ_found += 1
@@ -181,6 +203,10 @@ class YAML(object):
             return self._reader  # type: ignore
         except AttributeError:
             self._reader = self.Reader(None, loader=self)
+            if self.compact_marks:
+                self._reader.compact_marks = True
+            if not self.marks and 'rt' not in self.typ:
+                self._reader.create_marks = False
             return self._reader
 
     @property
@@ -229,6 +255,10 @@ class YAML(object):
         if not hasattr(self, attr):
             cnst = self.Constructor(preserve_quotes=self.preserve_quotes, loader=self)
             cnst.allow_duplicate_keys = self.allow_duplicate_keys
+            if self.lazy:
+                cnst.lazy = True
+            if self.packed:
+                cnst.packed = True
             setattr(self, attr, cnst)
         return getattr(self, attr)
 
@@ -237,9 +267,25 @@ class YAML(object):
         # type: () -> Any
         attr = '_' + sys._getframe().f_code.co_name
         if not hasattr(self, attr):
-            setattr(self, attr, self.Resolver(version=self.version, loader=self))
+            rslvr = self.Resolver(version=self.version, loader=self)
+            if self.resolver_cache_size:
+                rslvr.implicit_cache_size = self.resolver_cache_size
+            setattr(self, attr, rslvr)
         return getattr(self, attr)
 
+    @property
+    def load_cache(self):
+        # type: () -> Any
+        if self.cache_dir is None or self.lazy:
+            return None
+        cache = getattr(self, '_load_cache', None)
+        if cache is None or cache.directory != str(self.cache_dir):
+            from ruamel.yaml.cache import LoadCache
+
+            cache = self._load_cache = LoadCache(self.cache_dir)
+        cache.max_size = self.cache_size
+        return cache
+
     @property
     def emitter(self):
         # type: () -> Any
@@ -323,23 +369,52 @@ class YAML(object):
     #         raise TypeError("Need a stream argument when not loading from context manager")
     #     return self.load_one(stream)
 
-    def load(self, stream):
-        # type: (Union[Path, StreamTextType]) -> Any
+    def load(self, stream, mmap=False):
+        # type: (Union[Path, StreamTextType], bool) -> Any
         """
         at this point you either have the non-pure Parser (which has its own reader and
         scanner) or you have the pure Parser.
         If the pure Parser is set, then set the Reader and Scanner, if not already set.
         If either the Scanner or Reader are set, you cannot use the non-pure Parser,
             so reset it to the pure parser and set the Reader resp. Scanner if necessary
+        mmap: memory map the file (a Path or an opened file) and decode it in one go,
+            instead of reading it in chunks
+        With cache_dir set, the loaded data is stored in a cache in that directory,
+        and returned from there when the same input is loaded again
         """
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
             with stream.open('rb') as fp:
-                return self.load(fp)
-        constructor, parser = self.get_constructor_parser(stream)
+                return self.load(fp, mmap=mmap)
+        cache = self.load_cache
+        if cache is not None:
+            name = getattr(stream, 'name', None)
+            if hasattr(stream, 'read'):
+                stream, mmap = stream.read(), False
+            key = cache.key(self, stream)
+            found, value = cache.get(key)
+            if found:
+                data, self.version, self.tags = value
+                return data
+        position = self.stream_position(stream)
+        constructor, parser = self.get_constructor_parser(stream, mmap=mmap)
+        if cache is not None and name is not None and hasattr(self, '_reader'):
+            self._reader.name = name  # for the marks in error messages
+        probe = self.probe(constructor, parser)
         try:
-            return constructor.get_single_data()
+            data = constructor.get_single_data()
+            if cache is not None:
+                cache.put(key, (data, self.version, self.tags))
+            return data
+        except (MarkedYAMLError, MarkedYAMLFutureWarning) as exc:
+            if position is None or getattr(self, '_reader', None) is None:
+                raise
+            if self._reader.create_marks:
+                raise
+            error = exc
         finally:
+            if probe is not None:
+                probe.finish()
             parser.dispose()
             try:
                 self._reader.reset_reader()
@@ -349,9 +424,10 @@ class YAML(object):
                 self._scanner.reset_scanner()
             except AttributeError:
                 pass
+        self.rescan(self.load, stream, position, mmap, error)
 
-    def load_all(self, stream, _kw=enforce):  # , skip=None):
-        # type: (Union[Path, StreamTextType], Any) -> Any
+    def load_all(self, stream, _kw=enforce, mmap=False):  # , skip=None):
+        # type: (Union[Path, StreamTextType], Any, bool) -> Any
         if _kw is not enforce:
             raise TypeError(
                 '{}.__init__() takes no positional argument but at least '
@@ -360,18 +436,29 @@ class YAML(object):
         if not hasattr(stream, 'read') and hasattr(stream, 'open'):
             # pathlib.Path() instance
             with stream.open('r') as fp:
-                for d in self.load_all(fp, _kw=enforce):
+                for d in self.load_all(fp, _kw=enforce, mmap=mmap):
                     yield d
                 return
         # if skip is None:
         #     skip = []
         # elif isinstance(skip, int):
         #     skip = [skip]
-        constructor, parser = self.get_constructor_parser(stream)
+        position = self.stream_position(stream)
+        constructor, parser = self.get_constructor_parser(stream, mmap=mmap)
+        probe = self.probe(constructor, parser)
         try:
             while constructor.check_data():
                 yield constructor.get_data()
+            return
+        except (MarkedYAMLError, MarkedYAMLFutureWarning) as exc:
+            if position is None or getattr(self, '_reader', None) is None:
+                raise
+            if self._reader.create_marks:
+                raise
+            error = exc
         finally:
+            if probe is not None:
+                probe.finish()
             parser.dispose()
             try:
                 self._reader.reset_reader()
@@ -382,8 +469,184 @@ class YAML(object):
             except AttributeError:
                 pass
 
-    def get_constructor_parser(self, stream):
-        # type: (StreamTextType) -> Any
+        def consume(stream, mmap):
+            # type: (Any, bool) -> None
+            for _ in self.load_all(stream, mmap=mmap):
+                pass
+
+        self.rescan(consume, stream, position, mmap, error)
+
+    def probe(self, constructor, parser):
+        # type: (Any, Any) -> Any
+        """with instrument set, the Probe that times the stages of a load"""
+        if self.instrument is None:
+            return None
+        scanner = None
+        if isinstance(parser, ruamel.yaml.parser.Parser):  # not with the C based parser
+            scanner = parser.scanner
+        return Probe.load(self.instrument, constructor, parser, scanner)
+
+    def stream_position(self, stream):
+        # type: (Any) -> Any
+        """
+        with marks off, where loading starts in stream (0 for a string), for
+        loading again on an error. None if stream cannot be read again
+        """
+        if self.marks or 'rt' in self.typ:
+            return None
+        if not hasattr(stream, 'read'):
+            return 0
+        try:
+            return stream.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+
+    def rescan(self, load, stream, position, mmap, error):
+        # type: (Any, Any, Any, bool, Any) -> None
+        """
+        load stream again from position, with marks, to raise error with the
+        marks of its position. Raises error itself if that load succeeds
+        """
+        if hasattr(stream, 'seek'):
+            stream.seek(position)
+        self._reader.create_marks = True
+        try:
+            load(stream, mmap=mmap)
+        finally:
+            self._reader.create_marks = False
+        raise error
+
+    def load_all_parallel(self, stream, _kw=enforce, workers=None):
+        # type: (Union[Path, StreamTextType], Any, Optional[int]) -> Any
+        """
+        like load_all, but the stream is split into documents (see split_documents)
+        that are loaded by a pool of workers processes (default: one per CPU).
+        The documents are generated in order. Only for typ 'safe' and 'base',
+        other types (and a single worker) fall back to load_all.
+        """
+        if _kw is not enforce:
+            raise TypeError(
+                '{}.__init__() takes no positional argument but at least '
+                'one was given ({!r})'.format(self.__class__.__name__, _kw)
+            )
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers < 2 or not ('safe' in self.typ or 'base' in self.typ):
+            for d in self.load_all(stream):
+                yield d
+            return
+        if not hasattr(stream, 'read') and hasattr(stream, 'open'):
+            # pathlib.Path() instance
+            with stream.open('rb') as fp:
+                stream = fp.read()
+        elif hasattr(stream, 'read'):
+            stream = stream.read()
+        if isinstance(stream, bytes):
+            stream = ruamel.yaml.reader.Reader(None).decode_mapped(stream)
+        chunks = []
+        index = line = 0
+        # the version of a %YAML directive (or yaml.version) applies to the
+        # following documents as well, a part without directive gets one
+        version = self.version  # type: Any
+        if isinstance(version, (list, tuple)):
+            version = tuple(version)
+        elif version is not None:
+            version = tuple(map(int, version.split('.')))
+        for chunk in split_documents(stream):
+            marker = document_marker.search(chunk)
+            header = chunk if marker is None else chunk[: marker.start()]
+            directive = yaml_directive.search(header)
+            if directive is not None:
+                version = (int(directive.group(1)), int(directive.group(2)))
+                prefix = u''
+            elif version is None:
+                prefix = u''
+            elif marker is not None and marker.group(1) == '---':
+                prefix = u'%YAML {}.{}\n'.format(*version)
+            elif has_content(header):
+                prefix = u'%YAML {}.{}\n---\n'.format(*version)
+            else:
+                prefix = u''
+            chunks.append((index - len(prefix), line - prefix.count('\n'), prefix + chunk))
+            index += len(chunk)
+            line += chunk.count('\n')
+            if '%YAML' in chunk[len(header) :]:
+                # e.g. a part with more than one document
+                chunks = []
+                break
+        if len(chunks) < 2:
+            for d in self.load_all(stream):
+                yield d
+            return
+        settings = (self.typ, self.pure, self.version, self.allow_duplicate_keys)
+        pool = multiprocessing.Pool(workers, _init_parallel_loader, (settings,))
+        try:
+            chunksize = max(1, len(chunks) // (workers * 4))
+            for docs in pool.imap(_parallel_load_all, chunks, chunksize):
+                for d in docs:
+                    yield d
+        finally:
+            pool.terminate()
+
+    def load_incremental(self, stream):
+        # type: (Union[Path, StreamTextType]) -> Any
+        """
+        load a single document and return it as an IncrementalDocument, for which
+        after each edit(offset, removed, inserted) of the text only the affected
+        entry of a block mapping/sequence is parsed again (round-trip only)
+        """
+        from ruamel.yaml.incremental import IncrementalDocument
+
+        if not hasattr(stream, 'read') and hasattr(stream, 'open'):
+            # pathlib.Path() instance
+            with stream.open('rb') as fp:
+                stream = fp.read()
+        elif hasattr(stream, 'read'):
+            stream = stream.read()
+        if isinstance(stream, bytes):
+            stream = ruamel.yaml.reader.Reader(None).decode_mapped(stream)
+        return IncrementalDocument(self, stream)
+
+    def iter_load(self, stream, path=(None,)):
+        # type: (Union[Path, StreamTextType], Any) -> Any
+        """
+        generate the data at path in every document of the stream, each as soon
+        as it has been loaded. The documents are not built, so the memory used
+        doesn't depend on the size of the documents, only on that of the data
+        at path (and anchored nodes, which are kept for the rest of the document)
+        path: sequence of mapping keys/sequence indices from the root of the
+              document, None selects every value/item. The default (None,)
+              gives the items of a root level sequence one by one, () gives
+              every document.
+        """
+        if not hasattr(stream, 'read') and hasattr(stream, 'open'):
+            # pathlib.Path() instance
+            with stream.open('rb') as fp:
+                for d in self.iter_load(fp, path=path):
+                    yield d
+                return
+        constructor, parser = self.get_constructor_parser(stream)
+        if parser is constructor:
+            # C based parser, compose its events in Python
+            composer = self.Composer(loader=parser)
+        else:
+            composer = self.composer
+        try:
+            for node in composer.compose_path_nodes(path):
+                yield constructor.construct_document(node)
+        finally:
+            parser.dispose()
+            try:
+                self._reader.reset_reader()
+            except AttributeError:
+                pass
+            try:
+                self._scanner.reset_scanner()
+            except AttributeError:
+                pass
+
+    def get_constructor_parser(self, stream, mmap=False):
+        # type: (StreamTextType, bool) -> Any
         """
         the old cyaml needs special setup, and therefore the stream
         """
@@ -392,19 +655,24 @@ class YAML(object):
                 self.Reader = ruamel.yaml.reader.Reader
             if self.Scanner is None:
                 self.Scanner = ruamel.yaml.scanner.Scanner
-            self.reader.stream = stream
+            self.set_reader_stream(stream, mmap)
         else:
             if self.Reader is not None:
                 if self.Scanner is None:
                     self.Scanner = ruamel.yaml.scanner.Scanner
                 self.Parser = ruamel.yaml.parser.Parser
-                self.reader.stream = stream
+                self.set_reader_stream(stream, mmap)
             elif self.Scanner is not None:
                 if self.Reader is None:
                     self.Reader = ruamel.yaml.reader.Reader
                 self.Parser = ruamel.yaml.parser.Parser
-                self.reader.stream = stream
+                self.set_reader_stream(stream, mmap)
             else:
+                if mmap:
+                    # the C parser gets the text decoded from the mapped file
+                    reader = ruamel.yaml.reader.Reader(None)
+                    reader.mmap_stream(stream)
+                    stream = reader.buffer
                 # combined C level reader>scanner>parser
                 # does some calls to the resolver, e.g. BaseResolver.descend_resolver
                 # if you just initialise the CParser, to much of resolver.py
@@ -427,6 +695,13 @@ class YAML(object):
                 return loader, loader
         return self.constructor, self.parser
 
+    def set_reader_stream(self, stream, mmap=False):
+        # type: (StreamTextType, bool) -> None
+        if mmap:
+            self.reader.mmap_stream(stream)
+        else:
+            self.reader.stream = stream
+
     def dump(self, data, stream=None, _kw=enforce, transform=None):
         # type: (Any, Union[Path, StreamType], Any, Any) -> Any
         if self._context_manager:
@@ -735,6 +1010,79 @@ class YAML(object):
         self.compact_seq_map = seq_map
 
 
+document_marker = re.compile(r'^(---|\.\.\.)(?=[ \t\r\n]|$)', re.MULTILINE)
+yaml_directive = re.compile(r'^%YAML[ \t]+([0-9]+)\.([0-9]+)', re.MULTILINE)
+
+
+def has_content(text):
+    # type: (Text) -> bool
+    """text has a line that is not empty, a comment or a directive"""
+    for line in text.splitlines():
+        line = line.strip(' \t\ufeff')
+        if line and line[0] not in '#%':
+            return True
+    return False
+
+
+def split_documents(text):
+    # type: (Text) -> Any
+    """
+    generate the parts of a YAML stream (as text) that each contain one document,
+    by looking for document start and end markers at the beginning of a line, as
+    these end any scalar (also a block scalar with content at column 0). In a
+    quoted scalar or flow collection these lines are an error, which is then
+    reported for the part before the marker. Directives and comments preceding
+    a document start marker are kept with that document. A part can contain
+    more than one document, e.g. if it uses '\\r' as line break.
+    """
+    start = 0
+    started = False  # document start marker seen in current part
+    for match in document_marker.finditer(text):
+        if match.group(1) == '---':
+            if started or has_content(text[start : match.start()]):
+                yield text[start : match.start()]
+                start = match.start()
+            started = True
+        else:
+            end = text.find('\n', match.end())
+            end = len(text) if end < 0 else end + 1
+            yield text[start:end]
+            start = end
+            started = False
+    if start < len(text):
+        yield text[start:]
+
+
+_parallel_loader = None  # type: Any
+
+
+def _init_parallel_loader(settings):
+    # type: (Any) -> None
+    global _parallel_loader
+    typ, pure, version, allow_duplicate_keys = settings
+    _parallel_loader = YAML(typ=typ, pure=pure)
+    _parallel_loader.version = version
+    _parallel_loader.allow_duplicate_keys = allow_duplicate_keys
+
+
+def _parallel_load_all(chunk):
+    # type: (Any) -> List[Any]
+    """load the documents of a part of a stream, in a worker process"""
+    index, line, text = chunk
+    try:
+        return list(_parallel_loader.load_all(text))
+    except MarkedYAMLError as exc:
+        # positions relative to the whole stream
+        marks = [exc.context_mark, exc.problem_mark]
+        if marks[0] is marks[1]:
+            del marks[1]
+        for mark in marks:
+            if mark is not None:
+                mark.index += index
+                mark.line += line
+        raise
+
+
 class YAMLContextManager(object):
     def __init__(self, yaml, transform=None):
         # type: (Any, Any) -> None  # used to be: (Any, Optional[Callable]) -> None
@@ -743,6 +1091,7 @@ class YAMLContextManager(object):
         self._output_path = None
         self._output = self._yaml._output
         self._transform = transform
+        self._probe = None  # type: Any
 
         # self._input_inited = False
         # self._input = input
@@ -774,6 +1123,9 @@ class YAMLContextManager(object):
             self._yaml.serializer.close()
         else:
             return
+        if self._probe is not None:
+            self._probe.finish()
+            self._probe = None
         try:
             self._yaml.emitter.dispose()
         except AttributeError:
@@ -803,7 +1155,11 @@ class YAMLContextManager(object):
             tlca = max([len(str(x)) for x in first_data])  # type: Any
         else:
             tlca = self._yaml.top_level_colon_align
-        self._yaml.get_serializer_representer_emitter(self._output, tlca)
+        serializer, representer, emitter = self._yaml.get_serializer_representer_emitter(
+            self._output, tlca
+        )
+        if self._yaml.instrument is not None:
+            self._probe = Probe.dump(self._yaml.instrument, serializer, representer, emitter)
         self._yaml.serializer.open()
         self._output_inited = True
 
@@ -10,7 +10,7 @@ if False:  # MYPY
 
 
 class Node(object):
-    __slots__ = 'tag', 'value', 'start_mark', 'end_mark', 'comment', 'anchor'
+    __slots__ = 'tag', 'value', 'start_mark', 'end_mark', 'comment', 'anchor', 'has_aliases'
 
     def __init__(self, tag, value, start_mark, end_mark, comment=None, anchor=None):
         # type: (Any, Any, Any, Any, Any, Any) -> None
@@ -20,6 +20,9 @@ class Node(object):
         self.end_mark = end_mark
         self.comment = comment
         self.anchor = anchor
+        # set by the composer on the root node of a document: False when the
+        # document has no aliases (True when not known)
+        self.has_aliases = True
 
     def __repr__(self):
         # type: () -> str
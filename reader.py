@@ -22,8 +22,10 @@ from __future__ import absolute_import
 #      character.
 
 import codecs
+import mmap
 
-from ruamel.yaml.error import YAMLError, FileMark, StringMark, YAMLStreamError
+from ruamel.yaml.error import YAMLError, FileMark, StringMark, CompactMark, YAMLStreamError
+from ruamel.yaml.error import MarkSource
 from ruamel.yaml.compat import text_type, binary_type, PY3, UNICODE_SIZE
 from ruamel.yaml.util import RegExp
 
@@ -76,9 +78,16 @@ class Reader(object):
 
     # Yeah, it's ugly and slow.
 
+    # for input from a string, create CompactMarks, that do not keep the input
+    # alive after the reader is reset
+    compact_marks = False
+    # when False, get_mark() returns None, the tokens, events and nodes have no marks
+    create_marks = True
+
     def __init__(self, stream, loader=None):
         # type: (Any, Any) -> None
         self.loader = loader
+        self.mark_source = None  # type: Any
         if self.loader is not None and getattr(self.loader, '_reader', None) is None:
             self.loader._reader = self
         self.reset_reader()
@@ -86,6 +95,9 @@ class Reader(object):
 
     def reset_reader(self):
         # type: () -> None
+        if self.mark_source is not None:
+            self.mark_source.buffer = None
+            self.mark_source = None
         self.name = None  # type: Any
         self.stream_pointer = 0
         self.eof = True
@@ -129,6 +141,69 @@ class Reader(object):
             self.raw_buffer = None
             self.determine_encoding()
 
+    def mmap_stream(self, val):
+        # type: (Any) -> None
+        """
+        set the input from the file object val, from its current position on, by
+        memory mapping the file and decoding it in one go. The decoded text is the
+        buffer, the terminating NUL is only appended by update() when the end is
+        reached (after dropping what was read), so the extra memory needed is that
+        of the decoded text.
+        """
+        self.reset_reader()
+        self.name = getattr(val, 'name', '<file>')
+        try:
+            fileno = val.fileno()
+        except (AttributeError, IOError, ValueError):
+            raise YAMLStreamError('memory mapping needs a stream with a fileno() method')
+        try:
+            start = val.tell()
+        except (AttributeError, IOError, ValueError):
+            start = 0
+        try:
+            mm = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except ValueError:  # cannot map an empty file
+            data = u''
+        else:
+            try:
+                data = self.decode_mapped(mm, start)
+                val.seek(len(mm))  # as if read()
+            finally:
+                mm.close()
+        self._stream = None
+        self.check_printable(data)
+        self.buffer = data
+        self.raw_buffer = u''  # nothing left to decode, update() appends the NUL
+        self.raw_decode = None
+
+    def decode_mapped(self, mm, start=0):
+        # type: (Any, int) -> Text
+        head = mm[start : start + 2]
+        if head == codecs.BOM_UTF16_LE:
+            self.encoding = 'utf-16-le'
+        elif head == codecs.BOM_UTF16_BE:
+            self.encoding = 'utf-16-be'
+        else:
+            self.encoding = 'utf-8'
+        if not PY3:
+            return self.decode_mapped_data(mm[start:])
+        # released explicitly, the mapping cannot be closed while a view exists
+        with memoryview(mm) as view, view[start:] as data:
+            return self.decode_mapped_data(data)
+
+    def decode_mapped_data(self, data):
+        # type: (Any) -> Text
+        try:
+            return codecs.decode(data, self.encoding)  # type: ignore
+        except UnicodeDecodeError as exc:
+            raise ReaderError(
+                self.name,
+                exc.start,
+                bytes(data[exc.start : exc.start + 1]),
+                exc.encoding,
+                exc.reason,
+            )
+
     def peek(self, index=0):
         # type: (int) -> Text
         try:
@@ -143,10 +218,17 @@ class Reader(object):
             self.update(length)
         return self.buffer[self.pointer : self.pointer + length]
 
+    # spans of at least this many characters have their line/column deltas
+    # computed in one go, instead of by looking at every character
+    forward_bulk_length = 8
+
     def forward_1_1(self, length=1):
         # type: (int) -> None
         if self.pointer + length + 1 >= len(self.buffer):
             self.update(length + 1)
+        if length >= self.forward_bulk_length:
+            self.forward_bulk(length, u'\n\x85\u2028\u2029')
+            return
         while length != 0:
             ch = self.buffer[self.pointer]
             self.pointer += 1
@@ -164,6 +246,9 @@ class Reader(object):
         # type: (int) -> None
         if self.pointer + length + 1 >= len(self.buffer):
             self.update(length + 1)
+        if length >= self.forward_bulk_length:
+            self.forward_bulk(length)
+            return
         while length != 0:
             ch = self.buffer[self.pointer]
             self.pointer += 1
@@ -175,9 +260,51 @@ class Reader(object):
                 self.column += 1
             length -= 1
 
+    def forward_bulk(self, length, line_breaks=u'\n'):
+        # type: (int, Text) -> None
+        # same result as forward(), but the line and column are derived from
+        # counting the line breaks in the span and searching for the last one
+        # the caller must have made sure the buffer holds length + 1 characters
+        buffer = self.buffer
+        start = self.pointer
+        end = start + length
+        lines = 0
+        last = -1
+        for br in line_breaks:
+            count = buffer.count(br, start, end)
+            if count:
+                lines += count
+                pos = buffer.rfind(br, start, end)
+                if pos > last:
+                    last = pos
+        count = buffer.count(u'\r', start, end)
+        if count:
+            # a '\r' followed by '\n' is not a line break by itself
+            lines += count - buffer.count(u'\r\n', start, end + 1)
+            pos = buffer.rfind(u'\r', start, end)
+            if pos == end - 1 and buffer[end] == u'\n':
+                pos = buffer.rfind(u'\r', start, pos)
+            if pos > last:
+                last = pos
+        if last < 0:
+            self.column += length - buffer.count(u'\uFEFF', start, end)
+        else:
+            self.line += lines
+            self.column = end - last - 1 - buffer.count(u'\uFEFF', last + 1, end)
+        self.pointer = end
+        self.index += length
+
     def get_mark(self):
         # type: () -> Any
+        if not self.create_marks:
+            return None
         if self.stream is None:
+            if self.compact_marks:
+                source = self.mark_source
+                if source is None:
+                    source = MarkSource(self.buffer, self.index - self.pointer)
+                    self.mark_source = source
+                return CompactMark(self.name, self.index, self.line, self.column, source)
             return StringMark(
                 self.name, self.index, self.line, self.column, self.buffer, self.pointer
             )
@@ -289,6 +416,9 @@ class Reader(object):
                 self.buffer += '\0'
                 self.raw_buffer = None
                 break
+        if self.mark_source is not None:
+            self.mark_source.buffer = self.buffer
+            self.mark_source.start = self.index
 
     def update_raw(self, size=None):
         # type: (Optional[int]) -> None
@@ -651,6 +651,8 @@ from ruamel.yaml.comments import (
     CommentedKeySeq,
     CommentedKeyMap,
     CommentedSet,
+    LazyCommentedMap,
+    LazyCommentedSeq,
     comment_attrib,
     merge_attrib,
     TaggedScalar,
@@ -899,7 +901,7 @@ class RoundTripRepresenter(SafeRepresenter):
         # explicitly will be taken. If that is None as well the default flow
         # style rules
         try:
-            flow_style = sequence.fa.flow_style(flow_style)
+            flow_style = sequence._yaml_get_flow_style(flow_style)
         except AttributeError:
             flow_style = flow_style
         try:
@@ -973,7 +975,7 @@ class RoundTripRepresenter(SafeRepresenter):
         # type: (Any, Any, Any) -> Any
         value = []  # type: List[Any]
         try:
-            flow_style = mapping.fa.flow_style(flow_style)
+            flow_style = mapping._yaml_get_flow_style(flow_style)
         except AttributeError:
             flow_style = flow_style
         try:
@@ -1051,7 +1053,7 @@ class RoundTripRepresenter(SafeRepresenter):
         # type: (Any, Any, Any) -> Any
         value = []  # type: List[Any]
         try:
-            flow_style = omap.fa.flow_style(flow_style)
+            flow_style = omap._yaml_get_flow_style(flow_style)
         except AttributeError:
             flow_style = flow_style
         try:
@@ -1113,7 +1115,7 @@ class RoundTripRepresenter(SafeRepresenter):
         tag = u'tag:yaml.org,2002:set'
         # return self.represent_mapping(tag, value)
         value = []  # type: List[Any]
-        flow_style = setting.fa.flow_style(flow_style)
+        flow_style = setting._yaml_get_flow_style(flow_style)
         try:
             anchor = setting.yaml_anchor()
         except AttributeError:
@@ -1261,6 +1263,10 @@ RoundTripRepresenter.add_representer(CommentedSeq, RoundTripRepresenter.represen
 
 RoundTripRepresenter.add_representer(CommentedMap, RoundTripRepresenter.represent_dict)
 
+RoundTripRepresenter.add_representer(LazyCommentedSeq, RoundTripRepresenter.represent_list)
+
+RoundTripRepresenter.add_representer(LazyCommentedMap, RoundTripRepresenter.represent_dict)
+
 RoundTripRepresenter.add_representer(
     CommentedOrderedMap, RoundTripRepresenter.represent_ordereddict
 )
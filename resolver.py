@@ -3,6 +3,7 @@
 from __future__ import absolute_import
 
 import re
+from collections import OrderedDict, namedtuple
 
 if False:  # MYPY
     from typing import Any, Dict, List, Union, Text, Optional  # NOQA
@@ -15,6 +16,8 @@ from ruamel.yaml.util import RegExp  # NOQA
 
 __all__ = ['BaseResolver', 'Resolver', 'VersionedResolver']
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
 
 # fmt: off
 # resolvers consist of
@@ -103,6 +106,109 @@ class ResolverError(YAMLError):
     pass
 
 
+class CompiledResolvers(object):
+    """
+    classify scalars by the implicit resolvers for their first character with
+    a single match: the regexps for a character, followed by those for any
+    character (key None), are merged into one regexp with a named group per
+    resolver. The first alternative that matches is the one whose tag would
+    have been found by trying the regexps in order.
+    Regexps that cannot be merged (differing flags, capturing groups) are
+    tried one after another.
+    With a cache_size, the results for the most recently resolved scalar values
+    are kept. As a new instance is created whenever resolvers are added, the
+    cache never holds outdated results.
+    """
+
+    def __init__(self, implicit_resolvers, combine=True, cache_size=0):
+        # type: (Dict[Any, Any], bool, int) -> None
+        self.implicit_resolvers = implicit_resolvers  # first character -> [(tag, regexp)]
+        self.combine = combine
+        self._matchers = {}  # type: Dict[Any, Any]
+        self.cache_size = cache_size
+        self.hits = self.misses = 0
+        self._cache = OrderedDict()  # type: Any
+        if cache_size > 0:
+            self.resolve = self.cached_resolve  # type: ignore
+
+    def cache_info(self):
+        # type: () -> Any
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self._cache))
+
+    def cached_resolve(self, value):
+        # type: (Text) -> Any
+        cache = self._cache
+        try:
+            tag = cache.pop(value)
+        except KeyError:
+            self.misses += 1
+            tag = cache[value] = self.match(value)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+            return tag
+        self.hits += 1
+        cache[value] = tag  # now the most recently used
+        return tag
+
+    def resolve(self, value):
+        # type: (Text) -> Any
+        """return the tag of the first matching resolver, or None"""
+        return self.match(value)
+
+    def match(self, value):
+        # type: (Text) -> Any
+        ch = value[0] if value else u''
+        try:
+            matcher = self._matchers[ch]
+        except KeyError:
+            matcher = self._matchers[ch] = self.compile(ch)
+        return matcher(value)
+
+    def compile(self, ch):
+        # type: (Any) -> Any
+        resolvers = self.implicit_resolvers.get(ch, []) + self.implicit_resolvers.get(None, [])
+        if not resolvers:
+            return self.no_match
+        if self.combine and len(resolvers) > 1:
+            flags = set(regexp.flags for tag, regexp in resolvers)
+            if len(flags) == 1 and not any(regexp.groups for tag, regexp in resolvers):
+                tags = {}
+                patterns = []
+                for idx, (tag, regexp) in enumerate(resolvers):
+                    name = 't%d' % idx
+                    tags[name] = tag
+                    patterns.append(u'(?P<%s>%s)' % (name, regexp.pattern))
+                try:
+                    combined = re.compile(u'|'.join(patterns), flags.pop())
+                except (re.error, AssertionError):  # e.g. too many groups
+                    pass
+                else:
+                    match = combined.match
+
+                    def combined_matcher(value):
+                        # type: (Text) -> Any
+                        res = match(value)
+                        if res is None:
+                            return None
+                        return tags[res.lastgroup]
+
+                    return combined_matcher
+
+        def sequential_matcher(value):
+            # type: (Text) -> Any
+            for tag, regexp in resolvers:
+                if regexp.match(value):
+                    return tag
+            return None
+
+        return sequential_matcher
+
+    @staticmethod
+    def no_match(value):
+        # type: (Text) -> Any
+        return None
+
+
 class BaseResolver(object):
 
     DEFAULT_SCALAR_TAG = u'tag:yaml.org,2002:str'
@@ -111,6 +217,9 @@ class BaseResolver(object):
 
     yaml_implicit_resolvers = {}  # type: Dict[Any, Any]
     yaml_path_resolvers = {}  # type: Dict[Any, Any]
+    # counts the implicit resolvers added to any class, a resolver compiles its
+    # implicit resolvers again when this changed
+    _implicit_resolvers_added = 0
 
     def __init__(self, loadumper=None):
         # type: (Any, Any) -> None
@@ -120,6 +229,29 @@ class BaseResolver(object):
         self._loader_version = None  # type: Any
         self.resolver_exact_paths = []  # type: List[Any]
         self.resolver_prefix_paths = []  # type: List[Any]
+        self._implicit_cache_size = 0
+        self._compiled_resolver = None  # type: Any
+        self._compiled_added = 0
+
+    @property
+    def implicit_cache_size(self):
+        # type: () -> int
+        """
+        number of scalar values for which the implicitly resolved tag is kept
+        (least recently used are dropped first), 0 for no caching
+        """
+        return self._implicit_cache_size
+
+    @implicit_cache_size.setter
+    def implicit_cache_size(self, val):
+        # type: (int) -> None
+        self._implicit_cache_size = val
+        self._compiled_resolver = None
+
+    def cache_info(self):
+        # type: () -> Any
+        """hits, misses, maxsize and currsize of the implicit resolver cache"""
+        return self.compiled_resolver.cache_info()
 
     @property
     def parser(self):
@@ -142,6 +274,7 @@ class BaseResolver(object):
             first = [None]
         for ch in first:
             cls.yaml_implicit_resolvers.setdefault(ch, []).append((tag, regexp))
+        BaseResolver._implicit_resolvers_added += 1
 
     @classmethod
     def add_implicit_resolver(cls, tag, regexp, first):
@@ -156,6 +289,7 @@ class BaseResolver(object):
         for ch in first:
             cls.yaml_implicit_resolvers.setdefault(ch, []).append((tag, regexp))
         implicit_resolvers.append(([(1, 2), (1, 1)], tag, regexp, first))
+        BaseResolver._implicit_resolvers_added += 1
 
     # @classmethod
     # def add_implicit_resolver(cls, tag, regexp, first):
@@ -268,17 +402,24 @@ class BaseResolver(object):
                 return False
         return True
 
+    @property
+    def compiled_resolver(self):
+        # type: () -> Any
+        """the implicit resolvers of the class compiled, with the cache of this resolver"""
+        compiled = self._compiled_resolver
+        if compiled is None or self._compiled_added != BaseResolver._implicit_resolvers_added:
+            compiled = self._compiled_resolver = CompiledResolvers(
+                self.yaml_implicit_resolvers, cache_size=self._implicit_cache_size
+            )
+            self._compiled_added = BaseResolver._implicit_resolvers_added
+        return compiled
+
     def resolve(self, kind, value, implicit):
         # type: (Any, Any, Any) -> Any
         if kind is ScalarNode and implicit[0]:
-            if value == "":
-                resolvers = self.yaml_implicit_resolvers.get("", [])
-            else:
-                resolvers = self.yaml_implicit_resolvers.get(value[0], [])
-            resolvers += self.yaml_implicit_resolvers.get(None, [])
-            for tag, regexp in resolvers:
-                if regexp.match(value):
-                    return tag
+            tag = self.compiled_resolver.resolve(value)
+            if tag is not None:
+                return tag
             implicit = implicit[1]
         if bool(self.yaml_path_resolvers):
             exact_paths = self.resolver_exact_paths[-1]
@@ -323,6 +464,7 @@ class VersionedResolver(BaseResolver):
         BaseResolver.__init__(self, loader)
         self._loader_version = self.get_loader_version(version)
         self._version_implicit_resolver = {}  # type: Dict[Any, Any]
+        self._version_compiled_resolver = {}  # type: Dict[Any, Any]
 
     def add_version_implicit_resolver(self, version, tag, regexp, first):
         # type: (VersionType, Any, Any, Any) -> None
@@ -331,6 +473,24 @@ class VersionedResolver(BaseResolver):
         impl_resolver = self._version_implicit_resolver.setdefault(version, {})
         for ch in first:
             impl_resolver.setdefault(ch, []).append((tag, regexp))
+        self._version_compiled_resolver.pop(version, None)
+
+    @BaseResolver.implicit_cache_size.setter  # type: ignore
+    def implicit_cache_size(self, val):
+        # type: (int) -> None
+        self._implicit_cache_size = val
+        self._version_compiled_resolver.clear()
+
+    def cache_info(self):
+        # type: () -> Any
+        """hits, misses, maxsize and currsize summed over the YAML versions resolved"""
+        infos = [c.cache_info() for c in self._version_compiled_resolver.values()]
+        return CacheInfo(
+            sum(i.hits for i in infos),
+            sum(i.misses for i in infos),
+            self._implicit_cache_size,
+            sum(i.currsize for i in infos),
+        )
 
     def get_loader_version(self, version):
         # type: (Optional[VersionType]) -> Any
@@ -354,17 +514,24 @@ class VersionedResolver(BaseResolver):
                     self.add_version_implicit_resolver(version, x[1], x[2], x[3])
         return self._version_implicit_resolver[version]
 
+    @property
+    def compiled_resolver(self):
+        # type: () -> Any
+        version = self.processing_version
+        try:
+            return self._version_compiled_resolver[version]
+        except KeyError:
+            compiled = self._version_compiled_resolver[version] = CompiledResolvers(
+                self.versioned_resolver, cache_size=self._implicit_cache_size
+            )
+            return compiled
+
     def resolve(self, kind, value, implicit):
         # type: (Any, Any, Any) -> Any
         if kind is ScalarNode and implicit[0]:
-            if value == "":
-                resolvers = self.versioned_resolver.get("", [])
-            else:
-                resolvers = self.versioned_resolver.get(value[0], [])
-            resolvers += self.versioned_resolver.get(None, [])
-            for tag, regexp in resolvers:
-                if regexp.match(value):
-                    return tag
+            tag = self.compiled_resolver.resolve(value)
+            if tag is not None:
+                return tag
             implicit = implicit[1]
         if bool(self.yaml_path_resolvers):
             exact_paths = self.resolver_exact_paths[-1]
@@ -30,6 +30,9 @@ from __future__ import print_function, absolute_import, division, unicode_litera
 # Read comments in the Scanner code for more details.
 #
 
+import re
+from collections import deque
+
 from ruamel.yaml.error import MarkedYAMLError
 from ruamel.yaml.tokens import *  # NOQA
 from ruamel.yaml.compat import utf8, unichr, PY3, check_anchorname_char, nprint  # NOQA
@@ -45,6 +48,12 @@ _THE_END = '\n\0\r\x85\u2028\u2029'
 _THE_END_SPACE_TAB = ' \n\0\t\r\x85\u2028\u2029'
 _SPACE_TAB = ' \t'
 
+# runs of characters that can never end a scalar, matched in one go against the
+# reader buffer; the character following such a run is looked at in Python
+_FLOW_SCALAR_RUN = re.compile('[^ \n\'"\\\\\0\t\r\x85\u2028\u2029]*')
+_PLAIN_RUN = re.compile('[^:\0 \t\r\n\x85\u2028\u2029]*')
+_PLAIN_FLOW_RUN = re.compile('[^:,?\\[\\]{}\0 \t\r\n\x85\u2028\u2029]*')
+
 
 class ScannerError(MarkedYAMLError):
     pass
@@ -97,8 +106,8 @@ class Scanner(object):
         # for each unclosed flow context. If empty list that means block context
         self.flow_context = []  # type: List[Text]
 
-        # List of processed tokens that are not yet emitted.
-        self.tokens = []  # type: List[Any]
+        # Queue of processed tokens that are not yet emitted.
+        self.tokens = deque()  # type: Any
 
         # Add the STREAM-START token.
         self.fetch_stream_start()
@@ -191,7 +200,7 @@ class Scanner(object):
             self.fetch_more_tokens()
         if bool(self.tokens):
             self.tokens_taken += 1
-            return self.tokens.pop(0)
+            return self.tokens.popleft()
 
     # Private methods.
 
@@ -208,6 +217,15 @@ class Scanner(object):
             return True
         return False
 
+    def insert_token(self, index, token):
+        # type: (int, Any) -> None
+        # deque.insert() is not available on Python 2, rotate() takes the
+        # shorter way round and simple keys are close to the end of the queue
+        tokens = self.tokens
+        tokens.rotate(-index)
+        tokens.appendleft(token)
+        tokens.rotate(index)
+
     def fetch_comment(self, comment):
         # type: (Any) -> None
         raise NotImplementedError
@@ -622,7 +640,7 @@ class Scanner(object):
             # Add KEY.
             key = self.possible_simple_keys[self.flow_level]
             del self.possible_simple_keys[self.flow_level]
-            self.tokens.insert(
+            self.insert_token(
                 key.token_number - self.tokens_taken, KeyToken(key.mark, key.mark)
             )
 
@@ -630,7 +648,7 @@ class Scanner(object):
             # BLOCK-MAPPING-START.
             if not self.flow_level:
                 if self.add_indent(key.column):
-                    self.tokens.insert(
+                    self.insert_token(
                         key.token_number - self.tokens_taken,
                         BlockMappingStartToken(key.mark, key.mark),
                     )
@@ -1414,8 +1432,11 @@ class Scanner(object):
         chunks = []  # type: List[Any]
         srp = self.reader.peek
         srf = self.reader.forward
+        reader = self.reader
         while True:
-            length = 0
+            length = _FLOW_SCALAR_RUN.match(reader.buffer, reader.pointer).end()
+            length -= reader.pointer
+            # continue by character if the run reached the end of a partial buffer
             while srp(length) not in ' \n\'"\\\0\t\r\x85\u2028\u2029':
                 length += 1
             if length != 0:
@@ -1534,11 +1555,16 @@ class Scanner(object):
         # if indent == 0:
         #     indent = 1
         spaces = []  # type: List[Any]
+        reader = self.reader
+        plain_run = _PLAIN_FLOW_RUN.match if self.flow_level else _PLAIN_RUN.match
         while True:
             length = 0
             if srp() == '#':
                 break
             while True:
+                # skip what cannot end the scalar, then check the character following it
+                run_end = plain_run(reader.buffer, reader.pointer + length).end()
+                length = run_end - reader.pointer
                 ch = srp(length)
                 if ch == ':' and srp(length + 1) not in _THE_END_SPACE_TAB:
                     pass
@@ -1787,7 +1813,7 @@ class RoundTripScanner(Scanner):
         if not self.tokens:
             return comments
         if isinstance(self.tokens[0], CommentToken):
-            comment = self.tokens.pop(0)
+            comment = self.tokens.popleft()
             self.tokens_taken += 1
             comments.append(comment)
         while self.need_more_tokens():
@@ -1796,7 +1822,7 @@ class RoundTripScanner(Scanner):
                 return comments
             if isinstance(self.tokens[0], CommentToken):
                 self.tokens_taken += 1
-                comment = self.tokens.pop(0)
+                comment = self.tokens.popleft()
                 # nprint('dropping2', comment)
                 comments.append(comment)
         if len(comments) >= 1:
@@ -1827,11 +1853,11 @@ class RoundTripScanner(Scanner):
                 and self.tokens[0].end_mark.line == self.tokens[1].start_mark.line
             ):
                 self.tokens_taken += 1
-                c = self.tokens.pop(1)
+                c = self._pop_second_token()
                 self.fetch_more_tokens()
                 while len(self.tokens) > 1 and isinstance(self.tokens[1], CommentToken):
                     self.tokens_taken += 1
-                    c1 = self.tokens.pop(1)
+                    c1 = self._pop_second_token()
                     c.value = c.value + (' ' * c1.start_mark.column) + c1.value
                     self.fetch_more_tokens()
                 self.tokens[0].add_post_comment(c)
@@ -1842,7 +1868,7 @@ class RoundTripScanner(Scanner):
                 and self.tokens[0].end_mark.line != self.tokens[1].start_mark.line
             ):
                 self.tokens_taken += 1
-                c = self.tokens.pop(1)
+                c = self._pop_second_token()
                 c.value = (
                     '\n' * (c.start_mark.line - self.tokens[0].end_mark.line)
                     + (' ' * c.start_mark.column)
@@ -1852,13 +1878,20 @@ class RoundTripScanner(Scanner):
                 self.fetch_more_tokens()
                 while len(self.tokens) > 1 and isinstance(self.tokens[1], CommentToken):
                     self.tokens_taken += 1
-                    c1 = self.tokens.pop(1)
+                    c1 = self._pop_second_token()
                     c.value = c.value + (' ' * c1.start_mark.column) + c1.value
                     self.fetch_more_tokens()
             self.tokens_taken += 1
-            return self.tokens.pop(0)
+            return self.tokens.popleft()
         return None
 
+    def _pop_second_token(self):
+        # type: () -> Any
+        first = self.tokens.popleft()
+        token = self.tokens.popleft()
+        self.tokens.appendleft(first)
+        return token
+
     def fetch_comment(self, comment):
         # type: (Any) -> None
         value, start_mark, end_mark = comment
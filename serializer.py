@@ -21,7 +21,7 @@ from ruamel.yaml.events import (
 from ruamel.yaml.nodes import MappingNode, ScalarNode, SequenceNode
 
 if False:  # MYPY
-    from typing import Any, Dict, Union, Text, Optional  # NOQA
+    from typing import Any, Dict, List, Union, Text, Optional  # NOQA
     from ruamel.yaml.compat import VersionType  # NOQA
 
 __all__ = ['Serializer', 'SerializerError']
@@ -122,10 +122,14 @@ class Serializer(object):
 
     def anchor_node(self, node):
         # type: (Any) -> None
-        if node in self.anchors:
-            if self.anchors[node] is None:
-                self.anchors[node] = self.generate_anchor(node)
-        else:
+        # depth first, with an explicit stack instead of recursion
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node in self.anchors:
+                if self.anchors[node] is None:
+                    self.anchors[node] = self.generate_anchor(node)
+                continue
             anchor = None
             try:
                 if node.anchor.always_dump:
@@ -133,13 +137,13 @@ class Serializer(object):
             except:  # NOQA
                 pass
             self.anchors[node] = anchor
+            # pushed in reverse, so that they are popped in order
             if isinstance(node, SequenceNode):
-                for item in node.value:
-                    self.anchor_node(item)
+                stack.extend(reversed(node.value))
             elif isinstance(node, MappingNode):
-                for key, value in node.value:
-                    self.anchor_node(key)
-                    self.anchor_node(value)
+                for key, value in reversed(node.value):
+                    stack.append(value)
+                    stack.append(key)
 
     def generate_anchor(self, node):
         # type: (Any) -> Any
@@ -154,85 +158,114 @@ class Serializer(object):
 
     def serialize_node(self, node, parent, index):
         # type: (Any, Any, Any) -> None
-        alias = self.anchors[node]
-        if node in self.serialized_nodes:
-            self.emitter.emit(AliasEvent(alias))
-        else:
-            self.serialized_nodes[node] = True
-            self.resolver.descend_resolver(parent, index)
-            if isinstance(node, ScalarNode):
-                # here check if the node.tag equals the one that would result from parsing
-                # if not equal quoting is necessary for strings
-                detected_tag = self.resolver.resolve(ScalarNode, node.value, (True, False))
-                default_tag = self.resolver.resolve(ScalarNode, node.value, (False, True))
-                implicit = (
-                    (node.tag == detected_tag),
-                    (node.tag == default_tag),
-                    node.tag.startswith('tag:yaml.org,2002:'),
-                )
-                self.emitter.emit(
-                    ScalarEvent(
-                        alias,
-                        node.tag,
-                        implicit,
-                        node.value,
-                        style=node.style,
-                        comment=node.comment,
+        """
+        emit the events for node. The collections nested in node are kept on an
+        explicit stack (with the position in their items and their end event)
+        instead of serializing them through recursive calls
+        """
+        emitter = self.emitter
+        resolver = self.resolver
+        stack = []  # type: List[Any]
+        while True:
+            alias = self.anchors[node]
+            if node in self.serialized_nodes:
+                emitter.emit(AliasEvent(alias))
+            else:
+                self.serialized_nodes[node] = True
+                resolver.descend_resolver(parent, index)
+                if isinstance(node, ScalarNode):
+                    # here check if the node.tag equals the one that would result from parsing
+                    # if not equal quoting is necessary for strings
+                    detected_tag = resolver.resolve(ScalarNode, node.value, (True, False))
+                    default_tag = resolver.resolve(ScalarNode, node.value, (False, True))
+                    implicit = (
+                        (node.tag == detected_tag),
+                        (node.tag == default_tag),
+                        node.tag.startswith('tag:yaml.org,2002:'),
                     )
-                )
-            elif isinstance(node, SequenceNode):
-                implicit = node.tag == self.resolver.resolve(SequenceNode, node.value, True)
-                comment = node.comment
-                end_comment = None
-                seq_comment = None
-                if node.flow_style is True:
-                    if comment:  # eol comment on flow style sequence
-                        seq_comment = comment[0]
-                        # comment[0] = None
-                if comment and len(comment) > 2:
-                    end_comment = comment[2]
-                else:
+                    emitter.emit(
+                        ScalarEvent(
+                            alias,
+                            node.tag,
+                            implicit,
+                            node.value,
+                            style=node.style,
+                            comment=node.comment,
+                        )
+                    )
+                    resolver.ascend_resolver()
+                elif isinstance(node, SequenceNode):
+                    implicit = node.tag == resolver.resolve(SequenceNode, node.value, True)
+                    comment = node.comment
                     end_comment = None
-                self.emitter.emit(
-                    SequenceStartEvent(
-                        alias,
-                        node.tag,
-                        implicit,
-                        flow_style=node.flow_style,
-                        comment=node.comment,
+                    seq_comment = None
+                    if node.flow_style is True:
+                        if comment:  # eol comment on flow style sequence
+                            seq_comment = comment[0]
+                            # comment[0] = None
+                    if comment and len(comment) > 2:
+                        end_comment = comment[2]
+                    else:
+                        end_comment = None
+                    emitter.emit(
+                        SequenceStartEvent(
+                            alias,
+                            node.tag,
+                            implicit,
+                            flow_style=node.flow_style,
+                            comment=node.comment,
+                        )
                     )
-                )
-                index = 0
-                for item in node.value:
-                    self.serialize_node(item, node, index)
-                    index += 1
-                self.emitter.emit(SequenceEndEvent(comment=[seq_comment, end_comment]))
-            elif isinstance(node, MappingNode):
-                implicit = node.tag == self.resolver.resolve(MappingNode, node.value, True)
-                comment = node.comment
-                end_comment = None
-                map_comment = None
-                if node.flow_style is True:
-                    if comment:  # eol comment on flow style sequence
-                        map_comment = comment[0]
-                        # comment[0] = None
-                if comment and len(comment) > 2:
-                    end_comment = comment[2]
-                self.emitter.emit(
-                    MappingStartEvent(
-                        alias,
-                        node.tag,
-                        implicit,
-                        flow_style=node.flow_style,
-                        comment=node.comment,
-                        nr_items=len(node.value),
+                    end_event = SequenceEndEvent(comment=[seq_comment, end_comment])
+                    stack.append([node, 0, end_event])
+                elif isinstance(node, MappingNode):
+                    implicit = node.tag == resolver.resolve(MappingNode, node.value, True)
+                    comment = node.comment
+                    end_comment = None
+                    map_comment = None
+                    if node.flow_style is True:
+                        if comment:  # eol comment on flow style sequence
+                            map_comment = comment[0]
+                            # comment[0] = None
+                    if comment and len(comment) > 2:
+                        end_comment = comment[2]
+                    emitter.emit(
+                        MappingStartEvent(
+                            alias,
+                            node.tag,
+                            implicit,
+                            flow_style=node.flow_style,
+                            comment=node.comment,
+                            nr_items=len(node.value),
+                        )
                     )
-                )
-                for key, value in node.value:
-                    self.serialize_node(key, node, None)
-                    self.serialize_node(value, node, key)
-                self.emitter.emit(MappingEndEvent(comment=[map_comment, end_comment]))
-            self.resolver.ascend_resolver()
+                    end_event = MappingEndEvent(comment=[map_comment, end_comment])
+                    stack.append([node, 0, end_event])
+                else:
+                    resolver.ascend_resolver()
+            # continue with the next item of the innermost unfinished collection,
+            # for a mapping position counts keys and values
+            while stack:
+                top = stack[-1]
+                parent, pos = top[0], top[1]
+                if isinstance(parent, SequenceNode):
+                    if pos < len(parent.value):
+                        top[1] = pos + 1
+                        node, index = parent.value[pos], pos
+                        break
+                elif pos < 2 * len(parent.value):
+                    top[1] = pos + 1
+                    key, value = parent.value[pos >> 1]
+                    if pos & 1:
+                        node, index = value, key
+                    else:
+                        node, index = key, None
+                    break
+                stack.pop()
+                emitter.emit(top[2])
+                resolver.ascend_resolver()
+            else:
+                return
 
 
 def templated_id(s):